@@ -1,12 +1,12 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-from ..database import get_db
+from ..database import get_async_db
 from ..services.auth_service import AuthService
 from .schemas import (
     UserCreate,
@@ -35,7 +35,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Dependency to get the current authenticated user from JWT token"""
     credentials_exception = HTTPException(
@@ -56,7 +56,7 @@ async def get_current_user(
         raise credentials_exception
 
     auth_service = AuthService(db)
-    user = auth_service.get_user_by_id(int(user_id))
+    user = await auth_service.get_user_by_id(int(user_id))
 
     if user is None:
         raise credentials_exception
@@ -72,23 +72,23 @@ async def get_current_user(
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit("3/minute")
-async def register(request: Request, user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(request: Request, user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
     auth_service = AuthService(db)
 
-    if auth_service.get_user_by_email(user_data.email):
+    if await auth_service.get_user_by_email(user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    if auth_service.get_user_by_username(user_data.username):
+    if await auth_service.get_user_by_username(user_data.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
         )
 
-    user = auth_service.create_user(
+    user = await auth_service.create_user(
         email=user_data.email,
         username=user_data.username,
         password=user_data.password
@@ -100,11 +100,11 @@ async def register(request: Request, user_data: UserCreate, db: Session = Depend
 
 @router.post("/login", response_model=Token)
 @limiter.limit("5/minute")
-async def login(request: Request, user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(request: Request, user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login and get access token"""
     auth_service = AuthService(db)
 
-    user = auth_service.authenticate_user(
+    user = await auth_service.authenticate_user(
         user_data.username_or_email,
         user_data.password
     )
@@ -133,12 +133,12 @@ async def login(request: Request, user_data: UserLogin, db: Session = Depends(ge
 async def login_for_access_token(
     request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """OAuth2 compatible token login (for Swagger UI)"""
     auth_service = AuthService(db)
 
-    user = auth_service.authenticate_user(form_data.username, form_data.password)
+    user = await auth_service.authenticate_user(form_data.username, form_data.password)
 
     if not user:
         raise HTTPException(
@@ -159,7 +159,7 @@ async def login_for_access_token(
 
 @router.post("/refresh", response_model=Token)
 @limiter.limit("10/minute")
-async def refresh_token(request: Request, token_data: TokenRefresh, db: Session = Depends(get_db)):
+async def refresh_token(request: Request, token_data: TokenRefresh, db: AsyncSession = Depends(get_async_db)):
     """Refresh access token using refresh token"""
     if not verify_token_type(token_data.refresh_token, "refresh"):
         raise HTTPException(
@@ -182,7 +182,7 @@ async def refresh_token(request: Request, token_data: TokenRefresh, db: Session
         )
 
     auth_service = AuthService(db)
-    user = auth_service.get_user_by_id(int(user_id))
+    user = await auth_service.get_user_by_id(int(user_id))
 
     if user is None or not user.is_active:
         raise HTTPException(
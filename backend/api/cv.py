@@ -1,25 +1,45 @@
+import gzip
+import zlib
+import base64
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+import asyncio
+import zipfile
+import tempfile
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Header, HTTPException, status, UploadFile, File, Request, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional, Tuple
 import json
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from ..database import get_db
+from pydantic import ValidationError
+from ..database import get_async_db, AsyncSessionLocal
 from ..models.user import User
 from ..models.cv import CV
 from ..models.cv_version import CVVersion
 from ..utils.auth import get_current_user
 from ..services.ai_service import ai_service
-from ..services.document_parser import document_parser
+from ..services.cv_transfer import CVImporter, EXPORT_FORMAT_VERSION, EXPORT_VERSION_FIELDS, iter_export_records
+from ..services.document_parser import document_parser, parse_in_pool
+from ..services.parse_cache import content_hasher, parse_cache
+from ..services.search_index import AsyncSearchIndex
+from ..services.section_store import AsyncSectionStore
+from ..services.version_diff import version_diff_cache
+from ..services.version_service import AsyncVersionService, KIND_NAMED, KIND_RESTORE
+from ..utils.json_patch import JsonPatchError, JsonPatchTestFailed, apply_patch
+from ..database.config import settings
 from .cv_schemas import (
-    CVCreate, CVUpdate, CVResponse,
+    CVCreate, CVUpdate, CVPatchOperation, CVResponse, CVSummary, CVSearchResult,
+    CVImportRecord, CVVersionImportRecord, CVImportResult,
+    ExperienceItem, EducationItem, SkillItem, ProjectItem, ResearchItem,
     AIPromptRequest, AIGeneratedContent,
     JobSuggestionRequest, JobSuggestionResponse,
-    CVVersionListItem, CVVersionDetail, CVVersionCreate, CVVersionRestore,
+    CVVersionListItem, CVVersionDetail, CVVersionDiff, CVVersionCreate, CVVersionRestore,
     DocumentParseResponse,
-    CVReviewResponse
+    CVReviewResponse,
+    _parse_legacy_text
 )
 
 logger = logging.getLogger(__name__)
@@ -29,44 +49,40 @@ limiter = Limiter(key_func=get_remote_address)
 router = APIRouter(prefix="/api/cv", tags=["CV"])
 
 
-def create_version_snapshot(db: Session, cv: CV, user_id: int, change_summary: str = None, version_name: str = None) -> CVVersion:
-    """Helper function to create a version snapshot of current CV state"""
-    max_version = db.query(func.max(CVVersion.version_number)).filter(
-        CVVersion.cv_id == cv.id
-    ).scalar() or 0
-
-    version = CVVersion(
-        cv_id=cv.id,
-        version_number=max_version + 1,
-        version_name=version_name,
-        change_summary=change_summary or "Auto-saved version",
-        title=cv.title,
-        template=cv.template,
-        full_name=cv.full_name,
-        email=cv.email,
-        phone=cv.phone,
-        location=cv.location,
-        summary=cv.summary,
-        experience=cv.experience,
-        education=cv.education,
-        skills=cv.skills,
-        projects=cv.projects,
-        research=cv.research,
-        ai_prompt=cv.ai_prompt,
-        created_by_id=user_id
-    )
-    db.add(version)
-    return version
-
-
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_BATCH_FILES = 500
+MAX_ARCHIVE_SIZE = 100 * 1024 * 1024  # 100MB
+SUMMARY_PAGE_SIZE = 20
+MAX_SUMMARY_PAGE_SIZE = 100
+SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE_SIZE = 100
+VERSION_PAGE_SIZE = 50
+MAX_VERSION_PAGE_SIZE = 200
+MAX_PATCH_OPERATIONS = 200
+EXPORT_CHUNK_SIZE = 64 * 1024
+MAX_IMPORT_LINE_SIZE = 10 * 1024 * 1024  # 10MB per record
+
+# CV fields PATCH can change but not clear (NOT NULL columns)
+REQUIRED_CV_FIELDS = ('title', 'template')
+
+# Item model for each list section; PATCH validates only the items it touches
+SECTION_ITEM_MODELS = {
+    'experience': ExperienceItem,
+    'education': EducationItem,
+    'skills': SkillItem,
+    'projects': ProjectItem,
+    'research': ResearchItem,
+}
+# Field defaults of each section's items; older saves stored partial items
+SECTION_ITEM_DEFAULTS = {section: model().model_dump() for section, model in SECTION_ITEM_MODELS.items()}
 
 # Magic bytes for file type validation
 FILE_SIGNATURES = {
     'pdf': b'%PDF',
     'docx': b'PK',
     'doc': b'\xd0\xcf\x11\xe0',
+    'zip': b'PK',
 }
 
 
@@ -84,6 +100,42 @@ def _validate_file_magic(content: bytes, extension: str) -> bool:
     return True
 
 
+async def _spool_upload(file: UploadFile, extension: str, max_size: int = MAX_FILE_SIZE) -> Tuple[tempfile.SpooledTemporaryFile, str]:
+    """
+    Copy an upload into a spooled temp file chunk by chunk.
+    Magic bytes are checked on the first chunk and the upload is rejected as soon
+    as it passes max_size, so memory stays bounded by the chunk size plus the
+    spool's in-memory threshold. Returns the rewound spool and its SHA-256 digest.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_MEMORY)
+    hasher = content_hasher()
+    size = 0
+    try:
+        while True:
+            chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+            if size == 0 and not _validate_file_magic(chunk, extension):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="File content does not match the expected format for the given extension."
+                )
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"File too large. Maximum size is {max_size // (1024 * 1024)}MB."
+                )
+            hasher.update(chunk)
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+
+    spool.seek(0)
+    return spool, hasher.hexdigest()
+
+
 def _sanitize_filename(filename: str) -> str:
     """Strip path separators and limit filename length."""
     if not filename:
@@ -92,6 +144,28 @@ def _sanitize_filename(filename: str) -> str:
     return name[:255]
 
 
+async def _parse_spooled(spool, filename: str, digest: str) -> DocumentParseResponse:
+    """Parse a spooled upload through the cache, the extraction pool and the AI fallback."""
+    if settings.PARSE_CACHE_ENABLED:
+        cached = await asyncio.to_thread(parse_cache.get, digest)
+        if cached is not None:
+            logger.debug("Parse cache hit for %s", digest[:12])
+            return DocumentParseResponse(**cached)
+
+    parsed_data, text = await parse_in_pool(spool, filename)
+    needs_ai = document_parser.needs_ai_fallback(parsed_data)
+    parsed_data = await document_parser.enhance_with_ai(parsed_data, text)
+
+    result = parsed_data.to_dict()
+    result["ai_enhanced"] = parsed_data.confidence_scores.get("ai_enhanced", 0) == 1.0
+    response = DocumentParseResponse(**result)
+
+    # Don't pin a result whose AI fallback failed; a later upload may succeed
+    if settings.PARSE_CACHE_ENABLED and (response.ai_enhanced or not needs_ai):
+        await asyncio.to_thread(parse_cache.put, digest, response.model_dump())
+    return response
+
+
 @router.post("/parse-document", response_model=DocumentParseResponse)
 @limiter.limit("10/minute")
 async def parse_document(
@@ -112,26 +186,9 @@ async def parse_document(
             detail=f"Unsupported file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
         )
 
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File too large. Maximum size is 10MB."
-        )
-
-    if not _validate_file_magic(content, file_ext):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File content does not match the expected format for the given extension."
-        )
-
+    spool, digest = await _spool_upload(file, file_ext)
     try:
-        parsed_data = document_parser.parse_document(content, safe_filename)
-        parsed_data = await document_parser.enhance_with_ai(parsed_data, document_parser.text)
-
-        result = parsed_data.to_dict()
-        result["ai_enhanced"] = parsed_data.confidence_scores.get("ai_enhanced", 0) == 1.0
-        return DocumentParseResponse(**result)
+        return await _parse_spooled(spool, safe_filename, digest)
     except ImportError:
         logger.error("Missing dependency for document parsing")
         raise HTTPException(
@@ -144,6 +201,210 @@ async def parse_document(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to parse the uploaded document. Please try a different file."
         )
+    finally:
+        spool.close()
+
+
+def _spool_archive_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, extension: str) -> Tuple[tempfile.SpooledTemporaryFile, str]:
+    """Copy one ZIP member into a spool with the same checks as a direct upload. Raises ValueError."""
+    if info.file_size > MAX_FILE_SIZE:
+        raise ValueError("File too large. Maximum size is 10MB.")
+
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_MEMORY)
+    hasher = content_hasher()
+    size = 0
+    try:
+        with archive.open(info) as member:
+            while True:
+                chunk = member.read(settings.UPLOAD_CHUNK_SIZE)
+                if size == 0 and not _validate_file_magic(chunk, extension):
+                    raise ValueError("File content does not match the expected format for the given extension.")
+                if not chunk:
+                    break
+                size += len(chunk)
+                # The header size can lie, so enforce the limit on decompressed bytes too
+                if size > MAX_FILE_SIZE:
+                    raise ValueError("File too large. Maximum size is 10MB.")
+                hasher.update(chunk)
+                spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+
+    spool.seek(0)
+    return spool, hasher.hexdigest()
+
+
+def _parsed_to_cv_fields(filename: str, parsed: DocumentParseResponse) -> dict:
+    """Map a parse result onto CVCreate fields for bulk import."""
+    title = filename.rsplit('.', 1)[0] or "Imported CV"
+    return CVCreate(
+        title=title[:255],
+        template="modern",
+        full_name=parsed.full_name[:200] or None,
+        email=parsed.email[:254] or None,
+        phone=parsed.phone[:30] or None,
+        location=parsed.location[:200] or None,
+        summary=parsed.summary[:5000] or None,
+        experience=[item.model_dump() for item in parsed.experience],
+        education=[item.model_dump() for item in parsed.education],
+        skills=[{"name": skill.name} for skill in parsed.skills],
+        projects=[item.model_dump() for item in parsed.projects],
+    ).dict()
+
+
+@router.post("/parse-batch")
+@limiter.limit("2/minute")
+async def parse_batch(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    create_cvs: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Parse many resumes at once. Accepts a multipart list of documents and/or
+    ZIP archives of documents. Files are parsed concurrently on the extraction
+    pool, deduplicated by content hash, and streamed back as NDJSON lines as
+    they complete. With create_cvs=true, a CV is created for every parsed
+    document in one transaction and reported in the final summary line.
+    """
+    # Spool everything before streaming starts; the uploads are closed once the handler returns
+    jobs = []  # (filename, spool, digest)
+    rejected = []  # (filename, detail)
+
+    def _accept(filename: str) -> Optional[str]:
+        if len(jobs) + len(rejected) >= MAX_BATCH_FILES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many files. Maximum is {MAX_BATCH_FILES} per batch."
+            )
+        ext = filename.lower().rsplit('.', 1)[-1] if '.' in filename else ''
+        if ext not in ALLOWED_EXTENSIONS:
+            rejected.append((filename, "Unsupported file type."))
+            return None
+        return ext
+
+    try:
+        for upload in files:
+            safe_filename = _sanitize_filename(upload.filename)
+            if safe_filename.lower().endswith('.zip'):
+                archive_spool, _ = await _spool_upload(upload, 'zip', max_size=MAX_ARCHIVE_SIZE)
+                try:
+                    with zipfile.ZipFile(archive_spool) as archive:
+                        for info in archive.infolist():
+                            if info.is_dir():
+                                continue
+                            member_name = _sanitize_filename(info.filename)
+                            ext = _accept(member_name)
+                            if ext is None:
+                                continue
+                            try:
+                                spool, digest = _spool_archive_member(archive, info, ext)
+                            except (ValueError, zipfile.BadZipFile, RuntimeError) as e:
+                                rejected.append((member_name, str(e) if isinstance(e, ValueError) else "Unreadable archive member."))
+                                continue
+                            jobs.append((member_name, spool, digest))
+                except zipfile.BadZipFile:
+                    rejected.append((safe_filename, "Invalid ZIP archive."))
+                finally:
+                    archive_spool.close()
+                continue
+
+            ext = _accept(safe_filename)
+            if ext is None:
+                continue
+            try:
+                spool, digest = await _spool_upload(upload, ext)
+            except HTTPException as e:
+                rejected.append((safe_filename, e.detail))
+                continue
+            jobs.append((safe_filename, spool, digest))
+    except BaseException:
+        for _, spool, _ in jobs:
+            spool.close()
+        raise
+
+    user_id = current_user.id
+
+    async def _run(filename: str, spool, digest: str):
+        try:
+            return filename, digest, await _parse_spooled(spool, filename, digest), None
+        except Exception as e:
+            logger.error("Batch parsing failed for %s: %s", filename, type(e).__name__)
+            return filename, digest, None, "Failed to parse document."
+
+    async def _stream():
+        parsed_results = []
+        counts = {"parsed": 0, "duplicates": 0, "errors": len(rejected)}
+        first_by_digest = {}
+        tasks = []
+        try:
+            for filename, detail in rejected:
+                yield json.dumps({"filename": filename, "status": "error", "detail": detail}) + "\n"
+
+            for filename, spool, digest in jobs:
+                if digest in first_by_digest:
+                    counts["duplicates"] += 1
+                    yield json.dumps({
+                        "filename": filename, "sha256": digest,
+                        "status": "duplicate", "duplicate_of": first_by_digest[digest],
+                    }) + "\n"
+                    continue
+                first_by_digest[digest] = filename
+                tasks.append(asyncio.ensure_future(_run(filename, spool, digest)))
+
+            for next_done in asyncio.as_completed(tasks):
+                filename, digest, parsed, error = await next_done
+                if error:
+                    counts["errors"] += 1
+                    yield json.dumps({"filename": filename, "sha256": digest, "status": "error", "detail": error}) + "\n"
+                    continue
+                counts["parsed"] += 1
+                parsed_results.append((filename, parsed))
+                yield json.dumps({
+                    "filename": filename, "sha256": digest,
+                    "status": "ok", "result": parsed.model_dump(),
+                }) + "\n"
+
+            summary = {"status": "complete", **counts}
+            if create_cvs and parsed_results:
+                try:
+                    summary["created_cv_ids"] = await _bulk_create_cvs(user_id, parsed_results)
+                except Exception as e:
+                    logger.error("Bulk CV creation failed for user %d: %s", user_id, e)
+                    summary["detail"] = "Failed to create CVs. Please try again."
+            yield json.dumps(summary) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+            for _, spool, _ in jobs:
+                spool.close()
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+
+async def _bulk_create_cvs(user_id: int, parsed_results: list) -> List[int]:
+    """Create one CV per parsed document in a single transaction."""
+    async with AsyncSessionLocal() as db:
+        try:
+            cvs = []
+            for filename, parsed in parsed_results:
+                try:
+                    cvs.append(CV(user_id=user_id, **_parsed_to_cv_fields(filename, parsed)))
+                except ValidationError:
+                    logger.warning("Skipping CV creation for %s: parsed data failed validation", filename)
+            db.add_all(cvs)
+            await db.flush()
+            sections, search_index = AsyncSectionStore(db), AsyncSearchIndex(db)
+            for cv in cvs:
+                await sections.save(cv)
+                await search_index.index_cv(cv)
+            await db.commit()
+            logger.info("Bulk-created %d CVs for user %d", len(cvs), user_id)
+            return [cv.id for cv in cvs]
+        except Exception:
+            await db.rollback()
+            raise
 
 
 @router.post("/generate-content", response_model=AIGeneratedContent)
@@ -165,10 +426,87 @@ async def generate_cv_content(
         )
 
 
+async def _get_user_cv(db: AsyncSession, cv_id: int, user_id: int) -> CV:
+    """Load one of the user's CVs or raise 404"""
+    cv = await db.scalar(select(CV).where(CV.id == cv_id, CV.user_id == user_id))
+    if not cv:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="CV not found"
+        )
+    await AsyncSectionStore(db).load([cv])
+    return cv
+
+
+async def _get_cv_revision(db: AsyncSession, cv_id: int, user_id: int) -> int:
+    """The revision of one of the user's CVs, without loading its content, or raise 404"""
+    revision = await db.scalar(select(CV.revision).where(CV.id == cv_id, CV.user_id == user_id))
+    if revision is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="CV not found"
+        )
+    return revision
+
+
+def _cv_etag(cv_id: int, revision: int) -> str:
+    return f'"cv-{cv_id}-{revision}"'
+
+
+def _version_etag(cv_id: int, version_number: int, content_hash: Optional[str]) -> str:
+    return f'"cv-{cv_id}-v{version_number}-{(content_hash or "")[:16]}"'
+
+
+def _etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    """
+    Whether an If-None-Match (weak comparison) or If-Match (strong
+    comparison) header lists the ETag; "*" matches any ETag.
+    """
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(',')]
+    if weak:
+        candidates = [candidate[2:] if candidate.startswith('W/') else candidate for candidate in candidates]
+    return '*' in candidates or etag in candidates
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+
+def _set_etag(response: Response, etag: str) -> None:
+    # Clients may store the response but must revalidate it on every use
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+async def _check_if_match(db: AsyncSession, cv_id: int, user_id: int, if_match: Optional[str]) -> None:
+    """Reject a write based on a stale copy of the CV (412) from its revision alone"""
+    if if_match is None:
+        return
+    revision = await _get_cv_revision(db, cv_id, user_id)
+    if not _etag_matches(if_match, _cv_etag(cv_id, revision), weak=False):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="CV has been modified since it was loaded"
+        )
+
+
+async def _get_cv_version(db: AsyncSession, cv_id: int, version_id: int) -> CVVersion:
+    """Load a version of a CV or raise 404"""
+    version = await db.scalar(select(CVVersion).where(CVVersion.id == version_id, CVVersion.cv_id == cv_id))
+    if not version:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Version not found"
+        )
+    return version
+
+
 @router.post("/", response_model=CVResponse, status_code=status.HTTP_201_CREATED)
 async def create_cv(
     cv_data: CVCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new CV for the current user"""
@@ -178,13 +516,17 @@ async def create_cv(
             **cv_data.dict()
         )
         db.add(cv)
-        db.commit()
-        db.refresh(cv)
+        sections = AsyncSectionStore(db)
+        await sections.save(cv)
+        await db.flush()
+        await AsyncSearchIndex(db).index_cv(cv)
+        await db.commit()
+        await sections.refresh(cv)
         logger.info("CV %d created for user %d", cv.id, current_user.id)
         return cv
     except Exception as e:
         logger.error("CV creation failed for user %d: %s", current_user.id, e)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create CV. Please try again."
@@ -193,32 +535,293 @@ async def create_cv(
 
 @router.get("/", response_model=List[CVResponse])
 async def get_user_cvs(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all CVs for the current user"""
-    cvs = db.query(CV).filter(CV.user_id == current_user.id).all()
+    cvs = (await db.scalars(select(CV).where(CV.user_id == current_user.id))).all()
+    await AsyncSectionStore(db).load(cvs)
     return cvs
 
 
-@router.get("/{cv_id}", response_model=CVResponse)
-async def get_cv(
-    cv_id: int,
-    db: Session = Depends(get_db),
+def _encode_cursor(value, cv_id: int) -> str:
+    """Opaque keyset cursor: the last row's sort value and id"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([value, cv_id]).encode()).decode()
+
+
+def _decode_cursor(cursor: str, field: str) -> Tuple[object, int]:
+    try:
+        value, cv_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        # The value is compared against the sort column, so it must match its type
+        if not isinstance(value, str) or type(cv_id) is not int or not 0 < cv_id < 2 ** 63:
+            raise ValueError(cursor)
+        if field != "title":
+            value = datetime.fromisoformat(value)
+        return value, cv_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+@router.get("/summary", response_model=List[CVSummary])
+async def get_user_cv_summaries(
+    response: Response,
+    sort: str = Query("-updated_at", pattern="^-?(updated_at|created_at|title)$",
+                      description="Sort field, prefixed with '-' for descending"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(SUMMARY_PAGE_SIZE, ge=1, le=MAX_SUMMARY_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get a specific CV by ID"""
-    cv = db.query(CV).filter(
-        CV.id == cv_id,
+    """
+    Dashboard listing: CV metadata and version counts in a single query,
+    without the CV content. Keyset-paginated; X-Next-Cursor is set while
+    more pages remain and X-Total-Count holds the user's CV count.
+    """
+    field = sort.lstrip("-")
+    descending = sort.startswith("-")
+    column = getattr(CV, field)
+
+    # Correlated count rather than GROUP BY, so the (user_id, updated_at)
+    # index can drive the ordering and only the returned page is counted
+    version_count = select(func.count(CVVersion.id)).where(
+        CVVersion.cv_id == CV.id
+    ).correlate(CV).scalar_subquery().label("version_count")
+    query = select(
+        CV.id, CV.title, CV.template, CV.full_name, CV.created_at, CV.updated_at,
+        version_count
+    ).where(
         CV.user_id == current_user.id
-    ).first()
+    )
 
-    if not cv:
+    if cursor:
+        value, last_id = _decode_cursor(cursor, field)
+        if descending:
+            query = query.where(or_(column < value, and_(column == value, CV.id < last_id)))
+        else:
+            query = query.where(or_(column > value, and_(column == value, CV.id > last_id)))
+    if descending:
+        query = query.order_by(column.desc(), CV.id.desc())
+    else:
+        query = query.order_by(column.asc(), CV.id.asc())
+
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(getattr(last, field), last.id)
+    response.headers["X-Total-Count"] = str(
+        await db.scalar(select(func.count(CV.id)).where(CV.user_id == current_user.id))
+    )
+    return rows
+
+
+@router.get("/search", response_model=List[CVSearchResult])
+async def search_cvs(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find; the last one may be a prefix"),
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=MAX_SEARCH_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Full-text search over the user's CVs and version history (titles,
+    summaries and section text), best matches first. Version hits point at
+    the version that added the matching text.
+    """
+    return await AsyncSearchIndex(db).search(current_user.id, q, limit)
+
+
+def _export_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+@router.get("/export")
+@limiter.limit("5/minute")
+async def export_cvs(
+    request: Request,
+    versions: bool = Query(False, description="Include each CV's full version history"),
+    archive: str = Query("ndjson", alias="format", pattern="^(ndjson|gzip)$"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Download all of the user's CVs, optionally with their version history, as
+    NDJSON records (see services.cv_transfer), plain or gzipped. Rows are read
+    from server-side cursors while the response streams, so memory use doesn't
+    grow with the amount of data. POST /api/cv/import loads the file back.
+    """
+    records = iter_export_records(current_user.id, include_versions=versions)
+
+    async def _stream():
+        # wbits=31 writes a gzip container rather than a raw zlib stream
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if archive == "gzip" else None
+        lines, size = [], 0
+        try:
+            async for record in records:
+                if record["type"] in ("cv", "version"):
+                    for section in SECTION_ITEM_MODELS:
+                        record[section] = _parse_legacy_text(record[section])
+                line = (json.dumps(record, default=_export_default) + "\n").encode("utf-8")
+                lines.append(line)
+                size += len(line)
+                if size < EXPORT_CHUNK_SIZE:
+                    continue
+                chunk, lines, size = b"".join(lines), [], 0
+                chunk = compressor.compress(chunk) if compressor else chunk
+                if chunk:
+                    yield chunk
+            chunk = b"".join(lines)
+            yield compressor.compress(chunk) + compressor.flush() if compressor else chunk
+        finally:
+            await records.aclose()
+
+    filename = f"cvs-{datetime.utcnow():%Y%m%d}.ndjson" + (".gz" if archive == "gzip" else "")
+    return StreamingResponse(
+        _stream(),
+        media_type="application/gzip" if archive == "gzip" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+class _ExportReader:
+    """
+    Reads and parses an export file in bounded batches; blocking (file reads,
+    gzip inflation, JSON parsing), so import_cvs runs it in a thread.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.line_number = 0
+        self.size = 0
+        self.done = False
+
+    def read_batch(self, max_bytes: int) -> List[Tuple[int, Any]]:
+        """(line number, record) pairs from the next `max_bytes` or so of the file"""
+        records, size = [], 0
+        while size < max_bytes:
+            line = self.source.readline(MAX_IMPORT_LINE_SIZE + 1)
+            if not line:
+                self.done = True
+                break
+            self.line_number += 1
+            self.size += len(line)
+            size += len(line)
+            if self.size > settings.IMPORT_MAX_UNCOMPRESSED_SIZE:
+                raise ValueError(
+                    f"Export is larger than {settings.IMPORT_MAX_UNCOMPRESSED_SIZE // (1024 * 1024)}MB uncompressed"
+                )
+            if len(line) > MAX_IMPORT_LINE_SIZE:
+                raise ValueError(f"Line {self.line_number}: Record is larger than {MAX_IMPORT_LINE_SIZE // (1024 * 1024)}MB")
+            if line.strip():
+                try:
+                    records.append((self.line_number, json.loads(line)))
+                except ValueError as e:
+                    raise ValueError(f"Line {self.line_number}: {e}")
+        return records
+
+
+async def _import_record(importer: CVImporter, record: Any, first: bool) -> Optional[Dict[str, Any]]:
+    """Hand one export record to the importer; returns the record when it's the end marker"""
+    kind = record.get("type") if isinstance(record, dict) else None
+    if first:
+        if kind != "export" or record.get("format_version") != EXPORT_FORMAT_VERSION:
+            raise ValueError("Not a CV export file (or an unsupported format version)")
+    elif kind == "cv":
+        cv = CVImportRecord.model_validate(record)
+        await importer.add_cv(
+            cv.id, cv.model_dump(include=set(CVCreate.model_fields)), cv.version_counter, cv.created_at, cv.updated_at
+        )
+    elif kind == "version":
+        version = CVVersionImportRecord.model_validate(record)
+        await importer.add_version(
+            version.cv_id, version.model_dump(include=set(EXPORT_VERSION_FIELDS)),
+            version.model_dump(include=set(CVCreate.model_fields))
+        )
+    elif kind == "end":
+        return record
+    else:
+        raise ValueError(f"Unexpected record type {kind!r}")
+    return None
+
+
+@router.post("/import", response_model=CVImportResult, status_code=status.HTTP_201_CREATED)
+@limiter.limit("2/minute")
+async def import_cvs(
+    request: Request,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Load a file produced by GET /api/cv/export (NDJSON, plain or gzipped) into
+    the current user's account as new CVs. Records are validated line by line
+    and bulk-inserted in batches within one transaction: a bad line rejects the
+    whole file with 422. Returns the exported -> new CV id mapping.
+    """
+    spool, _ = await _spool_upload(file, 'ndjson', max_size=MAX_ARCHIVE_SIZE)
+    line_number = 0
+    try:
+        gzipped = spool.read(2) == b"\x1f\x8b"
+        spool.seek(0)
+        reader = _ExportReader(gzip.GzipFile(fileobj=spool, mode="rb") if gzipped else spool)
+        importer = CVImporter(db, current_user.id)
+        records, end = 0, None
+        while not reader.done:
+            # Read errors carry their own line number
+            line_number = 0
+            for line_number, record in await asyncio.to_thread(reader.read_batch, MAX_IMPORT_LINE_SIZE):
+                if end is not None:
+                    raise ValueError("Records after the end marker")
+                end = await _import_record(importer, record, first=records == 0)
+                records += 1
+        line_number = 0
+        if end is None:
+            raise ValueError("File is truncated (no end marker)")
+        cv_ids = await importer.finish()
+        if end.get("cvs") != len(cv_ids) or end.get("versions") != importer.versions_imported:
+            raise ValueError("Record counts don't match the end marker")
+        await db.commit()
+    except ValidationError as e:
+        await db.rollback()
+        first = e.errors()[0]
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="CV not found"
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Line {line_number}: {'/'.join(map(str, first['loc']))}: {first['msg']}"
+        )
+    except (ValueError, OSError, EOFError) as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Line {line_number}: {e}" if line_number else str(e)
         )
+    finally:
+        spool.close()
+
+    return CVImportResult(imported_cvs=len(cv_ids), imported_versions=importer.versions_imported, cv_ids=cv_ids)
+
+
+@router.get("/{cv_id}", response_model=CVResponse)
+async def get_cv(
+    cv_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a specific CV by ID (304 when If-None-Match holds its current ETag)"""
+    if if_none_match:
+        etag = _cv_etag(cv_id, await _get_cv_revision(db, cv_id, current_user.id))
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
 
+    cv = await _get_user_cv(db, cv_id, current_user.id)
+
+    _set_etag(response, _cv_etag(cv.id, cv.revision))
     return cv
 
 
@@ -226,56 +829,183 @@ async def get_cv(
 async def update_cv(
     cv_id: int,
     cv_data: CVUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Update a CV (automatically creates a version snapshot before updating)"""
-    cv = db.query(CV).filter(
-        CV.id == cv_id,
-        CV.user_id == current_user.id
-    ).first()
+    """
+    Update a CV (snapshots the previous state, coalescing rapid autosaves).
+    With If-Match, a stale ETag is rejected with 412 before anything is loaded.
+    """
+    await _check_if_match(db, cv_id, current_user.id, if_match)
+    cv = await _get_user_cv(db, cv_id, current_user.id)
 
-    if not cv:
+    cv = await _save_cv_updates(db, cv, current_user.id, cv_data.dict(exclude_unset=True))
+    _set_etag(response, _cv_etag(cv.id, cv.revision))
+    return cv
+
+
+async def _save_cv_updates(db: AsyncSession, cv: CV, user_id: int, updates: Dict[str, Any]) -> CV:
+    """Write validated field updates to a CV behind the autosave snapshot policy"""
+    # A save that changes nothing writes nothing
+    if not await AsyncVersionService(db).snapshot_before_update(cv, user_id, updates):
+        return cv
+
+    for field, value in updates.items():
+        setattr(cv, field, value)
+    cv.revision = CV.revision + 1
+    sections = AsyncSectionStore(db)
+    await sections.save(cv)
+    await AsyncSearchIndex(db).index_cv(cv)
+
+    await db.commit()
+    await sections.refresh(cv)
+    return cv
+
+
+def _patch_field(pointer: Optional[str]) -> str:
+    """The CV field a JSON pointer in a patch operation addresses"""
+    field = pointer[1:].split('/', 1)[0] if pointer and pointer.startswith('/') else None
+    if field not in CVUpdate.model_fields:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="CV not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Patch paths must address a CV field or section item, got {pointer!r}"
         )
+    return field
 
-    create_version_snapshot(
-        db=db,
-        cv=cv,
-        user_id=current_user.id,
-        change_summary="Auto-saved before edit"
-    )
 
-    for field, value in cv_data.dict(exclude_unset=True).items():
-        setattr(cv, field, value)
+def _invalid_patch(location: str, error: ValidationError) -> HTTPException:
+    first = error.errors()[0]
+    path = '/'.join([location, *map(str, first['loc'])])
+    return HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"{path}: {first['msg']}")
+
+
+def _validate_patched_fields(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate patched fields. Scalars go through CVUpdate; in list sections
+    only items that differ from the stored ones are validated, so a one-bullet
+    edit doesn't re-validate the whole section.
+    """
+    updates = {}
+    scalars = {}
+    for field, value in after.items():
+        model = SECTION_ITEM_MODELS.get(field)
+        if model is None:
+            scalars[field] = value
+        elif value is None:
+            updates[field] = None
+        elif not isinstance(value, list):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"/{field}: must be a list"
+            )
+        else:
+            stored = before[field]
+            items = []
+            for index, item in enumerate(value):
+                if item not in stored:
+                    try:
+                        item = model.model_validate(item).model_dump()
+                    except ValidationError as e:
+                        raise _invalid_patch(f"/{field}/{index}", e)
+                items.append(item)
+            updates[field] = items
+
+    if scalars:
+        try:
+            updates.update(CVUpdate.model_validate(scalars).model_dump(exclude_unset=True))
+        except ValidationError as e:
+            raise _invalid_patch("", e)
+    for field in REQUIRED_CV_FIELDS:
+        if field in updates and updates[field] is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"/{field}: cannot be removed or set to null"
+            )
+    return updates
+
+
+@router.patch("/{cv_id}", response_model=CVResponse)
+async def patch_cv(
+    cv_id: int,
+    response: Response,
+    operations: List[CVPatchOperation] = Body(..., max_length=MAX_PATCH_OPERATIONS),
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Apply RFC 6902 JSON-patch operations to a CV. Paths address CV fields
+    and section items (/summary, /experience/2/description, /skills/-);
+    only the touched fields are validated and written. Honors If-Match
+    like PUT.
+    """
+    await _check_if_match(db, cv_id, current_user.id, if_match)
+    cv = await _get_user_cv(db, cv_id, current_user.id)
+
+    patch = [operation.dict(by_alias=True, exclude_unset=True) for operation in operations]
+    fields = set()
+    for operation in patch:
+        fields.add(_patch_field(operation['path']))
+        if 'from' in operation:
+            fields.add(_patch_field(operation['from']))
+
+    before = {}
+    for field in fields:
+        value = getattr(cv, field)
+        if field in SECTION_ITEM_MODELS:
+            value = _parse_legacy_text(value) or []
+        before[field] = value
 
-    db.commit()
-    db.refresh(cv)
+    try:
+        after = apply_patch(before, patch)
+    except JsonPatchTestFailed as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except JsonPatchError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    # Removing a field clears it
+    after = {field: after.get(field) for field in fields}
+    cv = await _save_cv_updates(db, cv, current_user.id, _validate_patched_fields(before, after))
+    _set_etag(response, _cv_etag(cv.id, cv.revision))
     return cv
 
 
+async def _purge_cv(cv_id: int) -> None:
+    """Delete a CV with a very large history, one batch of versions per transaction"""
+    batch_size = max(1, settings.CV_PURGE_BATCH_SIZE)
+    async with AsyncSessionLocal() as db:
+        while True:
+            batch = select(CVVersion.id).where(CVVersion.cv_id == cv_id).limit(batch_size)
+            result = await db.execute(delete(CVVersion).where(CVVersion.id.in_(batch)))
+            await db.commit()
+            if result.rowcount < batch_size:
+                break
+        await db.execute(delete(CV).where(CV.id == cv_id))
+        await db.commit()
+    logger.info("Purged CV %d", cv_id)
+
+
 @router.delete("/{cv_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_cv(
     cv_id: int,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Delete a CV"""
-    cv = db.query(CV).filter(
-        CV.id == cv_id,
-        CV.user_id == current_user.id
-    ).first()
-
-    if not cv:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="CV not found"
-        )
-
-    db.delete(cv)
-    db.commit()
+    """Delete a CV and its version history"""
+    # Ownership check only; the CV's content is never loaded
+    await _get_cv_revision(db, cv_id, current_user.id)
+
+    threshold = settings.CV_BACKGROUND_PURGE_THRESHOLD
+    if threshold > 0 and await AsyncVersionService(db).count_versions(cv_id) > threshold:
+        background_tasks.add_task(_purge_cv, cv_id)
+        return None
+
+    # Versions are removed by ON DELETE CASCADE without loading them
+    await db.execute(delete(CV).where(CV.id == cv_id))
+    await db.commit()
     return None
 
 
@@ -285,20 +1015,11 @@ async def get_job_suggestions(
     cv_id: int,
     request: Request,
     suggestion_request: JobSuggestionRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get AI-powered suggestions for tailoring a CV to a specific job description"""
-    cv = db.query(CV).filter(
-        CV.id == cv_id,
-        CV.user_id == current_user.id
-    ).first()
-
-    if not cv:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="CV not found"
-        )
+    cv = await _get_user_cv(db, cv_id, current_user.id)
 
     def _format_for_ai(data):
         if isinstance(data, list):
@@ -332,23 +1053,14 @@ async def get_job_suggestions(
 async def review_cv(
     cv_id: int,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get a recruiter-perspective review of a CV: ATS optimization,
     achievement quantification, and tailoring analysis.
     """
-    cv = db.query(CV).filter(
-        CV.id == cv_id,
-        CV.user_id == current_user.id
-    ).first()
-
-    if not cv:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="CV not found"
-        )
+    cv = await _get_user_cv(db, cv_id, current_user.id)
 
     def _format_for_ai(data):
         if isinstance(data, list):
@@ -381,90 +1093,133 @@ async def review_cv(
 @router.get("/{cv_id}/versions", response_model=List[CVVersionListItem])
 async def get_cv_versions(
     cv_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    before_version: Optional[int] = Query(None, ge=1, description="Return versions older than this version number"),
+    limit: int = Query(VERSION_PAGE_SIZE, ge=1, le=MAX_VERSION_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all versions of a CV (version history like Google Docs)"""
-    cv = db.query(CV).filter(
-        CV.id == cv_id,
-        CV.user_id == current_user.id
-    ).first()
-
-    if not cv:
+    """
+    Get a page of a CV's versions, newest first (version history like Google Docs).
+    Pass the last version_number of a page as before_version to get the next one;
+    X-Total-Count holds the total number of versions.
+    """
+    version_counter = await db.scalar(
+        select(CV.version_counter).where(CV.id == cv_id, CV.user_id == current_user.id)
+    )
+    if version_counter is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="CV not found"
         )
 
-    versions = db.query(CVVersion).filter(
-        CVVersion.cv_id == cv_id
-    ).order_by(CVVersion.version_number.desc()).all()
+    versions = AsyncVersionService(db)
+    total = await versions.count_versions(cv_id)
+    # Versions are immutable and numbers never reused: the counter moves on
+    # every new version and the count drops on every deletion. Each page
+    # gets its own tag.
+    etag = f'"versions-{cv_id}-{version_counter}-{total}-{before_version or 0}-{limit}"'
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
 
-    return versions
+    _set_etag(response, etag)
+    response.headers["X-Total-Count"] = str(total)
+    return await versions.list_versions(cv_id, before_version=before_version, limit=limit)
 
 
 @router.get("/{cv_id}/versions/{version_id}", response_model=CVVersionDetail)
 async def get_cv_version(
     cv_id: int,
     version_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get a specific version of a CV with full content"""
-    cv = db.query(CV).filter(
-        CV.id == cv_id,
-        CV.user_id == current_user.id
-    ).first()
+    """Get a specific version of a CV with full content (versions never change, so ETags stay valid)"""
+    await _get_cv_revision(db, cv_id, current_user.id)
 
-    if not cv:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="CV not found"
-        )
+    if if_none_match:
+        row = (await db.execute(
+            select(CVVersion.version_number, CVVersion.content_hash)
+            .where(CVVersion.id == version_id, CVVersion.cv_id == cv_id)
+        )).first()
+        if row is not None and _etag_matches(if_none_match, _version_etag(cv_id, *row)):
+            return _not_modified(_version_etag(cv_id, *row))
 
-    version = db.query(CVVersion).filter(
-        CVVersion.id == version_id,
-        CVVersion.cv_id == cv_id
-    ).first()
+    version = await _get_cv_version(db, cv_id, version_id)
 
-    if not version:
+    _set_etag(response, _version_etag(cv_id, version.version_number, version.content_hash))
+    return await AsyncVersionService(db).version_detail(version)
+
+
+@router.get("/{cv_id}/versions/{from_id}/diff/{to_id}", response_model=CVVersionDiff)
+async def get_cv_version_diff(
+    cv_id: int,
+    from_id: int,
+    to_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    What changed between two versions: changed fields (text diffed by word) and,
+    per section, added, removed and changed items matched by identity.
+    Computed once per version pair and cached.
+    """
+    await _get_cv_revision(db, cv_id, current_user.id)
+
+    rows = {
+        row.id: row for row in await db.execute(
+            select(CVVersion.id, CVVersion.version_number, CVVersion.content_hash)
+            .where(CVVersion.cv_id == cv_id, CVVersion.id.in_((from_id, to_id)))
+        )
+    }
+    if from_id not in rows or to_id not in rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Version not found"
         )
+    old, new = rows[from_id], rows[to_id]
 
-    return version
+    etag = f'"diff-{cv_id}-v{old.version_number}-v{new.version_number}-{(old.content_hash or "")[:8]}{(new.content_hash or "")[:8]}"'
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    _set_etag(response, etag)
+
+    key = version_diff_cache.make_key(cv_id, old.version_number, old.content_hash, new.version_number, new.content_hash)
+    diff = version_diff_cache.get(key)
+    if diff is None:
+        old_version = await _get_cv_version(db, cv_id, from_id)
+        new_version = await _get_cv_version(db, cv_id, to_id)
+        diff = await AsyncVersionService(db).diff(old_version, new_version, SECTION_ITEM_DEFAULTS)
+        version_diff_cache.put(key, diff)
+
+    return {"cv_id": cv_id, "from_version": old.version_number, "to_version": new.version_number, **diff}
 
 
 @router.post("/{cv_id}/versions", response_model=CVVersionListItem)
 async def create_named_version(
     cv_id: int,
     version_data: CVVersionCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Manually create a named version (like "Save as new version" in Google Docs)"""
-    cv = db.query(CV).filter(
-        CV.id == cv_id,
-        CV.user_id == current_user.id
-    ).first()
+    cv = await _get_user_cv(db, cv_id, current_user.id)
 
-    if not cv:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="CV not found"
-        )
-
-    version = create_version_snapshot(
-        db=db,
+    version = await AsyncVersionService(db).create_snapshot(
         cv=cv,
         user_id=current_user.id,
         version_name=version_data.version_name,
-        change_summary=version_data.change_summary or "Manual save"
+        change_summary=version_data.change_summary or "Manual save",
+        kind=KIND_NAMED
     )
 
-    db.commit()
-    db.refresh(version)
+    await db.commit()
+    await db.refresh(version)
 
     return version
 
@@ -473,55 +1228,28 @@ async def create_named_version(
 async def restore_cv_version(
     cv_id: int,
     version_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Restore a CV to a previous version (creates a new version with current state first)"""
-    cv = db.query(CV).filter(
-        CV.id == cv_id,
-        CV.user_id == current_user.id
-    ).first()
-
-    if not cv:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="CV not found"
-        )
+    cv = await _get_user_cv(db, cv_id, current_user.id)
 
-    version_to_restore = db.query(CVVersion).filter(
-        CVVersion.id == version_id,
-        CVVersion.cv_id == cv_id
-    ).first()
+    version_to_restore = await _get_cv_version(db, cv_id, version_id)
 
-    if not version_to_restore:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Version not found"
-        )
-
-    current_version = create_version_snapshot(
-        db=db,
+    versions = AsyncVersionService(db)
+    current_version = await versions.create_snapshot(
         cv=cv,
         user_id=current_user.id,
-        change_summary=f"Before restoring to version {version_to_restore.version_number}"
+        change_summary=f"Before restoring to version {version_to_restore.version_number}",
+        kind=KIND_RESTORE
     )
+    await versions.restore_into(cv, version_to_restore)
+    cv.revision = CV.revision + 1
+    await AsyncSectionStore(db).save(cv)
+    await AsyncSearchIndex(db).index_cv(cv)
 
-    cv.title = version_to_restore.title
-    cv.template = version_to_restore.template
-    cv.full_name = version_to_restore.full_name
-    cv.email = version_to_restore.email
-    cv.phone = version_to_restore.phone
-    cv.location = version_to_restore.location
-    cv.summary = version_to_restore.summary
-    cv.experience = version_to_restore.experience
-    cv.education = version_to_restore.education
-    cv.skills = version_to_restore.skills
-    cv.projects = version_to_restore.projects
-    cv.research = version_to_restore.research
-    cv.ai_prompt = version_to_restore.ai_prompt
-
-    db.commit()
-    db.refresh(current_version)
+    await db.commit()
+    await db.refresh(current_version)
 
     return CVVersionRestore(
         message=f"Successfully restored to version {version_to_restore.version_number}",
@@ -534,33 +1262,15 @@ async def restore_cv_version(
 async def delete_cv_version(
     cv_id: int,
     version_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete a specific version (optional cleanup)"""
-    cv = db.query(CV).filter(
-        CV.id == cv_id,
-        CV.user_id == current_user.id
-    ).first()
+    await _get_user_cv(db, cv_id, current_user.id)
 
-    if not cv:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="CV not found"
-        )
-
-    version = db.query(CVVersion).filter(
-        CVVersion.id == version_id,
-        CVVersion.cv_id == cv_id
-    ).first()
-
-    if not version:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Version not found"
-        )
+    version = await _get_cv_version(db, cv_id, version_id)
 
-    db.delete(version)
-    db.commit()
+    await AsyncVersionService(db).delete_version(version)
+    await db.commit()
 
     return None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Any, Dict, Optional
 from datetime import datetime
 import json
 
@@ -118,6 +118,14 @@ class CVUpdate(BaseModel):
     ai_prompt: Optional[str] = Field(None, max_length=5000)
 
 
+class CVPatchOperation(BaseModel):
+    """One RFC 6902 operation against a CV field or section item (PATCH /api/cv/{id})"""
+    op: str = Field(..., pattern="^(add|remove|replace|move|copy|test)$")
+    path: str = Field(..., max_length=300)
+    from_: Optional[str] = Field(None, alias="from", max_length=300)
+    value: Any = None
+
+
 class CVResponse(CVBase):
     """Schema for CV response"""
     id: int
@@ -134,6 +142,59 @@ class CVResponse(CVBase):
         from_attributes = True
 
 
+class CVImportRecord(CVCreate):
+    """A "cv" line of an export file"""
+    id: int
+    version_counter: int = Field(0, ge=0)
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class CVVersionImportRecord(CVCreate):
+    """A "version" line of an export file: version metadata plus full content"""
+    cv_id: int
+    version_number: int = Field(..., ge=1)
+    version_name: Optional[str] = Field(None, max_length=255)
+    change_summary: Optional[str] = Field(None, max_length=500)
+    kind: str = Field("auto", pattern="^(auto|named|restore)$")
+    created_at: Optional[datetime] = None
+
+
+class CVImportResult(BaseModel):
+    """Outcome of POST /api/cv/import"""
+    imported_cvs: int
+    imported_versions: int
+    cv_ids: Dict[int, int]  # exported CV id -> new CV id
+
+
+class CVSearchResult(BaseModel):
+    """
+    A search hit: a CV's current content (version_id null) or the text a
+    version added. `highlights` are [start, end) offsets into `snippet`.
+    """
+    cv_id: int
+    version_id: Optional[int] = None
+    version_number: Optional[int] = None
+    title: str
+    snippet: str
+    highlights: list[tuple[int, int]]
+    score: float
+
+
+class CVSummary(BaseModel):
+    """Lightweight CV listing item for the dashboard"""
+    id: int
+    title: str
+    template: str
+    full_name: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    version_count: int = 0
+
+    class Config:
+        from_attributes = True
+
+
 class AIGeneratedContent(BaseModel):
     """Response model for AI-generated content"""
     full_name: str = ""
@@ -173,6 +234,7 @@ class CVVersionBase(BaseModel):
     version_number: int
     version_name: Optional[str] = None
     change_summary: Optional[str] = None
+    kind: Optional[str] = None  # auto | named | restore
     created_at: datetime
 
     class Config:
@@ -222,6 +284,19 @@ class CVVersionDetail(CVVersionBase):
         }
 
 
+class CVVersionDiff(BaseModel):
+    """
+    Structural diff between two versions. `fields` holds changed scalar fields
+    ({"from", "to"} or {"words": [[op, text], ...]} for text); `sections` holds
+    added/removed/changed items per list section. Unchanged parts are omitted.
+    """
+    cv_id: int
+    from_version: int
+    to_version: int
+    fields: Dict[str, Any]
+    sections: Dict[str, Any]
+
+
 class CVVersionCreate(BaseModel):
     """Schema for creating a named version"""
     version_name: Optional[str] = Field(None, max_length=255)
@@ -1,4 +1,10 @@
-from .base import Base, get_db, init_db, engine, SessionLocal
+from .base import (
+    Base, get_db, get_async_db, init_db, engine, async_engine, SessionLocal, AsyncSessionLocal,
+    create_db_engine, create_async_db_engine
+)
 from .config import settings
 
-__all__ = ["Base", "get_db", "init_db", "engine", "SessionLocal", "settings"]
+__all__ = [
+    "Base", "get_db", "get_async_db", "init_db", "engine", "async_engine", "SessionLocal", "AsyncSessionLocal",
+    "create_db_engine", "create_async_db_engine", "settings"
+]
@@ -1,16 +1,105 @@
-from sqlalchemy import create_engine
+from typing import AsyncIterator
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
 
-# Create session factory
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    """SQLite leaves foreign keys (and so ON DELETE CASCADE) off unless asked, per connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA foreign_keys=ON")
+    finally:
+        cursor.close()
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Per-connection SQLite tuning from the settings profile"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        # Negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(database_url: str, tuned: bool = True, **kwargs) -> Engine:
+    """
+    Create an engine with the performance profile from settings: SQLite
+    pragmas on connect, or pool sizing/recycling for server databases.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        kwargs.setdefault("connect_args", {"check_same_thread": False})
+        engine = create_engine(url, **kwargs)
+        event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+        in_memory = url.database in (None, "", ":memory:")
+        if tuned and settings.SQLITE_TUNING_ENABLED and not in_memory:
+            event.listen(engine, "connect", _apply_sqlite_pragmas)
+        return engine
+
+    if tuned:
+        kwargs.setdefault("pool_size", settings.DB_POOL_SIZE)
+        kwargs.setdefault("max_overflow", settings.DB_MAX_OVERFLOW)
+        kwargs.setdefault("pool_timeout", settings.DB_POOL_TIMEOUT)
+        kwargs.setdefault("pool_recycle", settings.DB_POOL_RECYCLE)
+        kwargs.setdefault("pool_pre_ping", settings.DB_POOL_PRE_PING)
+    return create_engine(url, **kwargs)
+
+
+# Async drivers for the sync URLs DATABASE_URL usually holds
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+
+def async_database_url(database_url: str) -> URL:
+    """The async-driver equivalent of a database URL (sqlite:// -> sqlite+aiosqlite://)"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def create_async_db_engine(database_url: str, tuned: bool = True, **kwargs) -> AsyncEngine:
+    """Async counterpart of create_db_engine, with the same performance profile"""
+    url = async_database_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        engine = create_async_engine(url, **kwargs)
+        event.listen(engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+        in_memory = url.database in (None, "", ":memory:")
+        if tuned and settings.SQLITE_TUNING_ENABLED and not in_memory:
+            event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        return engine
+
+    if tuned:
+        kwargs.setdefault("pool_size", settings.DB_POOL_SIZE)
+        kwargs.setdefault("max_overflow", settings.DB_MAX_OVERFLOW)
+        kwargs.setdefault("pool_timeout", settings.DB_POOL_TIMEOUT)
+        kwargs.setdefault("pool_recycle", settings.DB_POOL_RECYCLE)
+        kwargs.setdefault("pool_pre_ping", settings.DB_POOL_PRE_PING)
+    return create_async_engine(url, **kwargs)
+
+
+# Create database engines: the sync one serves migrations and background
+# jobs, request handlers use the async one
+engine = create_db_engine(settings.DATABASE_URL)
+async_engine = create_async_db_engine(settings.DATABASE_ASYNC_URL or settings.DATABASE_URL)
+
+# Create session factories. Async sessions don't expire on commit, since
+# touching an expired attribute would need an implicit (sync) reload.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 # Create base class for models
 Base = declarative_base()
@@ -28,7 +117,18 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency to get an async database session.
+    Yields an AsyncSession and ensures it's closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
-    """Initialize database tables"""
-    from ..models import User, CV, CVVersion  # Import all models
+    """Initialize database tables and apply pending migrations"""
+    from ..models import User, CV, CVVersion, CVSearchDocument, CVSection, CVItem  # Import all models
+    from .migrations import run_migrations
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
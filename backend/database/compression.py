@@ -0,0 +1,143 @@
+"""
+Compressed column types
+CompressedJSON and CompressedText store large CV content as compressed
+bytes. Values at or above COLUMN_COMPRESSION_MIN_BYTES are compressed with
+zlib, or zstd (optionally with a shared dictionary trained on CV data);
+smaller values are stored as plain UTF-8. Every stored value is
+self-describing, so changing the codec never breaks existing rows:
+
+    b"\\x00Z" + zlib stream      zlib
+    b"\\x00S" + zstd frame       zstd (the frame records the dictionary id)
+    anything else               plain UTF-8 (small values, pre-migration rows)
+
+JSON and text never start with a NUL byte, so the formats can't collide.
+"""
+
+import json
+import zlib
+import logging
+import threading
+from typing import Iterable, Optional, Union
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+ZLIB_MARKER = b"\x00Z"
+ZSTD_MARKER = b"\x00S"
+
+
+class ColumnCodec:
+    """Encodes/decodes stored column bytes according to the compression settings"""
+
+    def __init__(
+        self,
+        method: str = "zlib",
+        min_bytes: int = 256,
+        level: int = 6,
+        dictionary_path: Optional[str] = None
+    ):
+        self.method = method.lower()
+        self.min_bytes = min_bytes
+        self.level = level
+        self.dictionary_path = dictionary_path
+        self._zstd = None
+        self._local = threading.local()
+        if self.method not in ("zlib", "zstd", "none"):
+            raise ValueError(f"Unknown column compression method: {method!r}")
+        if self.method == "zstd":
+            try:
+                self._load_zstd()
+            except ImportError:
+                logger.warning("zstandard is not installed; compressing columns with zlib instead")
+                self.method = "zlib"
+
+    def _load_zstd(self):
+        """The zstandard module and the shared dictionary, loaded once"""
+        if self._zstd is None:
+            import zstandard
+
+            dictionary = None
+            if self.dictionary_path:
+                with open(self.dictionary_path, "rb") as f:
+                    dictionary = zstandard.ZstdCompressionDict(f.read())
+            self._zstd = (zstandard, dictionary)
+        return self._zstd
+
+    def _zstd_codecs(self):
+        # zstd compressor/decompressor objects aren't thread-safe; keep one pair per thread
+        codecs = getattr(self._local, "codecs", None)
+        if codecs is None:
+            zstandard, dictionary = self._load_zstd()
+            codecs = (
+                zstandard.ZstdCompressor(level=self.level, dict_data=dictionary),
+                zstandard.ZstdDecompressor(dict_data=dictionary),
+            )
+            self._local.codecs = codecs
+        return codecs
+
+    def encode(self, data: bytes) -> bytes:
+        if self.method == "none" or len(data) < self.min_bytes:
+            return data
+        if self.method == "zstd":
+            return ZSTD_MARKER + self._zstd_codecs()[0].compress(data)
+        return ZLIB_MARKER + zlib.compress(data, self.level)
+
+    def decode(self, stored: Union[bytes, str]) -> bytes:
+        if isinstance(stored, str):
+            return stored.encode("utf-8")
+        stored = bytes(stored)
+        if stored.startswith(ZLIB_MARKER):
+            return zlib.decompress(stored[2:])
+        if stored.startswith(ZSTD_MARKER):
+            return self._zstd_codecs()[1].decompress(stored[2:])
+        return stored
+
+
+def train_dictionary(samples: Iterable[bytes], dict_size: int = 32 * 1024) -> bytes:
+    """Train a zstd dictionary on sample column values (requires zstandard)"""
+    import zstandard
+
+    return zstandard.train_dictionary(dict_size, list(samples)).as_bytes()
+
+
+codec = ColumnCodec(
+    method=settings.COLUMN_COMPRESSION,
+    min_bytes=settings.COLUMN_COMPRESSION_MIN_BYTES,
+    level=settings.COLUMN_COMPRESSION_LEVEL,
+    dictionary_path=settings.COLUMN_COMPRESSION_DICTIONARY,
+)
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON document stored through the column codec"""
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return codec.encode(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return json.loads(codec.decode(value))
+
+
+class CompressedText(TypeDecorator):
+    """Text stored through the column codec"""
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return codec.encode(value.encode("utf-8"))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return codec.decode(value).decode("utf-8")
@@ -7,6 +7,28 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./cv_builder.db"  # Default to SQLite for easy setup
+    DATABASE_ASYNC_URL: Optional[str] = None  # Defaults to DATABASE_URL with its async driver (aiosqlite/asyncpg)
+    
+    # Database performance profile. SQLite pragmas are applied on every new connection;
+    # pool settings apply to server databases (PostgreSQL, MySQL)
+    SQLITE_TUNING_ENABLED: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"  # Readers don't block on commits
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # Safe with WAL; fsync at checkpoints only
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # Seconds; stay below server/proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True
+    
+    # Compression of large CV content columns (summary, experience, education, projects,
+    # research) in cvs and cv_versions. Existing values stay readable when this changes.
+    COLUMN_COMPRESSION: str = "zlib"  # zlib | zstd (needs zstandard) | none
+    COLUMN_COMPRESSION_MIN_BYTES: int = 256  # Smaller values are stored uncompressed
+    COLUMN_COMPRESSION_LEVEL: int = 6
+    COLUMN_COMPRESSION_DICTIONARY: Optional[str] = None  # Path to a zstd dictionary trained on CV data
     
     # JWT Settings
     SECRET_KEY: str = "your-secret-key-change-this-in-production"  # Change in production!
@@ -19,6 +41,65 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = False
     
+    # Document uploads & extraction
+    PARSE_WORKERS: int = 4
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    UPLOAD_SPOOL_MAX_MEMORY: int = 1024 * 1024  # Larger uploads spill to a temp file
+    
+    # Text extraction backends, tried in order (comma-separated registry names)
+    PDF_EXTRACTORS: str = "pypdf2,pdfplumber"
+    DOCX_EXTRACTORS: str = "docx-stream,python-docx"
+    EXTRACTION_MIN_CHARS: int = 20
+    EXTRACTION_MIN_PRINTABLE_RATIO: float = 0.9
+    
+    # AI fallback is only used when local experience/education confidence is below this
+    AI_FALLBACK_MIN_CONFIDENCE: float = 0.6
+    
+    # Azure OpenAI call limits
+    AI_MAX_CONCURRENCY: int = 4  # Concurrent completions per process
+    AI_CHUNK_TOKEN_BUDGET: int = 2000  # Document parsing splits longer text into chunks
+    AI_MAX_CHUNKS: int = 8  # Text beyond this many chunks is not sent to the model
+    
+    # Document parse cache
+    PARSE_CACHE_ENABLED: bool = True
+    PARSE_CACHE_DIR: str = ".cache/parse_results"
+    PARSE_CACHE_MEMORY_ENTRIES: int = 256
+    PARSE_CACHE_MAX_BYTES: int = 200 * 1024 * 1024  # 200MB on disk
+    PARSE_CACHE_MAX_AGE_SECONDS: int = 7 * 24 * 3600  # Cached results hold personal data; 0 keeps them
+    
+    # CV version history: every Nth version is stored in full, the rest as JSON patches
+    VERSION_KEYFRAME_INTERVAL: int = 20
+    VERSION_AUTOSAVE_WINDOW_SECONDS: int = 300  # Autosaves closer together than this share one version
+    
+    # Autosave retention: keep everything for KEEP_ALL_HOURS, the newest autosave per hour up
+    # to KEEP_HOURLY_DAYS, then one per day. Named/restore versions are always kept.
+    VERSION_RETENTION_KEEP_ALL_HOURS: int = 24
+    VERSION_RETENTION_KEEP_HOURLY_DAYS: int = 7
+    VERSION_COMPACTION_INTERVAL_SECONDS: int = 3600  # 0 disables the background compactor
+    VERSION_COMPACTION_BATCH_SIZE: int = 200  # Versions deleted per transaction
+    
+    # CV deletion: versions go with the CV through ON DELETE CASCADE. CVs with more versions
+    # than the threshold are purged after the response, a batch per transaction, and stay
+    # listed until the purge finishes (0 always deletes within the request)
+    CV_BACKGROUND_PURGE_THRESHOLD: int = 0
+    CV_PURGE_BATCH_SIZE: int = 1000
+    
+    # Version diffs kept in memory, per version pair
+    VERSION_DIFF_CACHE_SIZE: int = 512
+    
+    # CV export/import: rows fetched per server-side cursor round trip, rows per bulk insert
+    EXPORT_BATCH_SIZE: int = 500
+    IMPORT_BATCH_SIZE: int = 500
+    IMPORT_MAX_UNCOMPRESSED_SIZE: int = 500 * 1024 * 1024  # Caps what a gzipped upload may inflate to
+    
+    # Full-text search: versions are indexed by the text they added over the previous version
+    SEARCH_INDEX_VERSIONS: bool = True
+    SEARCH_SNIPPET_TOKENS: int = 16
+    
+    # CV list sections: 'json' columns on cvs, or 'items' rows in cv_sections/cv_items
+    # (item-level writes). CVs move to this layout on their next save; both stay readable.
+    CV_SECTION_STORAGE: str = "json"  # json | items
+    
     # CORS - Will be parsed as string and split by comma
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
     
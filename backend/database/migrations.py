@@ -0,0 +1,319 @@
+"""
+Lightweight schema/data migrations
+Each migration runs once, in order, inside its own transaction and is
+recorded in the schema_migrations table. Migrations must be idempotent
+against a database freshly created by Base.metadata.create_all().
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+from sqlalchemy import JSON, Boolean, Integer, String, Text, bindparam, column, inspect, select, table, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def _column_names(conn: Connection, table: str) -> set:
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+
+# Columns added to cv_versions after its first release, in order
+_VERSION_COLUMNS = [
+    # Existing rows are full snapshots, i.e. valid keyframes
+    ("is_keyframe", "BOOLEAN NOT NULL DEFAULT 1"),
+    ("delta", "JSON"),
+    ("kind", "VARCHAR(20) NOT NULL DEFAULT 'auto'"),
+    ("content_hash", "VARCHAR(64)"),
+]
+
+
+def _ensure_version_columns(conn: Connection) -> None:
+    """
+    Add any missing cv_versions columns. Data migrations that go through the
+    ORM call this first, since the model always maps the latest schema.
+    """
+    columns = _column_names(conn, "cv_versions")
+    for name, ddl in _VERSION_COLUMNS:
+        if name not in columns:
+            conn.execute(text(f"ALTER TABLE cv_versions ADD COLUMN {name} {ddl}"))
+
+
+# None is stored as SQL NULL, as the ORM stores it
+_JSON = JSON(none_as_null=True)
+
+# cv_versions as it was before 0007: data migrations up to then read and
+# write content in these column types, not the model's compressed ones
+_versions_before_compression = table(
+    "cv_versions",
+    column("id", Integer), column("cv_id", Integer), column("version_number", Integer),
+    column("is_keyframe", Boolean), column("delta", _JSON), column("content_hash", String),
+    column("title", String), column("template", String), column("full_name", String), column("email", String),
+    column("phone", String), column("location", String), column("summary", Text), column("experience", _JSON),
+    column("education", _JSON), column("skills", _JSON), column("projects", _JSON), column("research", _JSON),
+    column("ai_prompt", Text),
+)
+
+
+def _version_history(conn: Connection, cv_id: int) -> List[Tuple[int, Dict[str, Any]]]:
+    """(version id, full content) for a CV's history in version order, read with the pre-0007 column types"""
+    from ..services.version_service import VERSIONED_FIELDS
+    from ..utils.json_patch import apply_patch
+
+    versions = _versions_before_compression
+    rows = conn.execute(
+        select(versions.c.id, versions.c.is_keyframe, versions.c.delta, *(versions.c[name] for name in VERSIONED_FIELDS))
+        .where(versions.c.cv_id == cv_id).order_by(versions.c.version_number)
+    ).all()
+    history, state = [], None
+    for row in rows:
+        if row.is_keyframe or state is None:
+            state = {name: row._mapping[name] for name in VERSIONED_FIELDS}
+        else:
+            state = apply_patch(state, row.delta or [])
+        history.append((row.id, state))
+    return history
+
+
+def _delta_encode_version_history(conn: Connection) -> None:
+    """Re-encode existing full-snapshot histories as keyframes plus deltas"""
+    from ..services.version_service import VersionService
+
+    _ensure_version_columns(conn)
+    versions = _versions_before_compression
+    # Only encode_state is used, which doesn't touch the session
+    service = VersionService(None)
+    cv_ids = [row[0] for row in conn.execute(text("SELECT DISTINCT cv_id FROM cv_versions"))]
+    rows = 0
+    for cv_id in cv_ids:
+        history = _version_history(conn, cv_id)
+        previous, since_keyframe, params = None, 0, []
+        for version_id, state in history:
+            stored = service.encode_state(state, previous, since_keyframe)
+            since_keyframe = 1 if stored["is_keyframe"] else since_keyframe + 1
+            previous = state
+            params.append(dict(stored, version_id=version_id))
+        if params:
+            conn.execute(update(versions).where(versions.c.id == bindparam("version_id")), params)
+        rows += len(history)
+    logger.info("Delta-encoded %d version rows across %d CVs", rows, len(cv_ids))
+
+
+def _add_version_policy_columns(conn: Connection) -> None:
+    """cv_versions.kind / cv_versions.content_hash for snapshot dedupe and coalescing"""
+    from ..services.version_service import content_hash
+
+    _ensure_version_columns(conn)
+    conn.execute(text("UPDATE cv_versions SET kind = 'named' WHERE kind = 'auto' AND version_name IS NOT NULL"))
+    conn.execute(text(
+        "UPDATE cv_versions SET kind = 'restore' WHERE kind = 'auto' "
+        "AND version_name IS NULL AND change_summary LIKE 'Before restoring to version %'"
+    ))
+
+    versions = _versions_before_compression
+    cv_ids = [row[0] for row in conn.execute(text(
+        "SELECT DISTINCT cv_id FROM cv_versions WHERE content_hash IS NULL"
+    ))]
+    for cv_id in cv_ids:
+        params = [
+            {"version_id": version_id, "content_hash": content_hash(state)}
+            for version_id, state in _version_history(conn, cv_id)
+        ]
+        if params:
+            conn.execute(update(versions).where(versions.c.id == bindparam("version_id")), params)
+
+
+def _add_version_counter(conn: Connection) -> None:
+    """cvs.version_counter plus a unique (cv_id, version_number) index on cv_versions"""
+    if "version_counter" not in _column_names(conn, "cvs"):
+        conn.execute(text("ALTER TABLE cvs ADD COLUMN version_counter INTEGER NOT NULL DEFAULT 0"))
+
+    # Concurrent saves could hand out the same number twice; shift the later
+    # duplicates (and anything they collide with) up, keeping history order
+    duplicated = [row[0] for row in conn.execute(text(
+        "SELECT DISTINCT cv_id FROM cv_versions GROUP BY cv_id, version_number HAVING COUNT(*) > 1"
+    ))]
+    renumbered = 0
+    for cv_id in duplicated:
+        rows = conn.execute(
+            text("SELECT id, version_number FROM cv_versions WHERE cv_id = :cv_id ORDER BY version_number, id"),
+            {"cv_id": cv_id}
+        ).all()
+        previous = 0
+        for version_id, number in rows:
+            if number <= previous:
+                number = previous + 1
+                conn.execute(
+                    text("UPDATE cv_versions SET version_number = :number WHERE id = :id"),
+                    {"number": number, "id": version_id}
+                )
+                renumbered += 1
+            previous = number
+    if renumbered:
+        logger.info("Renumbered %d duplicate versions across %d CVs", renumbered, len(duplicated))
+
+    conn.execute(text(
+        "UPDATE cvs SET version_counter = COALESCE("
+        "(SELECT MAX(version_number) FROM cv_versions WHERE cv_versions.cv_id = cvs.id), 0)"
+    ))
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_cv_versions_cv_id_version_number "
+        "ON cv_versions (cv_id, version_number)"
+    ))
+
+
+def _add_cv_listing_index(conn: Connection) -> None:
+    """(user_id, updated_at) index behind the dashboard listing"""
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_cvs_user_id_updated_at ON cvs (user_id, updated_at)"))
+
+
+def _add_cv_revision(conn: Connection) -> None:
+    """cvs.revision, the row version behind CV ETags"""
+    if "revision" not in _column_names(conn, "cvs"):
+        conn.execute(text("ALTER TABLE cvs ADD COLUMN revision INTEGER NOT NULL DEFAULT 1"))
+
+
+# Columns stored through the compression codec (database/compression.py)
+_COMPRESSED_COLUMNS = ("summary", "experience", "education", "projects", "research")
+
+
+def _compress_content_columns(conn: Connection, batch_size: int = 500) -> None:
+    """Rewrite CV content columns through the compression codec"""
+    from .compression import codec
+
+    dialect = conn.dialect.name
+    for table in ("cvs", "cv_versions"):
+        # SQLite stores the bytes in the existing columns as they are
+        for column in _COMPRESSED_COLUMNS:
+            if dialect == "postgresql":
+                conn.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BYTEA "
+                    f"USING convert_to({column}::text, 'UTF8')"
+                ))
+            elif dialect == "mysql":
+                conn.execute(text(f"ALTER TABLE {table} MODIFY {column} LONGBLOB"))
+
+        columns = ", ".join(_COMPRESSED_COLUMNS)
+        assignments = ", ".join(f"{column} = :{column}" for column in _COMPRESSED_COLUMNS)
+        update = text(f"UPDATE {table} SET {assignments} WHERE id = :id")
+        last_id, rewritten, saved = 0, 0, 0
+        while True:
+            rows = conn.execute(
+                text(f"SELECT id, {columns} FROM {table} WHERE id > :last_id ORDER BY id LIMIT :limit"),
+                {"last_id": last_id, "limit": batch_size}
+            ).all()
+            if not rows:
+                break
+            params = []
+            for row in rows:
+                values = {"id": row[0]}
+                for column, stored in zip(_COMPRESSED_COLUMNS, row[1:]):
+                    if stored is None:
+                        values[column] = None
+                        continue
+                    raw = codec.decode(stored)
+                    values[column] = codec.encode(raw)
+                    saved += len(raw) - len(values[column])
+                params.append(values)
+            conn.execute(update, params)
+            rewritten += len(rows)
+            last_id = rows[-1][0]
+        logger.info("Compressed %d %s rows, %d bytes saved", rewritten, table, saved)
+
+
+def _build_search_index(conn: Connection) -> None:
+    """cv_search FTS5 table (SQLite) and search documents for existing CVs and their history"""
+    from ..models.cv import CV
+    from ..services.search_index import SEARCH_SECTIONS, SearchIndex, create_fts_index
+    from ..services.version_service import VersionService
+
+    create_fts_index(conn)
+    if conn.execute(text("SELECT 1 FROM cv_search_documents LIMIT 1")).first() is not None:
+        return
+
+    cv_ids = [row[0] for row in conn.execute(text("SELECT id FROM cvs ORDER BY id"))]
+    session = Session(bind=conn)
+    try:
+        index = SearchIndex(session)
+        service = VersionService(session)
+        versions = 0
+        for cv_id in cv_ids:
+            # Only the indexed columns: later migrations add columns the model already maps
+            cv = session.execute(select(
+                CV.id, CV.user_id, CV.title, CV.summary, *(getattr(CV, name) for name in SEARCH_SECTIONS)
+            ).where(CV.id == cv_id)).one()
+            index.index_cv(cv)
+            history, previous = [], None
+            for version, state in service.iter_states(cv_id):
+                history.append((cv_id, version.id, state, previous))
+                previous = state
+            index.index_versions(cv.user_id, history)
+            versions += len(history)
+            session.flush()
+            session.expunge_all()
+        logger.info("Indexed %d CVs and %d versions for search", len(cv_ids), versions)
+    finally:
+        session.close()
+
+
+def _add_cv_section_layout(conn: Connection) -> None:
+    """cvs.section_layout; the cv_sections/cv_items tables come from create_all()"""
+    if "section_layout" not in _column_names(conn, "cvs"):
+        conn.execute(text("ALTER TABLE cvs ADD COLUMN section_layout VARCHAR(10) NOT NULL DEFAULT 'json'"))
+
+
+def _recreate_stale_search_index(conn: Connection) -> None:
+    """Recreate cv_search (and rebuild it) where its definition differs from FTS_DEFINITION"""
+    from ..services.search_index import FTS_DEFINITION, FTS_TABLE, create_fts_index
+
+    if conn.dialect.name != "sqlite":
+        return
+    sql = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+    ).scalar()
+    if sql is None or sql.endswith(FTS_DEFINITION):
+        return
+    for trigger in ("ai", "ad", "au"):
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{trigger}"))
+    conn.execute(text(f"DROP TABLE {FTS_TABLE}"))
+    if create_fts_index(conn):
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    ("0001_cv_versions_delta_columns", _ensure_version_columns),
+    ("0002_cv_versions_delta_encode", _delta_encode_version_history),
+    ("0003_cv_versions_kind_and_hash", _add_version_policy_columns),
+    ("0004_cv_version_counter", _add_version_counter),
+    ("0005_cvs_user_updated_index", _add_cv_listing_index),
+    ("0006_cvs_revision", _add_cv_revision),
+    ("0007_compress_content_columns", _compress_content_columns),
+    ("0008_cv_search_index", _build_search_index),
+    ("0009_cv_section_layout", _add_cv_section_layout),
+    ("0010_cv_search_definition", _recreate_stale_search_index),
+]
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """Apply pending migrations. Returns the names of the ones applied."""
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "name VARCHAR(255) PRIMARY KEY, applied_at TIMESTAMP NOT NULL)"
+        ))
+        applied = {row[0] for row in conn.execute(text("SELECT name FROM schema_migrations"))}
+
+    newly_applied = []
+    for name, migrate in MIGRATIONS:
+        if name in applied:
+            continue
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (name, applied_at) VALUES (:name, :applied_at)"),
+                {"name": name, "applied_at": datetime.now(timezone.utc)}
+            )
+        logger.info("Applied migration %s", name)
+        newly_applied.append(name)
+    return newly_applied
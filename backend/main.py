@@ -8,6 +8,7 @@ from slowapi.errors import RateLimitExceeded
 from .database import init_db, settings
 from .api import auth_router
 from .api.cv import router as cv_router
+from .services.version_compactor import version_compactor
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +36,9 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type", "Accept"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "Accept", "If-Match", "If-None-Match"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "ETag"],
 )
 
 
@@ -57,9 +59,15 @@ app.include_router(cv_router)
 async def startup_event():
     init_db()
     logger.info("Database initialized")
+    version_compactor.start()
     logger.info("%s v%s started", settings.APP_NAME, settings.APP_VERSION)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    version_compactor.stop()
+
+
 @app.get("/")
 async def root():
     return {
@@ -1,5 +1,7 @@
 from .user import User
 from .cv import CV
 from .cv_version import CVVersion
+from .cv_search import CVSearchDocument
+from .cv_section import CVSection, CVItem
 
-__all__ = ["User", "CV", "CVVersion"]
+__all__ = ["User", "CV", "CVVersion", "CVSearchDocument", "CVSection", "CVItem"]
@@ -1,15 +1,19 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
+from ..database.compression import CompressedJSON, CompressedText
 
 
 class CV(Base):
     """CV model to store user CVs"""
     __tablename__ = "cvs"
+    __table_args__ = (
+        Index("ix_cvs_user_id_updated_at", "user_id", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String(255), nullable=False)
     template = Column(String(50), nullable=False)  # 'modern' or 'classic'
     
@@ -20,20 +24,34 @@ class CV(Base):
     location = Column(String(255))
     
     # CV Content
-    summary = Column(Text)
-    experience = Column(JSON)
-    education = Column(JSON)
+    summary = Column(CompressedText)
+    experience = Column(CompressedJSON)
+    education = Column(CompressedJSON)
     skills = Column(JSON)
-    projects = Column(JSON)
-    research = Column(JSON)
+    projects = Column(CompressedJSON)
+    research = Column(CompressedJSON)
     
     # AI Prompt (stored for reference)
     ai_prompt = Column(Text)
     
+    # Last version number handed out; bumped atomically by VersionService
+    version_counter = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    # Bumped on every content change; the CV's ETag is derived from it
+    revision = Column(Integer, nullable=False, default=1, server_default="1")
+    
+    # Where the list sections live: 'json' (the columns above) or 'items'
+    # (cv_sections/cv_items, see services.section_store)
+    section_layout = Column(String(10), nullable=False, default="json", server_default="json")
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationships
+    # Relationships. Versions are removed by ON DELETE CASCADE in the database
+    # rather than loaded and deleted one by one (passive_deletes).
     user = relationship("User", back_populates="cvs")
-    versions = relationship("CVVersion", back_populates="cv", cascade="all, delete-orphan", order_by="desc(CVVersion.version_number)")
+    versions = relationship(
+        "CVVersion", back_populates="cv", cascade="all, delete-orphan", passive_deletes=True,
+        order_by="desc(CVVersion.version_number)"
+    )
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
+from ..database import Base
+
+
+class CVSearchDocument(Base):
+    """
+    Flattened text of a CV (version_id NULL) or of what a version added,
+    behind full-text search. Maintained by services.search_index; on SQLite
+    the cv_search FTS5 table indexes it through triggers.
+    """
+    __tablename__ = "cv_search_documents"
+    __table_args__ = (
+        Index("ix_cv_search_documents_cv_id_version_id", "cv_id", "version_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    cv_id = Column(Integer, ForeignKey("cvs.id", ondelete="CASCADE"), nullable=False)
+    version_id = Column(Integer, ForeignKey("cv_versions.id", ondelete="CASCADE"), nullable=True, index=True)
+    title = Column(String(255), nullable=False, default="", server_default="")
+    body = Column(Text, nullable=False, default="", server_default="")
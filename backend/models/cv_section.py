@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, JSON, Index, UniqueConstraint
+from ..database import Base
+
+
+class CVSection(Base):
+    """
+    A list section (experience, skills, ...) of a CV kept in the normalized
+    layout; a section that is None has no row. Maintained by
+    services.section_store.
+    """
+    __tablename__ = "cv_sections"
+    __table_args__ = (
+        UniqueConstraint("cv_id", "name", name="uq_cv_sections_cv_id_name"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    cv_id = Column(Integer, ForeignKey("cvs.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String(20), nullable=False)
+
+
+class CVItem(Base):
+    """One item of a normalized CV section, ordered by its position key"""
+    __tablename__ = "cv_items"
+    __table_args__ = (
+        Index("ix_cv_items_section_id_position", "section_id", "position", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    section_id = Column(Integer, ForeignKey("cv_sections.id", ondelete="CASCADE"), nullable=False)
+    # Fractional ordering key: inserting or moving an item rewrites only that row
+    position = Column(String(255), nullable=False)
+    data = Column(JSON, nullable=False)
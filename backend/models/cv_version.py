@@ -1,12 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import expression
 from datetime import datetime, timezone
 from ..database import Base
+from ..database.compression import CompressedJSON, CompressedText
 
 
 class CVVersion(Base):
     """CV Version model to store version history of CVs (like Google Docs)"""
     __tablename__ = "cv_versions"
+    __table_args__ = (
+        Index("ix_cv_versions_cv_id_version_number", "cv_id", "version_number", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     cv_id = Column(Integer, ForeignKey("cvs.id", ondelete="CASCADE"), nullable=False)
@@ -15,6 +20,14 @@ class CVVersion(Base):
     # Version metadata
     version_name = Column(String(255), nullable=True)  # Optional user-defined name
     change_summary = Column(String(500), nullable=True)  # Auto-generated or user summary
+    kind = Column(String(20), nullable=False, default="auto", server_default="auto")  # auto | named | restore
+    content_hash = Column(String(64), nullable=True)  # sha256 of the snapshot content
+    
+    # Storage: keyframes hold a full snapshot in the columns below; other rows
+    # hold a JSON patch against the previous version in `delta` and only keep
+    # title/template. Use VersionService to read version content.
+    is_keyframe = Column(Boolean, nullable=False, default=True, server_default=expression.true())
+    delta = Column(JSON, nullable=True)
     
     # Snapshot of CV data at this version
     title = Column(String(255), nullable=False)
@@ -23,19 +36,19 @@ class CVVersion(Base):
     email = Column(String(255))
     phone = Column(String(50))
     location = Column(String(255))
-    summary = Column(Text)
-    experience = Column(JSON)
-    education = Column(JSON)
+    summary = Column(CompressedText)
+    experience = Column(CompressedJSON)
+    education = Column(CompressedJSON)
     skills = Column(JSON)
-    projects = Column(JSON)
-    research = Column(JSON)
+    projects = Column(CompressedJSON)
+    research = Column(CompressedJSON)
     ai_prompt = Column(Text)
     
     # Timestamp when version was created
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     
     # Who created this version (for future collaboration feature)
-    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     
     # Relationships
     cv = relationship("CV", back_populates="versions")
@@ -21,7 +21,7 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationship
-    cvs = relationship("CV", back_populates="user", cascade="all, delete-orphan")
+    cvs = relationship("CV", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<User {self.username}>"
@@ -1,3 +1,4 @@
 from .auth_service import AuthService
+from .version_service import VersionService, AsyncVersionService
 
-__all__ = ["AuthService"]
+__all__ = ["AuthService", "VersionService", "AsyncVersionService"]
@@ -3,11 +3,16 @@ import re
 import json
 import time
 import random
+import asyncio
 import logging
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, Optional
 from openai import AzureOpenAI, APIStatusError, APIConnectionError
 from dotenv import load_dotenv
 
+from ..database.config import settings
+from .document_chunker import split_into_chunks, merge_chunk_results
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -54,6 +59,9 @@ class AIService:
     _instance = None
     _client = None
     _deployment = None
+    # Caps in-flight Azure calls across threads and event loops. Acquiring it
+    # blocks, so async callers go through asyncio.to_thread.
+    _call_slots = threading.BoundedSemaphore(settings.AI_MAX_CONCURRENCY)
 
     def __new__(cls):
         if cls._instance is None:
@@ -118,12 +126,13 @@ class AIService:
 
         for attempt in range(max_retries):
             try:
-                response = self._client.chat.completions.create(
-                    model=self._deployment,
-                    messages=messages,
-                    temperature=temperature,
-                    response_format={"type": "json_object"}
-                )
+                with self._call_slots:
+                    response = self._client.chat.completions.create(
+                        model=self._deployment,
+                        messages=messages,
+                        temperature=temperature,
+                        response_format={"type": "json_object"}
+                    )
                 return response.choices[0].message.content
             except APIConnectionError:
                 if attempt == max_retries - 1:
@@ -216,7 +225,8 @@ Rules:
 - Keep the tone professional throughout."""
 
         try:
-            content = self._call_with_retry(
+            content = await asyncio.to_thread(
+                self._call_with_retry,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": f"<user_input>\n{sanitized_prompt}\n</user_input>"}
@@ -300,7 +310,8 @@ Please analyze this CV against the job description and provide detailed suggesti
 """
 
         try:
-            content = self._call_with_retry(
+            content = await asyncio.to_thread(
+                self._call_with_retry,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
@@ -342,6 +353,7 @@ Please analyze this CV against the job description and provide detailed suggesti
         """
         Extract structured CV data from raw document text using GPT.
         Used as a fallback when regex parsing can't extract experience/education.
+        Long documents are split on section boundaries and extracted in parallel.
         """
         system_prompt = """You are an expert CV/Resume parser. Extract structured information from the raw text of a resume/CV document.
 
@@ -398,20 +410,42 @@ Rules:
 - Preserve original dates, titles, and names exactly as written.
 - For experience descriptions, use concise bullet points starting with action verbs."""
 
+        chunks = split_into_chunks(text, settings.AI_CHUNK_TOKEN_BUDGET, settings.AI_MAX_CHUNKS)
+        if not chunks:
+            return {}
+        if len(chunks) == 1:
+            return await asyncio.to_thread(self._extract_chunk, system_prompt, chunks[0]) or {}
+
+        # Map: chunks run concurrently (bounded by _call_slots), so latency tracks the largest chunk
+        partials = await asyncio.gather(*(
+            asyncio.to_thread(self._extract_chunk, system_prompt, chunk, index + 1, len(chunks))
+            for index, chunk in enumerate(chunks)
+        ))
+        succeeded = [partial for partial in partials if partial is not None]
+        if not succeeded:
+            return {}
+        if len(succeeded) < len(chunks):
+            logger.warning("AI document parsing: %d of %d chunks failed", len(chunks) - len(succeeded), len(chunks))
+        # Reduce in document order so the result doesn't depend on completion order
+        return merge_chunk_results(succeeded)
+
+    def _extract_chunk(self, system_prompt: str, chunk: str, part: int = 1, total: int = 1) -> Optional[Dict[str, Any]]:
+        """Run the extraction prompt on one chunk. Returns None on failure."""
+        scope = f" (part {part} of {total}; other parts are extracted separately)" if total > 1 else ""
         try:
-            truncated = text[:8000]
-            sanitized = sanitize_user_input(truncated, max_length=8000)
+            sanitized = sanitize_user_input(chunk, max_length=len(chunk))
             content = self._call_with_retry(
                 messages=[
                     {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Extract CV information from this document text:\n\n<user_input>\n{sanitized}\n</user_input>"}
+                    {"role": "user", "content": f"Extract CV information from this document text{scope}:\n\n<user_input>\n{sanitized}\n</user_input>"}
                 ],
                 temperature=0.3
             )
-            return json.loads(content)
+            result = json.loads(content)
+            return result if isinstance(result, dict) else None
         except Exception as e:
             logger.error("Error in AI document parsing: %s", type(e).__name__)
-            return {}
+            return None
 
     async def review_cv(self, cv_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -471,7 +505,8 @@ Rules:
 - If a section is empty or missing, score it low and note it as a gap."""
 
         try:
-            content = self._call_with_retry(
+            content = await asyncio.to_thread(
+                self._call_with_retry,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": f"Review this CV:\n<user_input>\n{cv_text}\n</user_input>"}
@@ -1,7 +1,11 @@
+import asyncio
 from typing import Optional
 from datetime import datetime, timedelta, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.user import User
+from ..models.cv import CV
+from ..models.cv_version import CVVersion
 from ..utils.auth import get_password_hash, verify_password
 
 MAX_FAILED_ATTEMPTS = 5
@@ -11,25 +15,26 @@ LOCKOUT_DURATION_MINUTES = 15
 class AuthService:
     """Service for authentication operations"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_user_by_email(self, email: str) -> Optional[User]:
-        return self.db.query(User).filter(User.email == email).first()
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        return await self.db.scalar(select(User).where(User.email == email))
 
-    def get_user_by_username(self, username: str) -> Optional[User]:
-        return self.db.query(User).filter(User.username == username).first()
+    async def get_user_by_username(self, username: str) -> Optional[User]:
+        return await self.db.scalar(select(User).where(User.username == username))
 
-    def get_user_by_id(self, user_id: int) -> Optional[User]:
-        return self.db.query(User).filter(User.id == user_id).first()
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        return await self.db.scalar(select(User).where(User.id == user_id))
 
-    def create_user(
+    async def create_user(
         self,
         email: str,
         username: str,
         password: str
     ) -> User:
-        hashed_password = get_password_hash(password)
+        # bcrypt is deliberately slow; keep it off the event loop
+        hashed_password = await asyncio.to_thread(get_password_hash, password)
 
         user = User(
             email=email,
@@ -40,55 +45,55 @@ class AuthService:
         )
 
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
 
         return user
 
-    def _is_account_locked(self, user: User) -> bool:
+    async def _is_account_locked(self, user: User) -> bool:
         if user.locked_until and user.locked_until > datetime.now(timezone.utc):
             return True
         if user.locked_until and user.locked_until <= datetime.now(timezone.utc):
             user.failed_login_attempts = 0
             user.locked_until = None
-            self.db.commit()
+            await self.db.commit()
         return False
 
-    def _record_failed_login(self, user: User) -> None:
+    async def _record_failed_login(self, user: User) -> None:
         user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
         if user.failed_login_attempts >= MAX_FAILED_ATTEMPTS:
             user.locked_until = datetime.now(timezone.utc) + timedelta(minutes=LOCKOUT_DURATION_MINUTES)
-        self.db.commit()
+        await self.db.commit()
 
-    def _reset_failed_login(self, user: User) -> None:
+    async def _reset_failed_login(self, user: User) -> None:
         if user.failed_login_attempts:
             user.failed_login_attempts = 0
             user.locked_until = None
-            self.db.commit()
+            await self.db.commit()
 
-    def authenticate_user(self, username_or_email: str, password: str) -> Optional[User]:
-        user = self.get_user_by_email(username_or_email)
+    async def authenticate_user(self, username_or_email: str, password: str) -> Optional[User]:
+        user = await self.get_user_by_email(username_or_email)
         if not user:
-            user = self.get_user_by_username(username_or_email)
+            user = await self.get_user_by_username(username_or_email)
 
         if not user:
             return None
 
-        if self._is_account_locked(user):
+        if await self._is_account_locked(user):
             return None
 
-        if not verify_password(password, user.hashed_password):
-            self._record_failed_login(user)
+        if not await asyncio.to_thread(verify_password, password, user.hashed_password):
+            await self._record_failed_login(user)
             return None
 
         if not user.is_active:
             return None
 
-        self._reset_failed_login(user)
+        await self._reset_failed_login(user)
         return user
 
-    def update_user(self, user_id: int, **kwargs) -> Optional[User]:
-        user = self.get_user_by_id(user_id)
+    async def update_user(self, user_id: int, **kwargs) -> Optional[User]:
+        user = await self.get_user_by_id(user_id)
         if not user:
             return None
 
@@ -96,17 +101,25 @@ class AuthService:
             if hasattr(user, key) and key != "id":
                 setattr(user, key, value)
 
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
 
         return user
 
-    def delete_user(self, user_id: int) -> bool:
-        user = self.get_user_by_id(user_id)
+    async def delete_user(self, user_id: int) -> bool:
+        user = await self.get_user_by_id(user_id)
         if not user:
             return False
 
-        self.db.delete(user)
-        self.db.commit()
+        # Bulk statements instead of loading every CV and version: versions
+        # of the user's CVs go with them through ON DELETE CASCADE. Explicit
+        # statements keep databases created before the CASCADE/SET NULL
+        # foreign keys were declared consistent too.
+        await self.db.execute(delete(CV).where(CV.user_id == user_id))
+        await self.db.execute(
+            update(CVVersion).where(CVVersion.created_by_id == user_id).values(created_by_id=None)
+        )
+        await self.db.execute(delete(User).where(User.id == user_id))
+        await self.db.commit()
 
         return True
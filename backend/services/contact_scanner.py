@@ -0,0 +1,136 @@
+"""
+Contact Line Scanner
+Single pass over the head of a resume that classifies each line's contact
+features (email, phone, URLs, location shape, name candidate) into a feature
+table shared by the DocumentParser contact-field extractors.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .section_segmenter import heading_section
+
+# Contact details are expected before this many non-empty lines
+HEAD_LINES = 15
+
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+# Tried in priority order
+PHONE_RES = [
+    re.compile(r'\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),  # US format
+    re.compile(r'\+?\d{1,3}[-.\s]?\d{4,5}[-.\s]?\d{4,6}'),  # International
+    re.compile(r'\(\d{3}\)\s*\d{3}[-.\s]?\d{4}'),  # (123) 456-7890
+]
+
+LINKEDIN_RE = re.compile(r'linkedin\.com/in/([A-Za-z0-9_-]+)', re.IGNORECASE)
+URL_RE = re.compile(r'\b(?:https?://|www\.)?[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.(?:com|io|dev|org|net|me|app|ai|co)(?:/\S*)?',
+                    re.IGNORECASE)
+ZIP_RE = re.compile(r'\d{5}')
+
+_US_STATES = (r'AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM'
+              r'|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY|DC')
+_PLACE = r"[A-Z][a-z]+(?:[ \t]+[A-Z][a-z]+){0,3}"
+# City, ST or City, ST 12345 - line-bounded so it never joins a name line to the next
+US_LOCATION_RE = re.compile(rf'({_PLACE}),[ \t]*({_US_STATES})\b(?:[ \t]+\d{{5}})?')
+INTL_LOCATION_RE = re.compile(rf'{_PLACE},[ \t]*{_PLACE}')
+LOCATION_LABEL_RE = re.compile(r'^(?:location|address|based in)\s*:\s*', re.IGNORECASE)
+_SEGMENT_SEPARATORS = re.compile(r'\s+[|•·]\s+|\s+[-–—]\s+|\t+|\s{3,}')
+
+
+@dataclass
+class LineFeatures:
+    index: int
+    text: str
+    emails: List[str] = field(default_factory=list)
+    phones: List[str] = field(default_factory=list)  # valid-length matches, by pattern priority
+    urls: List[str] = field(default_factory=list)
+    linkedin: str = ""
+    has_zip: bool = False
+    location: str = ""
+    is_heading: bool = False
+    is_name_candidate: bool = False
+
+    @property
+    def is_contact(self) -> bool:
+        lower = self.text.lower()
+        return bool(
+            self.emails or self.phones or self.has_zip or '@' in self.text
+            or 'linkedin' in lower or 'github' in lower
+        )
+
+
+def _find_phones(line: str) -> List[str]:
+    phones = []
+    for pattern in PHONE_RES:
+        for match in pattern.findall(line):
+            digits = sum(ch.isdigit() for ch in match)
+            if 10 <= digits <= 15:
+                phones.append(match.strip())
+    return phones
+
+
+def _find_location(line: str) -> str:
+    """A City, ST / City, Country segment of a contact line, if any"""
+    us = US_LOCATION_RE.search(line)
+    if us:
+        return f"{us.group(1)}, {us.group(2)}"
+    for segment in _SEGMENT_SEPARATORS.split(LOCATION_LABEL_RE.sub('', line)):
+        segment = segment.strip()
+        if '@' not in segment and INTL_LOCATION_RE.fullmatch(segment):
+            return segment
+    return ""
+
+
+def _is_name_like(line: str) -> bool:
+    if len(line) < 3 or len(line) > 50:
+        return False
+    words = line.split()
+    return 2 <= len(words) <= 5 and all(
+        word[0].isupper() and word.rstrip('.').replace('-', '').replace("'", '').isalpha()
+        for word in words
+    )
+
+
+def scan_lines(lines: List[str], limit: int = HEAD_LINES) -> List[LineFeatures]:
+    """Classify the first `limit` non-empty lines. Scanning stops at the first section heading after line 0."""
+    table: List[LineFeatures] = []
+    for raw in lines:
+        line = re.sub(r'[ \t]+', ' ', raw).strip()
+        if not line:
+            continue
+        if len(table) >= limit:
+            break
+
+        features = LineFeatures(index=len(table), text=line)
+        features.is_heading = heading_section(line) is not None
+        if features.is_heading:
+            # Contact details live above the first section; past it, only keep
+            # looking if nothing useful has been seen yet (e.g. a leading "Contact" heading)
+            if any(f.emails or f.phones or f.location for f in table):
+                break
+            table.append(features)
+            continue
+
+        if '@' in line:
+            features.emails = EMAIL_RE.findall(line)
+        if any(ch.isdigit() for ch in line):
+            features.phones = _find_phones(line)
+            features.has_zip = bool(ZIP_RE.search(line))
+        if '.' in line:
+            features.urls = URL_RE.findall(line)
+            linkedin = LINKEDIN_RE.search(line)
+            features.linkedin = linkedin.group(1) if linkedin else ""
+        if ',' in line:
+            features.location = _find_location(line)
+        features.is_name_candidate = not features.is_contact and _is_name_like(line)
+        table.append(features)
+    return table
+
+
+def first(table: List[LineFeatures], attribute: str, limit: Optional[int] = None) -> Optional[LineFeatures]:
+    """First row (optionally within the first `limit` rows) with a truthy feature"""
+    for features in table[:limit]:
+        if getattr(features, attribute):
+            return features
+    return None
@@ -0,0 +1,215 @@
+"""
+CV Export & Import
+Streams a user's CVs (and optionally their full version history) as export
+records, and bulk-loads such records back for a user. Export reads through
+server-side cursors a batch at a time and materializes versions one delta at
+a time, so memory stays flat however large the history; import inserts in
+executemany batches and maps exported CV ids onto the new ones.
+
+Record stream (one JSON object per line in the export file):
+
+    {"type": "export", "format_version": 1, "exported_at": ..., "versions": bool}
+    {"type": "cv", "id": ..., "version_counter": ..., "created_at": ..., <CV fields>}
+    {"type": "version", "cv_id": ..., "version_number": ..., <metadata>, <CV fields>}
+    {"type": "end", "cvs": n, "versions": n}
+
+All CVs come first, then versions grouped by CV in version order.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..database import AsyncSessionLocal
+from ..database.config import settings
+from ..models.cv import CV
+from ..models.cv_version import CVVersion
+from ..utils.json_patch import apply_patch
+from .search_index import SearchIndex
+from .section_store import LAYOUT_ITEMS, SectionStore
+from .version_service import VersionService, VERSIONED_FIELDS, content_hash
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMAT_VERSION = 1
+
+# Version metadata carried by export records (content fields are VERSIONED_FIELDS)
+EXPORT_VERSION_FIELDS = ("version_number", "version_name", "change_summary", "kind", "created_at")
+
+_STORAGE_FIELDS = ("is_keyframe", "delta")
+
+
+async def iter_export_records(user_id: int, include_versions: bool = False,
+                              batch_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Export records for all of a user's CVs. Opens its own session, so it can
+    drive a streaming response after the request's session is gone.
+    """
+    batch_size = max(1, batch_size or settings.EXPORT_BATCH_SIZE)
+    yield {
+        "type": "export", "format_version": EXPORT_FORMAT_VERSION,
+        "exported_at": datetime.now(timezone.utc), "versions": include_versions,
+    }
+
+    counts = {"cvs": 0, "versions": 0}
+    async with AsyncSessionLocal() as db:
+        cvs = await db.stream(
+            select(CV.id, CV.version_counter, CV.created_at, CV.updated_at, CV.section_layout,
+                   *(getattr(CV, name) for name in VERSIONED_FIELDS))
+            .where(CV.user_id == user_id)
+            .order_by(CV.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in cvs.partitions():
+            # Sections of CVs in the items layout, a query per batch
+            sections = await db.run_sync(lambda session: SectionStore(session).section_values(
+                [row.id for row in partition if row.section_layout == LAYOUT_ITEMS]
+            ))
+            for row in partition:
+                counts["cvs"] += 1
+                record = row._asdict()
+                record.pop("section_layout")
+                record.update(sections.get(row.id, {}))
+                yield {"type": "cv", **record}
+
+        if include_versions:
+            versions = await db.stream(
+                select(
+                    CVVersion.cv_id, *(getattr(CVVersion, name) for name in EXPORT_VERSION_FIELDS + _STORAGE_FIELDS + VERSIONED_FIELDS)
+                )
+                .join(CV, CV.id == CVVersion.cv_id)
+                .where(CV.user_id == user_id)
+                .order_by(CVVersion.cv_id, CVVersion.version_number)
+                .execution_options(yield_per=batch_size)
+            )
+            cv_id, state = None, None
+            async for row in versions:
+                # Rebuild each delta on the previous version's content, as VersionService.iter_states does
+                if row.is_keyframe or row.cv_id != cv_id or state is None:
+                    state = {name: getattr(row, name) for name in VERSIONED_FIELDS}
+                else:
+                    state = apply_patch(state, row.delta or [])
+                cv_id = row.cv_id
+                counts["versions"] += 1
+                yield {
+                    "type": "version", "cv_id": row.cv_id,
+                    **{name: getattr(row, name) for name in EXPORT_VERSION_FIELDS}, **state,
+                }
+
+    yield {"type": "end", **counts}
+
+
+class CVImporter:
+    """
+    Bulk-loads export records for one user inside the caller's transaction.
+    CVs and versions are buffered and written in executemany batches;
+    versions are re-encoded as keyframes and deltas on the way in. CVs are
+    written in the JSON section layout (see section_store). Raises
+    ValueError for records that don't fit the export's structure.
+    """
+
+    def __init__(self, db: AsyncSession, user_id: int, batch_size: Optional[int] = None):
+        self.db = db
+        self.user_id = user_id
+        self.batch_size = max(1, batch_size or settings.IMPORT_BATCH_SIZE)
+        self.cv_ids: Dict[int, int] = {}  # exported id -> new id
+        self.versions_imported = 0
+        self._counters: Dict[int, int] = {}  # exported id -> version_counter
+        self._pending_cvs: List[Tuple[int, Dict[str, Any]]] = []
+        self._pending_versions: List[Tuple[int, Dict[str, Any], Dict[str, Any]]] = []
+        self._finished_histories = set()
+        self._last_version: Optional[Tuple[int, int]] = None  # (exported CV id, version number) last added
+        # (exported CV id, content of the last version written, versions since its keyframe)
+        self._encoder: Optional[Tuple[int, Dict[str, Any], int]] = None
+
+    async def add_cv(self, exported_id: int, fields: Dict[str, Any], version_counter: int = 0,
+                     created_at: Optional[datetime] = None, updated_at: Optional[datetime] = None) -> None:
+        if exported_id in self._counters:
+            raise ValueError(f"Duplicate CV id {exported_id}")
+        self._counters[exported_id] = version_counter
+        row = {name: fields.get(name) for name in VERSIONED_FIELDS}
+        # Every row in a batch needs the same keys, so missing dates default here
+        now = datetime.utcnow()
+        row.update(user_id=self.user_id, version_counter=version_counter,
+                   created_at=created_at or now, updated_at=updated_at or now)
+        self._pending_cvs.append((exported_id, row))
+        if len(self._pending_cvs) >= self.batch_size:
+            await self._flush_cvs()
+
+    async def add_version(self, exported_cv_id: int, metadata: Dict[str, Any], fields: Dict[str, Any]) -> None:
+        if exported_cv_id not in self._counters:
+            raise ValueError(f"Version of unknown CV {exported_cv_id}")
+        number = metadata["version_number"]
+        if number > self._counters[exported_cv_id]:
+            raise ValueError(f"Version {number} is past CV {exported_cv_id}'s version_counter")
+
+        # Deltas are encoded against the previous version, so each history must arrive in order
+        last_cv_id, last_number = self._last_version or (None, 0)
+        if last_cv_id != exported_cv_id:
+            if exported_cv_id in self._finished_histories:
+                raise ValueError(f"Versions of CV {exported_cv_id} must be contiguous")
+            self._finished_histories.add(last_cv_id)
+            last_number = 0
+        if number <= last_number:
+            raise ValueError(f"Versions of CV {exported_cv_id} must be in increasing version order")
+        self._last_version = (exported_cv_id, number)
+
+        metadata = dict(metadata, created_at=metadata.get("created_at") or datetime.now(timezone.utc))
+        self._pending_versions.append((exported_cv_id, metadata, {name: fields.get(name) for name in VERSIONED_FIELDS}))
+        if len(self._pending_versions) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        await self._flush_cvs()
+        if self._pending_versions:
+            batch, self._pending_versions = self._pending_versions, []
+            await self.db.run_sync(self._insert_versions, batch)
+
+    async def _flush_cvs(self) -> None:
+        if not self._pending_cvs:
+            return
+        batch, self._pending_cvs = self._pending_cvs, []
+        # insertmanyvalues: batched INSERT ... RETURNING with ids in parameter order
+        result = await self.db.execute(
+            insert(CV).returning(CV.id, sort_by_parameter_order=True), [row for _, row in batch]
+        )
+        for (exported_id, _), new_id in zip(batch, result.scalars()):
+            self.cv_ids[exported_id] = new_id
+        await self.db.run_sync(lambda session: SearchIndex(session).add_cvs(
+            self.user_id, [(self.cv_ids[exported_id], row) for exported_id, row in batch]
+        ))
+
+    def _insert_versions(self, session: Session, batch: List[Tuple[int, Dict[str, Any], Dict[str, Any]]]) -> None:
+        service = VersionService(session)
+        rows, history = [], []
+        for exported_cv_id, metadata, state in batch:
+            previous, since_keyframe = None, 0
+            if self._encoder is not None and self._encoder[0] == exported_cv_id:
+                _, previous, since_keyframe = self._encoder
+            stored = service.encode_state(state, previous, since_keyframe)
+            since_keyframe = 1 if stored["is_keyframe"] else since_keyframe + 1
+            self._encoder = (exported_cv_id, state, since_keyframe)
+            rows.append({
+                **metadata, **stored,
+                "cv_id": self.cv_ids[exported_cv_id],
+                "content_hash": content_hash(state),
+                "created_by_id": self.user_id,
+            })
+            history.append((self.cv_ids[exported_cv_id], state, previous))
+        version_ids = session.execute(
+            insert(CVVersion).returning(CVVersion.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+        SearchIndex(session).index_versions(
+            self.user_id, [(cv_id, version_id, state, previous) for (cv_id, state, previous), version_id in zip(history, version_ids)]
+        )
+        self.versions_imported += len(rows)
+
+    async def finish(self) -> Dict[int, int]:
+        """Write what's still buffered; returns the exported -> new CV id map"""
+        await self.flush()
+        logger.info("Imported %d CVs and %d versions for user %d", len(self.cv_ids), self.versions_imported, self.user_id)
+        return self.cv_ids
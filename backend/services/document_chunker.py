@@ -0,0 +1,168 @@
+"""
+Document Chunker
+Splits long resume text into section-aligned chunks within a token budget for
+parallel AI extraction, and merges the per-chunk results back into a single
+CV structure deterministically.
+"""
+
+import math
+import logging
+from typing import Any, Dict, List, Tuple
+
+from .section_segmenter import heading_section
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio for English prose; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+SCALAR_FIELDS = ("full_name", "email", "phone", "location", "summary")
+
+# Fields identifying the same entry when it appears in more than one chunk
+LIST_KEYS = {
+    "experience": ("employer", "job_title", "start_date"),
+    "education": ("school", "degree"),
+    "skills": ("name",),
+    "projects": ("name",),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _section_blocks(text: str) -> List[Tuple[str, List[str]]]:
+    """(heading line, body lines) blocks; the first block's heading is "" (contact preamble)"""
+    blocks: List[Tuple[str, List[str]]] = [("", [])]
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if heading_section(stripped):
+            blocks.append((stripped, []))
+        else:
+            blocks[-1][1].append(stripped)
+    return [block for block in blocks if block[0] or block[1]]
+
+
+def _split_block(heading: str, lines: List[str], budget_chars: int) -> List[str]:
+    """Split an oversized section on line boundaries, repeating its heading on every piece"""
+    pieces, current, size = [], [], 0
+    for line in lines:
+        # A single line longer than the budget is hard-wrapped
+        while len(line) > budget_chars:
+            if current:
+                pieces.append(current)
+                current, size = [], 0
+            pieces.append([line[:budget_chars]])
+            line = line[budget_chars:]
+        if current and size + len(line) + 1 > budget_chars:
+            pieces.append(current)
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        pieces.append(current)
+
+    prefix = f"{heading}\n" if heading else ""
+    return [prefix + '\n'.join(piece) for piece in pieces]
+
+
+def split_into_chunks(text: str, token_budget: int, max_chunks: int = 0) -> List[str]:
+    """
+    Pack whole sections into chunks of at most `token_budget` tokens, splitting
+    only sections that don't fit on their own. With `max_chunks`, at most that
+    many chunks are returned; text beyond them is dropped (and logged) so the
+    AI input stays bounded.
+    """
+    text = text.strip()
+    if not text:
+        return []
+    budget_chars = max(token_budget * CHARS_PER_TOKEN, 1)
+    if max_chunks and len(text) > budget_chars * max_chunks:
+        logger.warning(
+            "Document text truncated for AI parsing: %d of %d characters over the %d-chunk limit dropped",
+            len(text) - budget_chars * max_chunks, len(text), max_chunks
+        )
+        text = text[:budget_chars * max_chunks]
+    if len(text) <= budget_chars:
+        return [text]
+
+    chunks: List[str] = []
+    current = ""
+    for heading, lines in _section_blocks(text):
+        block = '\n'.join(([heading] if heading else []) + lines)
+        if len(block) > budget_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_split_block(heading, lines, budget_chars))
+        elif current and len(current) + len(block) + 1 > budget_chars:
+            chunks.append(current)
+            current = block
+        else:
+            current = f"{current}\n{block}" if current else block
+    if current:
+        chunks.append(current)
+    if max_chunks and len(chunks) > max_chunks:
+        # Packing on section boundaries can leave chunks short of the budget
+        logger.warning(
+            "Document text truncated for AI parsing: %d characters after chunk %d dropped",
+            sum(len(chunk) for chunk in chunks[max_chunks:]), max_chunks
+        )
+        chunks = chunks[:max_chunks]
+    return chunks
+
+
+def _norm(value: Any) -> str:
+    return ' '.join(str(value or "").lower().split())
+
+
+def _merge_entry(target: Dict[str, Any], other: Dict[str, Any]) -> None:
+    """Fill gaps in `target` from a duplicate entry; distinct descriptions are combined"""
+    for key, value in other.items():
+        if not value:
+            continue
+        existing = target.get(key)
+        if not existing:
+            target[key] = value
+        elif key == "description" and isinstance(existing, str) and isinstance(value, str):
+            lines = existing.split('\n')
+            seen = {_norm(line) for line in lines}
+            lines.extend(line for line in value.split('\n') if line.strip() and _norm(line) not in seen)
+            target[key] = '\n'.join(lines)
+
+
+def merge_chunk_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reduce per-chunk extraction results (in document order) into one result.
+    Scalars take the first non-empty value; list entries are concatenated in
+    order and de-duplicated on their identifying fields.
+    """
+    merged: Dict[str, Any] = {name: "" for name in SCALAR_FIELDS}
+    for result in results:
+        for name in SCALAR_FIELDS:
+            value = result.get(name)
+            if not merged[name] and isinstance(value, str) and value.strip():
+                merged[name] = value.strip()
+
+    for name, key_fields in LIST_KEYS.items():
+        entries: List[Dict[str, Any]] = []
+        index: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        for result in results:
+            for entry in result.get(name) or []:
+                if not isinstance(entry, dict):
+                    continue
+                key = tuple(_norm(entry.get(f)) for f in key_fields)
+                if not any(key):
+                    continue
+                # A continuation chunk may repeat a job without its start date
+                if name == "experience" and not key[2]:
+                    key = next((k for k in index if k[:2] == key[:2]), key)
+                if key in index:
+                    _merge_entry(index[key], entry)
+                else:
+                    index[key] = dict(entry)
+                    entries.append(index[key])
+        merged[name] = entries
+    return merged
@@ -1,15 +1,32 @@
 """
 Document Parser Service
 Extracts CV information from uploaded documents (PDF, DOCX, TXT)
-Focused on reliable extraction: name, email, phone, location, skills
+Focused on reliable extraction: name, email, phone, location, skills,
+plus rule-based experience/education/project sections with an AI fallback
 """
 
 import re
 import io
+import time
+import asyncio
 import logging
-from typing import Dict, List, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Tuple, Union, BinaryIO
 from dataclasses import dataclass, field
 
+from ..database.config import settings
+from .text_extractors import extractor_registry
+from .section_segmenter import segment_resume
+from .contact_scanner import (
+    EMAIL_RE, PHONE_RES, LINKEDIN_RE, US_LOCATION_RE, LineFeatures, scan_lines, first,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction logic changes so cached parse results are invalidated
+PARSER_VERSION = "5"
+
 
 @dataclass
 class ParsedCVData:
@@ -46,19 +63,6 @@ class ParsedCVData:
 class DocumentParser:
     """Parser for extracting CV information from documents - focused on reliable fields"""
 
-    # Email pattern - very reliable
-    EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    
-    # Phone patterns - multiple formats
-    PHONE_PATTERNS = [
-        r'\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US format
-        r'\+?\d{1,3}[-.\s]?\d{4,5}[-.\s]?\d{4,6}',  # International
-        r'\(\d{3}\)\s*\d{3}[-.\s]?\d{4}',  # (123) 456-7890
-    ]
-    
-    # LinkedIn pattern
-    LINKEDIN_PATTERN = r'(?:linkedin\.com/in/|linkedin:\s*)([A-Za-z0-9_-]+)'
-    
     # Common skills - comprehensive list
     KNOWN_SKILLS = [
         # Programming Languages
@@ -117,40 +121,66 @@ class DocumentParser:
 
     def __init__(self):
         self.text = ""
+        self.raw_text = ""
         self.lines = []
-
-    def parse_document(self, file_content: bytes, filename: str) -> ParsedCVData:
-        """Main entry point for parsing a document"""
+        # Per-line contact features of the document head, shared by the contact extractors
+        self.contact_lines: List[LineFeatures] = []
+        # Seconds spent in each stage of the last parse_document call
+        self.stage_timings: Dict[str, float] = {}
+        self.extraction_backend = ""
+
+    def parse_document(self, file_content: Union[bytes, BinaryIO], filename: str) -> ParsedCVData:
+        """Main entry point for parsing a document (raw bytes or a seekable binary stream)"""
         file_ext = filename.lower().split('.')[-1]
-
-        if file_ext == 'pdf':
-            self.text = self._extract_from_pdf(file_content)
-        elif file_ext in ['docx', 'doc']:
-            self.text = self._extract_from_docx(file_content)
-        elif file_ext == 'txt':
-            self.text = file_content.decode('utf-8', errors='ignore')
+        if isinstance(file_content, (bytes, bytearray)):
+            stream = io.BytesIO(file_content)
         else:
+            stream = file_content
+            stream.seek(0)
+
+        if file_ext not in ('pdf', 'docx', 'doc', 'txt'):
             raise ValueError(f"Unsupported file type: {file_ext}")
 
+        self.stage_timings = {}
+        self.text = self._timed('extract', self._extract_text, stream, file_ext)
+        # Section segmentation needs separators (|, dashes, bullets) that cleaning strips
+        self.raw_text = self.text
+
         # Clean up text
-        self.text = self._clean_text(self.text)
+        self.text = self._timed('clean', self._clean_text, self.text)
         self.lines = [line.strip() for line in self.text.split('\n') if line.strip()]
 
         # Parse only reliable fields
         parsed_data = ParsedCVData()
         
-        parsed_data.email = self._extract_email()
-        parsed_data.phone = self._extract_phone()
-        parsed_data.full_name = self._extract_name()
-        parsed_data.location = self._extract_location()
-        parsed_data.linkedin = self._extract_linkedin()
-        parsed_data.skills = self._extract_skills()
+        self.contact_lines = self._timed('scan', scan_lines, self.raw_text.split('\n'))
+        parsed_data.email = self._timed('email', self._extract_email)
+        parsed_data.phone = self._timed('phone', self._extract_phone)
+        parsed_data.full_name = self._timed('name', self._extract_name)
+        parsed_data.location = self._timed('location', self._extract_location)
+        parsed_data.linkedin = self._timed('linkedin', self._extract_linkedin)
+        parsed_data.skills = self._timed('skills', self._extract_skills)
+
+        sections = self._timed('sections', segment_resume, self.raw_text)
+        parsed_data.summary = sections.summary
+        parsed_data.experience = sections.experience
+        parsed_data.education = sections.education
+        parsed_data.projects = sections.projects
 
         # Calculate confidence scores
-        parsed_data.confidence_scores = self._calculate_confidence(parsed_data)
+        parsed_data.confidence_scores = self._timed('confidence', self._calculate_confidence, parsed_data)
+        parsed_data.confidence_scores.update(sections.confidence)
+        parsed_data.confidence_scores['overall'] = self._overall_confidence(parsed_data.confidence_scores)
 
         return parsed_data
 
+    def _timed(self, stage: str, fn, *args):
+        """Run one pipeline stage and record its duration in stage_timings"""
+        start = time.perf_counter()
+        result = fn(*args)
+        self.stage_timings[stage] = time.perf_counter() - start
+        return result
+
     def _clean_text(self, text: str) -> str:
         """Clean up extracted text while preserving line structure"""
         lines = text.split('\n')
@@ -162,53 +192,21 @@ class DocumentParser:
                 cleaned_lines.append(line)
         return '\n'.join(cleaned_lines)
 
-    def _extract_from_pdf(self, content: bytes) -> str:
-        """Extract text from PDF"""
-        try:
-            import PyPDF2
-            reader = PyPDF2.PdfReader(io.BytesIO(content))
-            text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            return text
-        except ImportError:
-            try:
-                import pdfplumber
-                with pdfplumber.open(io.BytesIO(content)) as pdf:
-                    text = ""
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                    return text
-            except ImportError:
-                raise ImportError("Please install PyPDF2 or pdfplumber: pip install PyPDF2 pdfplumber")
-
-    def _extract_from_docx(self, content: bytes) -> str:
-        """Extract text from DOCX"""
-        try:
-            from docx import Document
-            doc = Document(io.BytesIO(content))
-            text = ""
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-            return text
-        except ImportError:
-            raise ImportError("Please install python-docx: pip install python-docx")
+    def _extract_text(self, stream: BinaryIO, file_ext: str) -> str:
+        """Extract raw text through the backend registry's fallback chain"""
+        text, self.extraction_backend = extractor_registry.extract(stream, file_ext)
+        return text
 
     def _extract_email(self) -> str:
         """Extract email address - prioritize emails near the top of the document"""
         skip_domains = ['noreply', 'support', 'info@', 'example']
 
-        for line in self.lines[:15]:
-            matches = re.findall(self.EMAIL_PATTERN, line, re.IGNORECASE)
-            for email in matches:
+        for features in self.contact_lines:
+            for email in features.emails:
                 if not any(skip in email.lower() for skip in skip_domains):
                     return email.lower()
 
-        matches = re.findall(self.EMAIL_PATTERN, self.text, re.IGNORECASE)
+        matches = EMAIL_RE.findall(self.text)
         for email in matches:
             if not any(skip in email.lower() for skip in skip_domains):
                 return email.lower()
@@ -218,89 +216,48 @@ class DocumentParser:
 
     def _extract_phone(self) -> str:
         """Extract phone number"""
-        for pattern in self.PHONE_PATTERNS:
-            matches = re.findall(pattern, self.text)
-            for match in matches:
-                # Clean the phone number
-                digits = re.sub(r'\D', '', match)
-                if 10 <= len(digits) <= 15:  # Valid phone length
+        row = first(self.contact_lines, 'phones')
+        if row:
+            return row.phones[0]
+        for pattern in PHONE_RES:
+            for match in pattern.findall(self.text):
+                # Valid phone length
+                if 10 <= len(re.sub(r'\D', '', match)) <= 15:
                     return match.strip()
         return ""
 
     def _extract_name(self) -> str:
         """Extract full name - look at the beginning of document"""
+        row = first(self.contact_lines, 'is_name_candidate', limit=10)
+        if row:
+            return row.text
+
         email = self._extract_email()
-        email_parts = []
         if email:
-            local_part = email.split('@')[0]
-            email_parts = re.split(r'[._\-\d]+', local_part.lower())
-            email_parts = [p for p in email_parts if len(p) > 1]
-
-        section_headers = {
-            'professional experience', 'experience', 'education', 'skills',
-            'projects', 'summary', 'objective', 'references', 'technical skills',
-            'certifications', 'certificates', 'honors', 'awards', 'research',
-            'publications', 'contact', 'about', 'profile',
-        }
-
-        for line in self.lines[:10]:
-            if self._is_contact_info(line):
-                continue
-            if len(line) < 3 or len(line) > 50:
-                continue
-            if line.lower().strip() in section_headers:
-                continue
-
-            words = line.split()
-            if 2 <= len(words) <= 5:
-                is_name_like = all(
-                    word[0].isupper() and
-                    word.rstrip('.').replace('-', '').replace("'", '').isalpha()
-                    for word in words
-                )
-
-                if is_name_like:
-                    if email_parts:
-                        line_lower = line.lower()
-                        if any(part in line_lower for part in email_parts):
-                            return line
-                    return line
-
-        if email_parts and len(email_parts) >= 2:
-            return ' '.join(part.capitalize() for part in email_parts[:2])
-
+            email_parts = [p for p in re.split(r'[._\-\d]+', email.split('@')[0]) if len(p) > 1]
+            if len(email_parts) >= 2:
+                return ' '.join(part.capitalize() for part in email_parts[:2])
         return ""
 
     def _extract_location(self) -> str:
         """Extract location - city, state/country"""
-        # Common US state abbreviations
-        states = r'AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY|DC'
-        
-        # Pattern: City, ST or City, ST 12345
-        pattern1 = rf'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*({states})(?:\s+\d{{5}})?'
-        match = re.search(pattern1, self.text)
-        if match:
-            city = match.group(1)
-            state = match.group(2)
-            return f"{city}, {state}"
-        
-        # Pattern: City, Country (for international)
-        pattern2 = r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-        for line in self.lines[:15]:  # Location usually near top
-            if self._is_contact_info(line) and '@' not in line:
-                match = re.search(pattern2, line)
-                if match:
-                    location = match.group(0)
-                    # Validate it's not part of a longer phrase
-                    if len(location) < 40:
-                        return location
-        
+        row = first(self.contact_lines, 'location')
+        if row:
+            return row.location
+
+        # City, ST further down (e.g. a contact block at the end)
+        for line in self.lines:
+            match = US_LOCATION_RE.search(line)
+            if match:
+                return f"{match.group(1)}, {match.group(2)}"
         return ""
 
     def _extract_linkedin(self) -> str:
         """Extract LinkedIn profile"""
-        # Full URL
-        url_match = re.search(r'linkedin\.com/in/([A-Za-z0-9_-]+)', self.text, re.IGNORECASE)
+        row = first(self.contact_lines, 'linkedin')
+        if row:
+            return f"linkedin.com/in/{row.linkedin}"
+        url_match = LINKEDIN_RE.search(self.text)
         if url_match:
             return f"linkedin.com/in/{url_match.group(1)}"
         return ""
@@ -369,18 +326,6 @@ class DocumentParser:
             return "Data Science"
         return "Other"
 
-    def _is_contact_info(self, line: str) -> bool:
-        """Check if line contains contact info"""
-        line_lower = line.lower()
-        return bool(
-            re.search(self.EMAIL_PATTERN, line) or
-            any(re.search(p, line) for p in self.PHONE_PATTERNS) or
-            'linkedin' in line_lower or
-            'github' in line_lower or
-            re.search(r'\d{5}', line) or  # ZIP code
-            '@' in line
-        )
-
     def _calculate_confidence(self, data: ParsedCVData) -> Dict[str, float]:
         """Calculate confidence scores"""
         scores = {}
@@ -409,16 +354,30 @@ class DocumentParser:
         scores['skills'] = min(0.9, 0.15 * len(data.skills)) if data.skills else 0.0
         
         # Overall
-        scores['overall'] = sum(scores.values()) / len(scores)
+        scores['overall'] = self._overall_confidence(scores)
         
         return scores
 
+    @staticmethod
+    def _overall_confidence(scores: Dict[str, float]) -> float:
+        values = [value for key, value in scores.items() if key not in ('overall', 'ai_enhanced')]
+        return sum(values) / len(values) if values else 0.0
+
+    @staticmethod
+    def needs_ai_fallback(parsed_data: ParsedCVData) -> bool:
+        """True when local experience or education extraction is too weak to trust"""
+        scores = parsed_data.confidence_scores
+        weakest = min(scores.get('experience', 0.0), scores.get('education', 0.0))
+        return weakest < settings.AI_FALLBACK_MIN_CONFIDENCE
+
     async def enhance_with_ai(self, parsed_data: ParsedCVData, raw_text: str) -> ParsedCVData:
         """
         Fallback: use AI to extract fields that regex couldn't get.
-        Only triggers when experience AND education are both empty.
+        Only triggers when local section confidence is low (see needs_ai_fallback).
         """
-        if parsed_data.experience or parsed_data.education:
+        use_ai = self.needs_ai_fallback(parsed_data)
+        ai_fallback_stats.record(use_ai)
+        if not use_ai:
             return parsed_data
 
         from .ai_service import ai_service
@@ -426,7 +385,7 @@ class DocumentParser:
         try:
             ai_result = await ai_service.parse_document_with_ai(raw_text)
         except Exception as e:
-            logging.getLogger(__name__).warning("AI document enhancement failed: %s", type(e).__name__)
+            logger.warning("AI document enhancement failed: %s", type(e).__name__)
             return parsed_data
 
         if not ai_result:
@@ -443,9 +402,10 @@ class DocumentParser:
         if not parsed_data.summary and ai_result.get("summary"):
             parsed_data.summary = ai_result["summary"]
 
-        parsed_data.experience = ai_result.get("experience", [])
-        parsed_data.education = ai_result.get("education", [])
-        parsed_data.projects = ai_result.get("projects", [])
+        # Keep local sections the AI returned nothing for
+        parsed_data.experience = ai_result.get("experience") or parsed_data.experience
+        parsed_data.education = ai_result.get("education") or parsed_data.education
+        parsed_data.projects = ai_result.get("projects") or parsed_data.projects
 
         if ai_result.get("skills") and not parsed_data.skills:
             parsed_data.skills = ai_result["skills"]
@@ -454,11 +414,46 @@ class DocumentParser:
         parsed_data.confidence_scores["experience"] = 0.75 if parsed_data.experience else 0.0
         parsed_data.confidence_scores["education"] = 0.75 if parsed_data.education else 0.0
         parsed_data.confidence_scores["projects"] = 0.7 if parsed_data.projects else 0.0
-        parsed_data.confidence_scores["overall"] = sum(parsed_data.confidence_scores.values()) / len(parsed_data.confidence_scores)
+        parsed_data.confidence_scores["overall"] = self._overall_confidence(parsed_data.confidence_scores)
 
         return parsed_data
 
 
-# Singleton instance
+class AIFallbackStats:
+    """Process-wide count of parses that needed the AI fallback"""
+
+    def __init__(self):
+        self.parsed = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def record(self, used_ai: bool) -> None:
+        with self._lock:
+            self.parsed += 1
+            self.fallbacks += used_ai
+        logger.debug("AI fallback rate: %d/%d (%.0f%%)", self.fallbacks, self.parsed, self.rate() * 100)
+
+    def rate(self) -> float:
+        return self.fallbacks / self.parsed if self.parsed else 0.0
+
+
+# Singleton instances
 document_parser = DocumentParser()
+ai_fallback_stats = AIFallbackStats()
+
+# Bounded pool for CPU-bound extraction so parsing never runs on the event loop
+extraction_pool = ThreadPoolExecutor(max_workers=settings.PARSE_WORKERS, thread_name_prefix="doc-extract")
+
+
+def _parse_with_fresh_parser(source: Union[bytes, BinaryIO], filename: str) -> Tuple[ParsedCVData, str]:
+    # DocumentParser keeps per-document state, so each worker call gets its own instance
+    parser = DocumentParser()
+    parsed_data = parser.parse_document(source, filename)
+    return parsed_data, parser.text
+
+
+async def parse_in_pool(source: Union[bytes, BinaryIO], filename: str) -> Tuple[ParsedCVData, str]:
+    """Parse a document on the extraction pool. Returns the parsed data and the cleaned text."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(extraction_pool, _parse_with_fresh_parser, source, filename)
 
@@ -0,0 +1,194 @@
+"""
+Parse Result Cache
+Two-tier cache for document parse results, keyed by the SHA-256 of the
+uploaded bytes and the parser version. A bounded in-memory LRU sits in
+front of an on-disk store that evicts least-recently-used entries once it
+grows past a byte budget. Entries hold parsed personal data, so both tiers
+expire them a fixed time after they were written.
+
+Lookups and writes touch the disk and take a threading lock; call them off
+the event loop.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from ..database.config import settings
+from .document_parser import PARSER_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+def content_hasher():
+    """Hash object for upload bytes, fed chunk by chunk; its hexdigest() is the cache's content digest"""
+    return hashlib.sha256()
+
+
+class ParseResultCache:
+    """Memory + disk cache for serialized DocumentParseResponse payloads"""
+
+    def __init__(self, cache_dir: str, memory_entries: int = 256, max_disk_bytes: int = 200 * 1024 * 1024,
+                 max_age_seconds: int = 0):
+        self.cache_dir = cache_dir
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.max_age_seconds = max_age_seconds  # 0 keeps entries until evicted
+
+        # key -> (write time, payload)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        # key -> (size in bytes, last access time, write time); built lazily from the cache dir
+        self._disk_index: Optional[Dict[str, tuple]] = None
+        self._disk_bytes = 0
+        self._last_expiry = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(digest: str) -> str:
+        """Cache key for a content digest under the current parser version"""
+        return f"v{PARSER_VERSION}-{digest}"
+
+    def _path_for(self, key: str) -> str:
+        digest = key.rsplit('-', 1)[-1]
+        return os.path.join(self.cache_dir, digest[:2], f"{key}.json")
+
+    def _load_disk_index(self) -> None:
+        """Scan the cache directory once to learn sizes and write times"""
+        if self._disk_index is not None:
+            return
+        self._disk_index = {}
+        self._disk_bytes = 0
+        if not os.path.isdir(self.cache_dir):
+            return
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                # Files keep their write time; access times start over on restart
+                self._disk_index[name[:-5]] = (stat.st_size, stat.st_mtime, stat.st_mtime)
+                self._disk_bytes += stat.st_size
+
+    def _expired(self, written: float, now: float) -> bool:
+        return bool(self.max_age_seconds) and now - written > self.max_age_seconds
+
+    def _remember(self, key: str, value: Dict[str, Any], written: float) -> None:
+        self._memory[key] = (written, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for a content digest, or None"""
+        key = self.make_key(digest)
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and not self._expired(cached[0], now):
+                self._memory.move_to_end(key)
+                return cached[1]
+
+            self._load_disk_index()
+            if key not in self._disk_index:
+                self._memory.pop(key, None)
+                return None
+            size, _, written = self._disk_index[key]
+            if self._expired(written, now):
+                self._drop_disk_entry(key)
+                return None
+
+            path = self._path_for(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    value = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("Dropping unreadable parse cache entry %s: %s", key, type(e).__name__)
+                self._drop_disk_entry(key)
+                return None
+
+            self._disk_index[key] = (size, now, written)
+            self._remember(key, value, written)
+            return value
+
+    def put(self, digest: str, value: Dict[str, Any]) -> None:
+        """Store a payload in both tiers, evicting old disk entries if over budget"""
+        key = self.make_key(digest)
+        data = json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+        with self._lock:
+            now = time.time()
+            self._remember(key, value, now)
+            self._load_disk_index()
+
+            path = self._path_for(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning("Failed to write parse cache entry: %s", type(e).__name__)
+                return
+
+            if key in self._disk_index:
+                self._disk_bytes -= self._disk_index[key][0]
+            self._disk_index[key] = (len(data), now, now)
+            self._disk_bytes += len(data)
+            self._expire(now)
+            self._evict_disk()
+
+    def _drop_disk_entry(self, key: str) -> None:
+        size, _, _ = self._disk_index.pop(key, (0, 0, 0))
+        self._disk_bytes -= size
+        self._memory.pop(key, None)
+        try:
+            os.remove(self._path_for(key))
+        except OSError:
+            pass
+
+    def _expire(self, now: float) -> None:
+        """Remove entries past their maximum age (at most one sweep a minute)"""
+        if not self.max_age_seconds or now - self._last_expiry < 60:
+            return
+        self._last_expiry = now
+        expired = [key for key, (_, _, written) in self._disk_index.items() if self._expired(written, now)]
+        for key in expired:
+            self._drop_disk_entry(key)
+        if expired:
+            logger.info("Expired %d parse cache entries", len(expired))
+
+    def _evict_disk(self) -> None:
+        """Remove least-recently-used disk entries until under the byte budget"""
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+        for key, _ in sorted(self._disk_index.items(), key=lambda item: item[1][1]):
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            self._drop_disk_entry(key)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._load_disk_index()
+            for key in list(self._disk_index):
+                self._drop_disk_entry(key)
+
+
+# Singleton instance
+parse_cache = ParseResultCache(
+    cache_dir=settings.PARSE_CACHE_DIR,
+    memory_entries=settings.PARSE_CACHE_MEMORY_ENTRIES,
+    max_disk_bytes=settings.PARSE_CACHE_MAX_BYTES,
+    max_age_seconds=settings.PARSE_CACHE_MAX_AGE_SECONDS,
+)
@@ -0,0 +1,331 @@
+"""
+CV Full-Text Search
+Keeps cv_search_documents in step with CVs and their history, and answers
+ranked searches over a user's documents. A CV's document holds its title,
+summary and flattened section text. A version's document holds only the
+lines it added over the version before it, so a match points at the version
+that introduced the text and near-identical snapshots don't all match.
+
+On SQLite with FTS5 the cv_search table indexes the documents (triggers keep
+it in sync, see create_fts_index) and results are ranked by bm25. Other
+databases fall back to LIKE matching, current CVs first, newest first.
+"""
+
+import re
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, func, insert, or_, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..database.config import settings
+from ..models.cv import CV
+from ..models.cv_version import CVVersion
+from ..models.cv_search import CVSearchDocument
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "cv_search"
+
+SEARCH_SECTIONS = ("experience", "education", "skills", "projects", "research")
+
+# Section item fields that aren't worth searching
+_SKIPPED_FIELDS = {"link", "start_date", "end_date", "date", "gpa", "level", "is_visible"}
+
+_TERMS = re.compile(r"\w+")
+MAX_QUERY_TERMS = 8
+
+# snippet() match markers (private-use characters, stripped from indexed text)
+_MARK_START, _MARK_END = "\ue000", "\ue001"
+_STRIP_MARKS = {ord(_MARK_START): None, ord(_MARK_END): None}
+
+# cv_search's module arguments. user_id is indexed so the owner filter runs
+# inside MATCH; queries scope the user's words to {title body}.
+FTS_DEFINITION = (
+    "fts5(title, body, user_id, content='cv_search_documents', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2')"
+)
+
+# Cached per database URL: whether its cv_search FTS5 table exists
+_fts_available: Dict[str, bool] = {}
+
+
+def text_lines(state: Dict[str, Any]) -> List[str]:
+    """Searchable lines of a CV state: the summary and section text, a line per bullet"""
+    chunks = [state.get("summary")]
+    for section in SEARCH_SECTIONS:
+        value = state.get(section)
+        if isinstance(value, str):  # legacy text sections
+            chunks.append(value)
+            continue
+        for item in value or []:
+            if isinstance(item, dict):
+                chunks.extend(
+                    field for name, field in item.items()
+                    if name not in _SKIPPED_FIELDS and isinstance(field, str)
+                )
+            elif isinstance(item, str):
+                chunks.append(item)
+
+    lines = []
+    for chunk in chunks:
+        for line in (chunk or "").splitlines():
+            line = line.strip().translate(_STRIP_MARKS)
+            if line:
+                lines.append(line)
+    return lines
+
+
+def cv_document(state: Dict[str, Any]) -> Tuple[str, str]:
+    """(title, body) indexed for a CV's current content"""
+    return (state.get("title") or "")[:255], "\n".join(text_lines(state))
+
+
+def version_document(state: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    """(title, body) indexed for a version: what it added over `previous`"""
+    if previous is None:
+        return cv_document(state)
+    seen = set(text_lines(previous))
+    title = state.get("title") or ""
+    return (
+        title[:255] if title != previous.get("title") else "",
+        "\n".join(line for line in text_lines(state) if line not in seen),
+    )
+
+
+def create_fts_index(conn: Connection) -> bool:
+    """
+    Create the cv_search FTS5 table over cv_search_documents and the
+    triggers that keep it in sync. Returns False when the database isn't
+    SQLite or SQLite was built without FTS5.
+    """
+    if conn.dialect.name != "sqlite":
+        return False
+    try:
+        conn.execute(text(f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING {FTS_DEFINITION}"))
+    except OperationalError:
+        logger.warning("SQLite has no FTS5 support; CV search falls back to LIKE matching")
+        return False
+
+    # The standard external-content triggers (cascaded deletes fire them too)
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON cv_search_documents BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, title, body, user_id) VALUES (new.id, new.title, new.body, new.user_id); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON cv_search_documents BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body, user_id) "
+        f"VALUES ('delete', old.id, old.title, old.body, old.user_id); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON cv_search_documents BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body, user_id) "
+        f"VALUES ('delete', old.id, old.title, old.body, old.user_id); "
+        f"INSERT INTO {FTS_TABLE}(rowid, title, body, user_id) VALUES (new.id, new.title, new.body, new.user_id); END"
+    ))
+    _fts_available.pop(str(conn.engine.url), None)
+    return True
+
+
+def _fts_enabled(conn: Connection) -> bool:
+    key = str(conn.engine.url)
+    if key not in _fts_available:
+        _fts_available[key] = conn.dialect.name == "sqlite" and conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+        ).first() is not None
+    return _fts_available[key]
+
+
+def _unmark(marked: str) -> Tuple[str, List[Tuple[int, int]]]:
+    """Strip snippet() markers, returning the text and the (start, end) offsets they enclosed"""
+    plain, highlights, start = [], [], None
+    length = 0
+    for part in re.split(f"([{_MARK_START}{_MARK_END}])", marked):
+        if part == _MARK_START:
+            start = length
+        elif part == _MARK_END:
+            if start is not None:
+                highlights.append((start, length))
+            start = None
+        else:
+            plain.append(part)
+            length += len(part)
+    return "".join(plain).replace("\n", " "), highlights
+
+
+def _snippet(body: str, terms: Sequence[str], width: int) -> Tuple[str, List[Tuple[int, int]]]:
+    """A window of `body` around the first term match, with every match highlighted"""
+    pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, terms)) + r")\w*", re.IGNORECASE)
+    first = pattern.search(body)
+    start = max(0, (first.start() if first else 0) - width // 3)
+    if start:
+        start = body.find(" ", start) + 1 or start
+    end = min(len(body), start + width)
+    window = body[start:end].replace("\n", " ")
+    prefix = "…" if start else ""
+    suffix = "…" if end < len(body) else ""
+    highlights = [(match.start() + len(prefix), match.end() + len(prefix)) for match in pattern.finditer(window)]
+    return prefix + window + suffix, highlights
+
+
+class SearchIndex:
+    """Maintains and queries a user's CV search documents"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def index_cv(self, cv: CV) -> None:
+        """(Re)index a CV's current content"""
+        title, body = cv_document({name: getattr(cv, name) for name in ("title", "summary") + SEARCH_SECTIONS})
+        updated = self.db.execute(
+            update(CVSearchDocument)
+            .where(CVSearchDocument.cv_id == cv.id, CVSearchDocument.version_id.is_(None))
+            .values(title=title, body=body)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not updated:
+            self.db.execute(insert(CVSearchDocument).values(
+                user_id=cv.user_id, cv_id=cv.id, version_id=None, title=title, body=body
+            ))
+
+    def add_cvs(self, user_id: int, cvs: Sequence[Tuple[int, Dict[str, Any]]]) -> None:
+        """Index newly inserted CVs given as (cv_id, content) pairs"""
+        rows = []
+        for cv_id, state in cvs:
+            title, body = cv_document(state)
+            rows.append({"user_id": user_id, "cv_id": cv_id, "version_id": None, "title": title, "body": body})
+        if rows:
+            self.db.execute(insert(CVSearchDocument), rows)
+
+    def index_versions(self, user_id: int, versions: Sequence[Tuple[int, int, Dict[str, Any], Optional[Dict[str, Any]]]],
+                       replace: bool = False) -> None:
+        """
+        Index versions given as (cv_id, version_id, content, previous version's
+        content) tuples; `replace` drops their existing documents first.
+        """
+        if not settings.SEARCH_INDEX_VERSIONS or not versions:
+            return
+        if replace:
+            self.db.execute(
+                delete(CVSearchDocument)
+                .where(CVSearchDocument.version_id.in_([version_id for _, version_id, _, _ in versions]))
+                .execution_options(synchronize_session=False)
+            )
+        rows = []
+        for cv_id, version_id, state, previous in versions:
+            title, body = version_document(state, previous)
+            # A version that only removed text has nothing to be found by
+            if title or body:
+                rows.append({"user_id": user_id, "cv_id": cv_id, "version_id": version_id, "title": title, "body": body})
+        if rows:
+            self.db.execute(insert(CVSearchDocument), rows)
+
+    def search(self, user_id: int, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        The user's best-matching CVs and versions for a free-text query (all
+        words must match, the last one as a prefix), with highlighted snippets.
+        """
+        terms = [term.lower() for term in _TERMS.findall(query)][:MAX_QUERY_TERMS]
+        if not terms:
+            return []
+        if _fts_enabled(self.db.connection()):
+            return self._search_fts(user_id, terms, limit)
+        return self._search_like(user_id, terms, limit)
+
+    def _search_fts(self, user_id: int, terms: List[str], limit: int) -> List[Dict[str, Any]]:
+        phrase = " ".join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+        # The user's words only match text; user_id scopes the query to the owner
+        match = f'user_id:"{user_id}" AND {{title body}}: ({phrase.strip()})'
+
+        # Rank first, then build snippets for the page only
+        ranked = self.db.execute(
+            text(
+                f"SELECT rowid, bm25({FTS_TABLE}, 4.0, 1.0, 0.0) AS score FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH :match ORDER BY score LIMIT :limit"
+            ),
+            {"match": match, "limit": limit}
+        ).all()
+        if not ranked:
+            return []
+
+        details = {
+            row.id: row for row in self.db.execute(
+                text(
+                    f"SELECT {FTS_TABLE}.rowid AS id, snippet({FTS_TABLE}, 1, :start, :end, '…', :tokens) AS snippet, "
+                    "d.cv_id, d.version_id, d.body, v.version_number, COALESCE(v.title, c.title) AS title "
+                    f"FROM {FTS_TABLE} JOIN cv_search_documents d ON d.id = {FTS_TABLE}.rowid "
+                    "JOIN cvs c ON c.id = d.cv_id LEFT JOIN cv_versions v ON v.id = d.version_id "
+                    f"WHERE {FTS_TABLE} MATCH :match AND {FTS_TABLE}.rowid IN :ids"
+                ).bindparams(bindparam("ids", expanding=True)),
+                {"match": match, "ids": [row.rowid for row in ranked], "start": _MARK_START, "end": _MARK_END,
+                 "tokens": settings.SEARCH_SNIPPET_TOKENS}
+            )
+        }
+        results = []
+        for row in ranked:
+            detail = details.get(row.rowid)
+            if detail is None:
+                continue
+            snippet, highlights = _unmark(detail.snippet or "")
+            if not highlights:  # matched on the title only
+                snippet, highlights = _snippet(detail.title, terms, settings.SEARCH_SNIPPET_TOKENS * 8)
+            results.append(self._result(detail, snippet, highlights, -row.score))
+        return results
+
+    def _search_like(self, user_id: int, terms: List[str], limit: int) -> List[Dict[str, Any]]:
+        document = CVSearchDocument
+        rows = self.db.execute(
+            select(
+                document.cv_id, document.version_id, document.body, CVVersion.version_number,
+                func.coalesce(CVVersion.title, CV.title).label("title"),
+            )
+            .join(CV, CV.id == document.cv_id)
+            .outerjoin(CVVersion, CVVersion.id == document.version_id)
+            .where(
+                document.user_id == user_id,
+                *(
+                    or_(func.lower(document.title).contains(term, autoescape=True),
+                        func.lower(document.body).contains(term, autoescape=True))
+                    for term in terms
+                )
+            )
+            .order_by(document.version_id.is_(None).desc(), document.id.desc())
+            .limit(limit)
+        ).all()
+
+        results = []
+        for row in rows:
+            snippet, highlights = _snippet(row.body or row.title, terms, settings.SEARCH_SNIPPET_TOKENS * 8)
+            results.append(self._result(row, snippet, highlights, float(len(highlights))))
+        return results
+
+    @staticmethod
+    def _result(row: Any, snippet: str, highlights: List[Tuple[int, int]], score: float) -> Dict[str, Any]:
+        return {
+            "cv_id": row.cv_id,
+            "version_id": row.version_id,
+            "version_number": row.version_number,
+            "title": row.title,
+            "snippet": snippet,
+            "highlights": highlights,
+            "score": score,
+        }
+
+
+class AsyncSearchIndex:
+    """SearchIndex for AsyncSession callers, run through AsyncSession.run_sync"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _run(self, method: str, *args, **kwargs):
+        return await self.db.run_sync(lambda session: getattr(SearchIndex(session), method)(*args, **kwargs))
+
+    async def index_cv(self, cv: CV) -> None:
+        await self._run("index_cv", cv)
+
+    async def search(self, user_id: int, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        return await self._run("search", user_id, query, limit)
@@ -0,0 +1,327 @@
+"""
+Section Segmenter
+Rule-based segmentation of resume text into sections, and extraction of
+experience, education and project entries with per-section confidence.
+Lets the parser skip the AI fallback when the local result is good enough.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+SECTION_HEADINGS = {
+    'summary': {
+        'summary', 'professional summary', 'profile', 'professional profile', 'objective',
+        'career objective', 'about', 'about me', 'overview',
+    },
+    'experience': {
+        'experience', 'work experience', 'professional experience', 'employment',
+        'employment history', 'work history', 'career history', 'relevant experience',
+    },
+    'education': {
+        'education', 'academic background', 'education and training', 'academic history',
+        'qualifications', 'academic qualifications',
+    },
+    'projects': {
+        'projects', 'personal projects', 'selected projects', 'key projects', 'side projects',
+        'academic projects',
+    },
+    'skills': {
+        'skills', 'technical skills', 'core competencies', 'technologies', 'tools', 'key skills',
+    },
+    'other': {
+        'certifications', 'certificates', 'awards', 'honors', 'honors and awards', 'publications',
+        'research', 'references', 'languages', 'interests', 'hobbies', 'volunteer',
+        'volunteering', 'volunteer experience', 'leadership', 'activities', 'contact',
+    },
+}
+_HEADING_LOOKUP = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+_MONTH = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+          r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?')
+_YEAR = r'(?:19|20)\d{2}'
+_DATE = rf'(?:{_MONTH}\s+{_YEAR}|\d{{1,2}}/{_YEAR}|{_YEAR})'
+_END_DATE = rf'(?:{_DATE}|present|current|now|today)'
+
+DATE_RANGE = re.compile(rf'\(?\b({_DATE})\s*(?:-|to|until|\s)\s*({_END_DATE})\b\)?', re.IGNORECASE)
+SINGLE_DATE = re.compile(rf'\(?\b({_DATE})\b\)?', re.IGNORECASE)
+BULLET = re.compile(r'^\s*(?:[-*•▪●◦·‣>]|\d{1,2}[.)])\s+')
+GPA = re.compile(r'\bGPA[:\s]*([\d.]+(?:\s*/\s*[\d.]+)?)', re.IGNORECASE)
+
+TITLE_WORDS = re.compile(
+    r'\b(?:engineer|developer|programmer|manager|analyst|designer|scientist|intern|consultant|lead'
+    r'|director|architect|specialist|administrator|officer|coordinator|assistant|associate|head'
+    r'|vp|vice president|president|founder|co-founder|cto|ceo|cfo|researcher|teacher|professor'
+    r'|lecturer|technician|accountant|editor|writer|owner|partner|representative|supervisor'
+    r'|principal|fellow|trainee|apprentice|tester|devops|sre)s?\b',
+    re.IGNORECASE,
+)
+SCHOOL_WORDS = re.compile(
+    r'\b(?:university|college|institute|school|academy|polytechnic|conservatory|universit[äa]t|école)\b',
+    re.IGNORECASE,
+)
+DEGREE_WORDS = re.compile(
+    r'\b(?:bachelor|master|doctor|doctorate|ph\.?\s?d|associate of|diploma|certificate|mba|msc|bsc'
+    r'|b\.?\s?s\.?c?|m\.?\s?s\.?c?|b\.?\s?a\.?|m\.?\s?a\.?|b\.?\s?eng|m\.?\s?eng|b\.?\s?tech|m\.?\s?tech'
+    r'|high school diploma|ged)\b',
+    re.IGNORECASE,
+)
+LOCATION = re.compile(
+    r'^(?:remote|[A-Z][a-zA-Z.\'-]+(?:\s[A-Z][a-zA-Z.\'-]+)*,\s*(?:[A-Z]{2}|[A-Z][a-z]+(?:\s[A-Z][a-z]+)*))$'
+)
+TECHNOLOGIES = re.compile(r'(?:built with|technologies|tech stack|stack|tech|using)\s*[:\-]?\s+(.+)$', re.IGNORECASE)
+_HEADER_SEPARATORS = re.compile(r'\s+\|\s+|\s+@\s+|\s+at\s+|\s+[-–—]\s+|\t+|\s{3,}')
+_UNICODE_DASHES = re.compile(r'[–—‒]')
+
+@dataclass
+class _Block:
+    headers: List[str] = field(default_factory=list)
+    details: List[str] = field(default_factory=list)
+    has_dates: bool = False
+
+
+@dataclass
+class SegmentationResult:
+    summary: str = ""
+    experience: List[Dict] = field(default_factory=list)
+    education: List[Dict] = field(default_factory=list)
+    projects: List[Dict] = field(default_factory=list)
+    sections_found: List[str] = field(default_factory=list)
+    confidence: Dict[str, float] = field(default_factory=dict)
+
+
+def _normalize_line(line: str) -> str:
+    line = _UNICODE_DASHES.sub('-', line)
+    return re.sub(r'[ \t]+', ' ', line).strip()
+
+
+def heading_section(line: str) -> Optional[str]:
+    """Canonical section name if the line is a section heading, else None"""
+    if len(line) > 40:
+        return None
+    key = re.sub(r'[^a-z& ]', '', line.lower().rstrip(':')).replace('&', 'and')
+    return _HEADING_LOOKUP.get(re.sub(r'\s+', ' ', key).strip())
+
+
+def split_sections(text: str) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Split text into (lines before the first heading, {section: lines})"""
+    preamble: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    for raw in text.split('\n'):
+        line = _normalize_line(raw)
+        if not line:
+            continue
+        section = heading_section(line)
+        if section:
+            current = sections.setdefault(section, [])
+            continue
+        (preamble if current is None else current).append(line)
+    return preamble, sections
+
+
+def _take_dates(text: str) -> Tuple[str, str, str]:
+    """Remove the first date range (or single date) from text. Returns (rest, start, end)."""
+    match = DATE_RANGE.search(text)
+    if match:
+        start, end = match.group(1), match.group(2)
+    else:
+        match = SINGLE_DATE.search(text)
+        if not match:
+            return text, "", ""
+        start, end = "", match.group(1)
+    end = end.capitalize() if end.lower() in ('present', 'current', 'now', 'today') else end
+    rest = (text[:match.start()] + ' ' + text[match.end():])
+    rest = re.sub(r'\(\s*\)', ' ', rest)
+    return rest.strip(' ,;|-'), start, end
+
+
+def _split_parts(text: str) -> List[str]:
+    parts = []
+    for part in _HEADER_SEPARATORS.split(text):
+        part = part.strip(' ,;|-()')
+        if not part:
+            continue
+        # "Title, Employer" / "Degree, School"; plain "City, ST" has no keywords and stays whole
+        if ', ' in part:
+            head, tail = part.split(', ', 1)
+            if any(p.search(head) or p.search(tail) for p in (TITLE_WORDS, SCHOOL_WORDS, DEGREE_WORDS)):
+                parts.extend([head, tail])
+                continue
+        parts.append(part)
+    return parts
+
+
+def _group_blocks(lines: List[str], max_headers: int = 3) -> List[_Block]:
+    """Group section lines into entries: header lines followed by bullet/detail lines"""
+    blocks: List[_Block] = []
+    current: Optional[_Block] = None
+    for line in lines:
+        bullet = BULLET.match(line)
+        if bullet:
+            if current is None:
+                current = _Block()
+                blocks.append(current)
+            current.details.append(line[bullet.end():].strip())
+            continue
+
+        has_dates = bool(DATE_RANGE.search(line))
+        # Long prose after a dated header is a description paragraph, not a new entry
+        if current and current.has_dates and not has_dates and (len(line) > 80 or line.endswith('.')):
+            current.details.append(line)
+            continue
+
+        if (current is None or current.details or len(current.headers) >= max_headers
+                or (has_dates and current.has_dates)):
+            current = _Block()
+            blocks.append(current)
+        current.headers.append(line)
+        current.has_dates = current.has_dates or has_dates
+    return blocks
+
+
+def _describe(details: List[str]) -> str:
+    return '\n'.join(f"- {d}" for d in details)
+
+
+def parse_experience(lines: List[str]) -> Tuple[List[Dict], List[float]]:
+    entries, scores = [], []
+    for block in _group_blocks(lines):
+        start = end = ""
+        parts: List[str] = []
+        for header in block.headers:
+            rest, s, e = _take_dates(header) if not end else (header, "", "")
+            if e:
+                start, end = s, e
+            parts.extend(_split_parts(rest))
+
+        location = next((p for p in parts if LOCATION.match(p) and not TITLE_WORDS.search(p)), "")
+        parts = [p for p in parts if p != location]
+        title = next((p for p in parts if TITLE_WORDS.search(p)), "")
+        others = [p for p in parts if p != title]
+        employer = others[0] if others else ""
+        if not title and len(others) >= 2:
+            title, employer = others[0], others[1]
+
+        if not (title or employer):
+            continue
+        score = 0.2 + (0.3 if end else 0.0) + (0.3 if TITLE_WORDS.search(title or "") else 0.1 if title else 0.0)
+        score += 0.2 if employer else 0.0
+        entries.append({
+            "job_title": title,
+            "employer": employer,
+            "location": location,
+            "start_date": start,
+            "end_date": end,
+            "description": _describe(block.details),
+        })
+        scores.append(min(score, 1.0))
+    return entries, scores
+
+
+def _split_degree(degree: str) -> Tuple[str, str]:
+    match = re.match(r'(.+?)\s+in\s+(.+)', degree)
+    if match:
+        return match.group(1).strip(), match.group(2).strip()
+    return degree, ""
+
+
+def parse_education(lines: List[str]) -> Tuple[List[Dict], List[float]]:
+    entries: List[Dict] = []
+    current: Optional[Dict] = None
+
+    for line in lines:
+        bullet = BULLET.match(line)
+        if bullet:
+            if current is not None:
+                current["_details"].append(line[bullet.end():].strip())
+            continue
+
+        gpa = GPA.search(line)
+        rest, start, end = _take_dates(GPA.sub(' ', line) if gpa else line)
+        parts = _split_parts(rest) or ([rest] if rest else [])
+        school = next((p for p in parts if SCHOOL_WORDS.search(p)), "")
+        degree = next((p for p in parts if p != school and DEGREE_WORDS.search(p)), "")
+
+        if current is None or (school and current["school"]) or (degree and current["degree"]):
+            current = {"school": "", "degree": "", "field": "", "start_date": "", "end_date": "",
+                       "gpa": "", "_details": []}
+            entries.append(current)
+
+        if school:
+            current["school"] = school
+        if degree:
+            current["degree"], current["field"] = _split_degree(degree)
+        if end and not current["end_date"]:
+            current["start_date"], current["end_date"] = start, end
+        if gpa:
+            current["gpa"] = gpa.group(1).replace(' ', '')
+        if not (school or degree or end or gpa):
+            current["_details"].append(line)
+
+    results, scores = [], []
+    for entry in entries:
+        if not (entry["school"] or entry["degree"]):
+            continue
+        details = entry.pop("_details")
+        entry["description"] = '\n'.join(details)
+        results.append(entry)
+        scores.append(0.4 * bool(entry["school"]) + 0.3 * bool(entry["degree"]) + 0.3 * bool(entry["end_date"]))
+    return results, scores
+
+
+def parse_projects(lines: List[str]) -> Tuple[List[Dict], List[float]]:
+    projects, scores = [], []
+    for block in _group_blocks(lines, max_headers=1):
+        if not block.headers:
+            continue
+        header = block.headers[0]
+        name, description = header, ""
+        for separator in (' - ', ': ', ' | '):
+            if separator in header:
+                name, description = header.split(separator, 1)
+                break
+        name = name.strip()
+        if len(name) > 80:
+            name, description = ' '.join(name.split()[:5]), header
+
+        technologies = ""
+        for text in [description] + block.details:
+            match = TECHNOLOGIES.search(text)
+            if match:
+                technologies = match.group(1).strip().rstrip('.')
+                break
+
+        detail_text = _describe(block.details)
+        projects.append({
+            "name": name,
+            "description": '\n'.join(t for t in (description.strip(), detail_text) if t),
+            "technologies": technologies,
+            "link": "",
+        })
+        scores.append(0.6 + (0.2 if description or block.details else 0.0) + (0.2 if technologies else 0.0))
+    return projects, scores
+
+
+def _section_confidence(scores: List[float]) -> float:
+    return round(sum(scores) / len(scores), 3) if scores else 0.0
+
+
+def segment_resume(text: str) -> SegmentationResult:
+    """Detect sections and extract structured entries from raw resume text"""
+    _preamble, sections = split_sections(text)
+    result = SegmentationResult(sections_found=sorted(sections))
+
+    if sections.get('summary'):
+        result.summary = ' '.join(sections['summary'])[:5000]
+
+    result.experience, exp_scores = parse_experience(sections.get('experience', []))
+    result.education, edu_scores = parse_education(sections.get('education', []))
+    result.projects, proj_scores = parse_projects(sections.get('projects', []))
+
+    result.confidence = {
+        'experience': _section_confidence(exp_scores),
+        'education': _section_confidence(edu_scores),
+        'projects': _section_confidence(proj_scores),
+    }
+    return result
@@ -0,0 +1,328 @@
+"""
+Normalized CV Section Storage
+CVs in the 'items' layout keep their list sections (experience, education,
+skills, projects, research) as cv_sections/cv_items rows instead of JSON
+columns, so an edit to one item writes that item's row rather than the whole
+section. The CV model and CVResponse don't change: load() fills a CV's
+section attributes from its items, and save() turns attribute changes into
+item-level INSERT/UPDATE/DELETEs.
+
+settings.CV_SECTION_STORAGE picks the layout CVs are saved in; a CV moves
+to it on its next save() and reads work in either layout. CVs with legacy
+text sections, and CVs written in bulk by the importer, stay in the JSON
+layout until then.
+
+Items are ordered by fractional position keys (key_between), so inserting
+or moving an item never renumbers its neighbours.
+"""
+
+import json
+import difflib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..database.config import settings
+from ..models.cv import CV
+from ..models.cv_section import CVSection, CVItem
+
+LAYOUT_JSON = "json"
+LAYOUT_ITEMS = "items"
+
+SECTIONS = ("experience", "education", "skills", "projects", "research")
+
+# Position key digits. Lowercase base 36 sorts the same under any collation.
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# Sections whose keys grow past this (after many inserts at one spot) are re-keyed
+MAX_POSITION_LENGTH = 64
+
+# Where load() leaves a CV's stored item rows, for save() to diff against
+_STORED_ATTR = "_stored_sections"
+
+
+def _midpoint(low: str, high: Optional[str]) -> str:
+    """A key strictly between `low` ("" = start) and `high` (None = end); keys never end in '0'"""
+    if high is not None:
+        common = 0
+        while common < len(high) and (low[common] if common < len(low) else _DIGITS[0]) == high[common]:
+            common += 1
+        if common:
+            return high[:common] + _midpoint(low[common:], high[common:])
+    low_digit = _DIGITS.index(low[0]) if low else 0
+    high_digit = _DIGITS.index(high[0]) if high is not None else len(_DIGITS)
+    if high_digit - low_digit > 1:
+        return _DIGITS[(low_digit + high_digit + 1) // 2]
+    if high is not None and len(high) > 1:
+        return high[0]
+    return _DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def key_between(before: Optional[str], after: Optional[str]) -> str:
+    """Position key for an item placed between two others (None for either end)"""
+    # Appends and prepends step the first digit that can be stepped, so keys
+    # at either end of a section stay short
+    if before and after is None:
+        for index, digit in enumerate(before):
+            if digit != _DIGITS[-1]:
+                return before[:index] + _DIGITS[_DIGITS.index(digit) + 1]
+    if after and before is None:
+        index = len(after) - len(after.lstrip(_DIGITS[0]))
+        if after[index] != _DIGITS[1]:
+            return after[:index] + _DIGITS[_DIGITS.index(after[index]) - 1]
+        if index + 1 < len(after):
+            return after[:index + 1]
+    return _midpoint(before or "", after)
+
+
+def spaced_keys(count: int) -> List[str]:
+    """`count` ascending position keys, evenly spread and as short as possible"""
+    width = 1
+    while len(_DIGITS) ** width <= count:
+        width += 1
+    step = len(_DIGITS) ** width // (count + 1)
+    keys = []
+    for index in range(1, count + 1):
+        value, digits = index * step, []
+        for _ in range(width):
+            value, digit = divmod(value, len(_DIGITS))
+            digits.append(_DIGITS[digit])
+        keys.append("".join(reversed(digits)).rstrip(_DIGITS[0]))
+    return keys
+
+
+@dataclass
+class _StoredSection:
+    section_id: int
+    item_ids: List[int]
+    positions: List[str]
+    items: List[Any]
+
+
+def _item_key(item: Any) -> str:
+    return json.dumps(item, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _align(old: List[Any], new: List[Any]) -> List[Tuple[str, int, int, int, int]]:
+    """
+    difflib opcodes matching old items to new ones by content. Only the span
+    between the common prefix and suffix is diffed, so a one-item edit
+    doesn't serialize the whole section.
+    """
+    old_count, new_count = len(old), len(new)
+    prefix = 0
+    while prefix < old_count and prefix < new_count and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < old_count - prefix and suffix < new_count - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    matcher = difflib.SequenceMatcher(
+        None, [_item_key(item) for item in old[prefix:old_count - suffix]],
+        [_item_key(item) for item in new[prefix:new_count - suffix]], autojunk=False
+    )
+    opcodes = [("equal", 0, prefix, 0, prefix)] if prefix else []
+    opcodes += [
+        (tag, old_start + prefix, old_end + prefix, new_start + prefix, new_end + prefix)
+        for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes()
+    ]
+    if suffix:
+        opcodes.append(("equal", old_count - suffix, old_count, new_count - suffix, new_count))
+    return opcodes
+
+
+class SectionStore:
+    """Reads and writes the list sections of CVs stored in the items layout"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _read(self, cv_ids: Sequence[int]) -> Dict[int, Dict[str, _StoredSection]]:
+        stored: Dict[int, Dict[str, _StoredSection]] = {cv_id: {} for cv_id in cv_ids}
+        if not cv_ids:
+            return stored
+        rows = self.db.execute(
+            select(CVSection.cv_id, CVSection.id, CVSection.name, CVItem.id.label("item_id"), CVItem.position, CVItem.data)
+            .outerjoin(CVItem, CVItem.section_id == CVSection.id)
+            .where(CVSection.cv_id.in_(cv_ids))
+            .order_by(CVSection.id, CVItem.position)
+        )
+        for row in rows:
+            section = stored[row.cv_id].get(row.name)
+            if section is None:
+                section = stored[row.cv_id][row.name] = _StoredSection(row.id, [], [], [])
+            if row.item_id is not None:
+                section.item_ids.append(row.item_id)
+                section.positions.append(row.position)
+                section.items.append(row.data)
+        return stored
+
+    def section_values(self, cv_ids: Sequence[int]) -> Dict[int, Dict[str, Optional[List[Any]]]]:
+        """Section contents of items-layout CVs by id, for readers that don't load CV objects"""
+        return {
+            cv_id: {name: sections[name].items if name in sections else None for name in SECTIONS}
+            for cv_id, sections in self._read(cv_ids).items()
+        }
+
+    def load(self, cvs: Sequence[CV]) -> None:
+        """Fill the section attributes of items-layout CVs (one query; JSON-layout CVs are left alone)"""
+        normalized = {cv.id: cv for cv in cvs if cv.section_layout == LAYOUT_ITEMS}
+        for cv_id, sections in self._read(list(normalized)).items():
+            self._apply(normalized[cv_id], sections)
+
+    @staticmethod
+    def _apply(cv: CV, sections: Dict[str, _StoredSection]) -> None:
+        # Committed values, so the ORM doesn't write them back to the JSON columns
+        for name in SECTIONS:
+            set_committed_value(cv, name, sections[name].items if name in sections else None)
+        setattr(cv, _STORED_ATTR, sections)
+
+    def refresh(self, cv: CV) -> None:
+        """Session.refresh() that keeps the sections save() just wrote"""
+        self.db.refresh(cv)
+        sections = getattr(cv, _STORED_ATTR, None)
+        if cv.section_layout == LAYOUT_ITEMS and sections is not None:
+            self._apply(cv, sections)
+
+    def save(self, cv: CV) -> None:
+        """
+        Write a CV's section changes, moving it to the configured layout
+        first if it's in the other one. Call after setting the attributes
+        and before the commit.
+        """
+        values = {name: getattr(cv, name) for name in SECTIONS}
+        target = settings.CV_SECTION_STORAGE
+        if any(value is not None and not isinstance(value, list) for value in values.values()):
+            target = LAYOUT_JSON
+        layout = cv.section_layout or LAYOUT_JSON
+        if layout == target == LAYOUT_JSON:
+            return
+        # An autoflush would write the changed attributes to the JSON columns
+        with self.db.no_autoflush:
+            if layout == target:
+                self._save_changes(cv)
+            elif target == LAYOUT_ITEMS:
+                self._normalize(cv, values)
+            else:
+                self._denormalize(cv, values)
+
+    def _save_changes(self, cv: CV) -> None:
+        state = inspect(cv)
+        stored = getattr(cv, _STORED_ATTR, None)
+        if stored is None:
+            stored = self._read([cv.id])[cv.id]
+        for name in SECTIONS:
+            if not state.attrs[name].history.has_changes():
+                continue
+            value = getattr(cv, name)
+            section = self._write_section(cv.id, name, stored.get(name), value)
+            if section is None:
+                stored.pop(name, None)
+            else:
+                stored[name] = section
+            set_committed_value(cv, name, value)
+        setattr(cv, _STORED_ATTR, stored)
+
+    def _normalize(self, cv: CV, values: Dict[str, Optional[List[Any]]]) -> None:
+        for name in SECTIONS:
+            setattr(cv, name, None)
+        cv.section_layout = LAYOUT_ITEMS
+        # Clears the JSON columns (and assigns the id of a new CV)
+        self.db.flush()
+        stored = {}
+        for name, value in values.items():
+            section = self._write_section(cv.id, name, None, value)
+            if section is not None:
+                stored[name] = section
+        self._apply(cv, stored)
+
+    def _denormalize(self, cv: CV, values: Dict[str, Optional[List[Any]]]) -> None:
+        self.db.execute(delete(CVSection).where(CVSection.cv_id == cv.id))
+        for name, value in values.items():
+            # The columns hold NULL; make sure the new values are written over it
+            set_committed_value(cv, name, None)
+            setattr(cv, name, value)
+        cv.section_layout = LAYOUT_JSON
+        setattr(cv, _STORED_ATTR, None)
+
+    def _write_section(self, cv_id: int, name: str, stored: Optional[_StoredSection],
+                       items: Optional[List[Any]]) -> Optional[_StoredSection]:
+        """Bring one section's rows from `stored` to `items`; returns what's now stored"""
+        if items is None:
+            if stored is not None:
+                self.db.execute(delete(CVSection).where(CVSection.id == stored.section_id))
+            return None
+        if stored is None:
+            section_id = self.db.execute(
+                insert(CVSection).values(cv_id=cv_id, name=name).returning(CVSection.id)
+            ).scalar_one()
+            stored = _StoredSection(section_id, [], [], [])
+
+        item_ids, positions = [], []
+        deletes, updates, inserts = [], [], []
+        if not stored.items:
+            positions = spaced_keys(len(items))
+            item_ids = [None] * len(items)
+            inserts = [{"section_id": stored.section_id, "position": position, "data": item}
+                       for position, item in zip(positions, items)]
+
+        # Unchanged items keep their rows, edited ones are updated in place,
+        # the rest are deleted or inserted between their neighbours' positions
+        for tag, old_start, old_end, new_start, new_end in (_align(stored.items, items) if stored.items else ()):
+            if tag == "equal":
+                item_ids.extend(stored.item_ids[old_start:old_end])
+                positions.extend(stored.positions[old_start:old_end])
+                continue
+            common = min(old_end - old_start, new_end - new_start)
+            for offset in range(common):
+                item_ids.append(stored.item_ids[old_start + offset])
+                positions.append(stored.positions[old_start + offset])
+                updates.append({"id": item_ids[-1], "data": items[new_start + offset]})
+            deletes.extend(stored.item_ids[old_start + common:old_end])
+            following = stored.positions[old_end] if old_end < len(stored.positions) else None
+            for index in range(new_start + common, new_end):
+                position = key_between(positions[-1] if positions else None, following)
+                item_ids.append(None)
+                positions.append(position)
+                inserts.append({"section_id": stored.section_id, "position": position, "data": items[index]})
+
+        if any(len(position) > MAX_POSITION_LENGTH for position in positions):
+            self.db.execute(delete(CVItem).where(CVItem.section_id == stored.section_id))
+            return self._write_section(cv_id, name, _StoredSection(stored.section_id, [], [], []), items)
+
+        if deletes:
+            self.db.execute(delete(CVItem).where(CVItem.id.in_(deletes)))
+        if updates:
+            self.db.execute(update(CVItem), updates)
+        if inserts:
+            new_ids = iter(self.db.execute(
+                insert(CVItem).returning(CVItem.id, sort_by_parameter_order=True), inserts
+            ).scalars().all())
+            item_ids = [item_id if item_id is not None else next(new_ids) for item_id in item_ids]
+        return _StoredSection(stored.section_id, item_ids, positions, list(items))
+
+
+class AsyncSectionStore:
+    """SectionStore for AsyncSession callers, run through AsyncSession.run_sync"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _run(self, method: str, *args):
+        return await self.db.run_sync(lambda session: getattr(SectionStore(session), method)(*args))
+
+    async def load(self, cvs: Sequence[CV]) -> None:
+        if any(cv.section_layout == LAYOUT_ITEMS for cv in cvs):
+            await self._run("load", cvs)
+
+    async def save(self, cv: CV) -> None:
+        await self._run("save", cv)
+
+    async def refresh(self, cv: CV) -> None:
+        await self._run("refresh", cv)
+
+    async def section_values(self, cv_ids: Sequence[int]) -> Dict[int, Dict[str, Optional[List[Any]]]]:
+        return await self._run("section_values", cv_ids)
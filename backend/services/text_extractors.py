@@ -0,0 +1,272 @@
+"""
+Text Extraction Backends
+Registry of raw-text extractors per document format. Backends are tried in a
+configurable order; output that fails basic quality checks (empty, mostly
+unprintable) falls through to the next backend. Per-backend latency and
+outcomes are recorded so orderings can be tuned from real data.
+"""
+
+import re
+import time
+import logging
+import zipfile
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, BinaryIO
+
+from ..database.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExtractorBackend:
+    name: str
+    formats: Tuple[str, ...]
+    extract: Callable[[BinaryIO], str]
+
+
+@dataclass
+class BackendStats:
+    calls: int = 0
+    accepted: int = 0
+    rejected: int = 0  # ran but failed the quality check
+    failures: int = 0  # raised
+    total_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "failures": self.failures,
+            "mean_ms": round(self.total_seconds / self.calls * 1000, 3) if self.calls else 0.0,
+        }
+
+
+def text_quality(text: str) -> float:
+    """Share of characters that look like real text (0.0 for empty output)"""
+    if not text or not text.strip():
+        return 0.0
+    # pdfminer-based extractors emit "(cid:NN)" for glyphs they couldn't map
+    garbage = text.count("(cid:") * 8
+    printable = sum(1 for ch in text if ch.isprintable() or ch in "\n\t\r")
+    return max(0.0, (printable - garbage) / len(text))
+
+
+def is_acceptable(text: str) -> bool:
+    """Quality gate deciding whether to stop or try the next backend"""
+    return (
+        len(text.strip()) >= settings.EXTRACTION_MIN_CHARS
+        and text_quality(text) >= settings.EXTRACTION_MIN_PRINTABLE_RATIO
+    )
+
+
+class ExtractorRegistry:
+    """Ordered extraction backends per format with fallback and timing"""
+
+    def __init__(self):
+        self._backends: Dict[str, ExtractorBackend] = {}
+        self._order: Dict[str, List[str]] = {}
+        self._stats: Dict[str, BackendStats] = {}
+        self._lock = threading.Lock()
+
+    def register(self, backend: ExtractorBackend) -> None:
+        self._backends[backend.name] = backend
+        self._stats.setdefault(backend.name, BackendStats())
+        for fmt in backend.formats:
+            self._order.setdefault(fmt, []).append(backend.name)
+
+    def set_order(self, fmt: str, names: List[str]) -> None:
+        """Override the backend order for a format; unknown names are ignored"""
+        known = [name for name in names if name in self._backends and fmt in self._backends[name].formats]
+        rest = [name for name in self._order.get(fmt, []) if name not in known]
+        self._order[fmt] = known + rest
+
+    def backends_for(self, fmt: str) -> List[ExtractorBackend]:
+        return [self._backends[name] for name in self._order.get(fmt, [])]
+
+    def _record(self, name: str, seconds: float, outcome: str) -> None:
+        with self._lock:
+            stats = self._stats[name]
+            stats.calls += 1
+            stats.total_seconds += seconds
+            setattr(stats, outcome, getattr(stats, outcome) + 1)
+
+    def run_backend(self, backend: ExtractorBackend, stream: BinaryIO) -> Tuple[str, float]:
+        """Run a single backend from the start of the stream. Returns (text, seconds)."""
+        stream.seek(0)
+        start = time.perf_counter()
+        text = backend.extract(stream) or ""
+        return text, time.perf_counter() - start
+
+    def extract(self, stream: BinaryIO, fmt: str) -> Tuple[str, str]:
+        """
+        Extract text with the first backend whose output passes the quality
+        check. If none passes, the best-scoring output is returned.
+        Returns (text, backend name).
+        """
+        best: Optional[Tuple[float, str, str]] = None
+        last_error: Optional[Exception] = None
+        available = 0
+
+        for backend in self.backends_for(fmt):
+            start = time.perf_counter()
+            try:
+                text, seconds = self.run_backend(backend, stream)
+            except ImportError:
+                continue
+            except Exception as e:
+                available += 1
+                last_error = e
+                self._record(backend.name, time.perf_counter() - start, "failures")
+                logger.warning("Extractor %s failed: %s", backend.name, type(e).__name__)
+                continue
+
+            available += 1
+            if is_acceptable(text):
+                self._record(backend.name, seconds, "accepted")
+                return text, backend.name
+
+            self._record(backend.name, seconds, "rejected")
+            logger.debug("Extractor %s output rejected by quality check", backend.name)
+            quality = text_quality(text)
+            if best is None or quality > best[0]:
+                best = (quality, text, backend.name)
+
+        if best is not None:
+            return best[1], best[2]
+        if last_error is not None:
+            raise last_error
+        if not available:
+            raise ImportError(f"No text extraction backend installed for .{fmt} files")
+        return "", ""
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+
+def _extract_pypdf2(stream: BinaryIO) -> str:
+    import PyPDF2
+    reader = PyPDF2.PdfReader(stream)
+    text = ""
+    for page in reader.pages:
+        page_text = page.extract_text()
+        if page_text:
+            text += page_text + "\n"
+    return text
+
+
+def _extract_pdfplumber(stream: BinaryIO) -> str:
+    import pdfplumber
+    text = ""
+    with pdfplumber.open(stream) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    return text
+
+
+def _extract_python_docx(stream: BinaryIO) -> str:
+    from docx import Document
+    doc = Document(stream)
+    text = ""
+    for para in doc.paragraphs:
+        text += para.text + "\n"
+    return text
+
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_W_P, _W_T, _W_TAB = W_NS + "p", W_NS + "t", W_NS + "tab"
+_W_BREAKS = {W_NS + "br", W_NS + "cr"}
+_W_NO_BREAK_HYPHEN = W_NS + "noBreakHyphen"
+_HEADER_FOOTER_PART = re.compile(r'^word/(header|footer)(\d*)\.xml$')
+
+
+def _iter_docx_paragraphs(xml_stream) -> Iterator[str]:
+    """
+    Yield paragraph texts from a WordprocessingML part with an incremental
+    parser. Covers body text, table cells and text boxes (nested w:p), and
+    skips mc:Fallback copies so text boxes aren't emitted twice.
+    """
+    buffers: List[List[str]] = []  # one per open (possibly nested) paragraph
+    fallback_depth = 0
+    for event, elem in ET.iterparse(xml_stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == MC_FALLBACK:
+                fallback_depth += 1
+            elif tag == _W_P and not fallback_depth:
+                buffers.append([])
+            continue
+
+        if tag == MC_FALLBACK:
+            fallback_depth -= 1
+            elem.clear()
+        elif fallback_depth or not buffers:
+            continue
+        elif tag == _W_T:
+            buffers[-1].append(elem.text or "")
+        elif tag == _W_TAB:
+            buffers[-1].append("\t")
+        elif tag in _W_BREAKS:
+            buffers[-1].append("\n")
+        elif tag == _W_NO_BREAK_HYPHEN:
+            buffers[-1].append("-")
+        elif tag == _W_P:
+            yield "".join(buffers.pop())
+            # Drop the finished subtree so memory stays flat on large documents
+            elem.clear()
+
+
+def _extract_docx_stream(stream: BinaryIO) -> str:
+    """Stream text out of the DOCX zip: headers, then the body, then footers"""
+    with zipfile.ZipFile(stream) as archive:
+        names = archive.namelist()
+        if "word/document.xml" not in names:
+            raise ValueError("Not a WordprocessingML document")
+
+        def _part_key(name: str):
+            match = _HEADER_FOOTER_PART.match(name)
+            return int(match.group(2) or 0)
+
+        headers = sorted((n for n in names if _HEADER_FOOTER_PART.match(n) and "header" in n), key=_part_key)
+        footers = sorted((n for n in names if _HEADER_FOOTER_PART.match(n) and "footer" in n), key=_part_key)
+
+        lines: List[str] = []
+        seen_header_lines = set()
+        for part in headers + ["word/document.xml"] + footers:
+            with archive.open(part) as xml_stream:
+                for paragraph in _iter_docx_paragraphs(xml_stream):
+                    # First-page and default headers usually repeat the same contact block
+                    if part != "word/document.xml":
+                        if paragraph in seen_header_lines:
+                            continue
+                        seen_header_lines.add(paragraph)
+                    lines.append(paragraph)
+    return "\n".join(lines) + "\n"
+
+
+def _extract_utf8(stream: BinaryIO) -> str:
+    return stream.read().decode('utf-8', errors='ignore')
+
+
+def _parse_order(value: str) -> List[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+# Singleton registry with the built-in backends
+extractor_registry = ExtractorRegistry()
+extractor_registry.register(ExtractorBackend("pypdf2", ("pdf",), _extract_pypdf2))
+extractor_registry.register(ExtractorBackend("pdfplumber", ("pdf",), _extract_pdfplumber))
+extractor_registry.register(ExtractorBackend("docx-stream", ("docx", "doc"), _extract_docx_stream))
+extractor_registry.register(ExtractorBackend("python-docx", ("docx", "doc"), _extract_python_docx))
+extractor_registry.register(ExtractorBackend("utf8", ("txt",), _extract_utf8))
+
+extractor_registry.set_order("pdf", _parse_order(settings.PDF_EXTRACTORS))
+extractor_registry.set_order("docx", _parse_order(settings.DOCX_EXTRACTORS))
+extractor_registry.set_order("doc", _parse_order(settings.DOCX_EXTRACTORS))
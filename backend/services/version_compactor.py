@@ -0,0 +1,166 @@
+"""
+Version Retention & Compaction
+Thins out old autosave versions according to the retention policy: every
+version is kept for VERSION_RETENTION_KEEP_ALL_HOURS, then the newest
+autosave per hour until VERSION_RETENTION_KEEP_HOURLY_DAYS, then the newest
+per day. Named and pre-restore versions and each CV's latest version are
+never removed. Work is done one CV and at most one batch per transaction so
+write locks stay short; a background thread repeats it periodically.
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..database.config import settings
+from ..models.cv_version import CVVersion
+from .version_service import VersionService, KIND_AUTO, _as_utc
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompactionReport:
+    """Outcome of one compaction pass"""
+    cvs_compacted: int = 0
+    versions_deleted: int = 0
+    bytes_reclaimed: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+
+def expired_versions(versions: Sequence, now: datetime, keep_all: timedelta, keep_hourly: timedelta) -> List:
+    """
+    Versions (rows with version_number, kind and created_at, any order) that
+    the retention policy no longer needs, oldest first.
+    """
+    expired = []
+    seen_buckets = set()
+    newest_first = sorted(versions, key=lambda v: v.version_number, reverse=True)
+    for position, version in enumerate(newest_first):
+        if position == 0 or version.kind != KIND_AUTO or version.created_at is None:
+            continue
+        created_at = _as_utc(version.created_at)
+        age = now - created_at
+        if age < keep_all:
+            continue
+        if age < keep_hourly:
+            bucket = ("hour", created_at.replace(minute=0, second=0, microsecond=0))
+        else:
+            bucket = ("day", created_at.date())
+        if bucket in seen_buckets:
+            expired.append(version)
+        else:
+            seen_buckets.add(bucket)
+    return expired[::-1]
+
+
+class VersionCompactor:
+    """Applies the retention policy to cv_versions in small batches"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: Optional[int] = None,
+        keep_all_hours: Optional[int] = None,
+        keep_hourly_days: Optional[int] = None
+    ):
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size or settings.VERSION_COMPACTION_BATCH_SIZE)
+        self.keep_all = timedelta(hours=settings.VERSION_RETENTION_KEEP_ALL_HOURS if keep_all_hours is None else keep_all_hours)
+        self.keep_hourly = timedelta(days=settings.VERSION_RETENTION_KEEP_HOURLY_DAYS if keep_hourly_days is None else keep_hourly_days)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _candidate_cv_ids(self, now: datetime) -> List[int]:
+        """CVs that have autosaves old enough to be thinned"""
+        # created_at is stored as naive UTC
+        cutoff = (now - self.keep_all).replace(tzinfo=None)
+        db = self.session_factory()
+        try:
+            rows = db.query(CVVersion.cv_id).filter(
+                CVVersion.kind == KIND_AUTO,
+                CVVersion.created_at < cutoff
+            ).distinct().order_by(CVVersion.cv_id).all()
+            return [row.cv_id for row in rows]
+        finally:
+            db.close()
+
+    def compact_batch(self, cv_id: int, now: datetime) -> tuple:
+        """Delete up to batch_size expired versions of one CV. Returns (deleted, bytes reclaimed)."""
+        db = self.session_factory()
+        try:
+            versions = db.query(
+                CVVersion.id, CVVersion.version_number, CVVersion.kind, CVVersion.created_at
+            ).filter(CVVersion.cv_id == cv_id).all()
+            expired = expired_versions(versions, now, self.keep_all, self.keep_hourly)[:self.batch_size]
+            if not expired:
+                return 0, 0
+            reclaimed = VersionService(db).prune(cv_id, {version.id for version in expired})
+            db.commit()
+            return len(expired), reclaimed
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def run_once(self, now: Optional[datetime] = None) -> CompactionReport:
+        """Compact every CV with expired autosaves"""
+        now = now or datetime.now(timezone.utc)
+        report = CompactionReport()
+        start = time.perf_counter()
+        for cv_id in self._candidate_cv_ids(now):
+            deleted_for_cv = 0
+            while not self._stop.is_set():
+                deleted, reclaimed = self.compact_batch(cv_id, now)
+                if deleted:
+                    report.batches += 1
+                    report.versions_deleted += deleted
+                    report.bytes_reclaimed += reclaimed
+                    deleted_for_cv += deleted
+                if deleted < self.batch_size:
+                    break
+            report.cvs_compacted += bool(deleted_for_cv)
+            if self._stop.is_set():
+                break
+        report.seconds = time.perf_counter() - start
+        if report.versions_deleted:
+            logger.info(
+                "Version compaction removed %d versions from %d CVs in %d batches, reclaiming %.1f KiB (%.2fs)",
+                report.versions_deleted, report.cvs_compacted, report.batches,
+                report.bytes_reclaimed / 1024, report.seconds
+            )
+        return report
+
+    def _loop(self, interval: int) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error("Version compaction failed: %s", e, exc_info=True)
+
+    def start(self, interval: Optional[int] = None) -> None:
+        """Run compaction every `interval` seconds on a daemon thread (0 disables)"""
+        interval = settings.VERSION_COMPACTION_INTERVAL_SECONDS if interval is None else interval
+        if interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval,), name="version-compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+
+# Singleton instance, started/stopped with the app
+version_compactor = VersionCompactor(SessionLocal)
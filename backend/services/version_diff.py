@@ -0,0 +1,55 @@
+"""
+Version Diff Cache
+In-memory LRU of diffs between two CV versions. Versions never change once
+written, so a pair's diff stays valid for as long as both exist; keys
+include the versions' content hashes, so a version id reused after a
+deletion can't return a stale entry.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..database.config import settings
+
+DiffKey = Tuple[int, int, Optional[str], int, Optional[str]]
+
+
+class VersionDiffCache:
+    """Bounded LRU of version-pair diffs"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[DiffKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(cv_id: int, old_number: int, old_hash: Optional[str], new_number: int, new_hash: Optional[str]) -> DiffKey:
+        return (cv_id, old_number, old_hash, new_number, new_hash)
+
+    def get(self, key: DiffKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            diff = self._entries.get(key)
+            if diff is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return diff
+
+    def put(self, key: DiffKey, diff: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = diff
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instance
+version_diff_cache = VersionDiffCache(max_entries=settings.VERSION_DIFF_CACHE_SIZE)
@@ -0,0 +1,427 @@
+import copy
+import json
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..models.cv import CV
+from ..models.cv_version import CVVersion
+from ..database.config import settings
+from ..utils.json_patch import apply_patch, make_patch
+from ..utils.cv_diff import diff_states
+from .search_index import SearchIndex
+
+# CV columns captured by a version
+VERSIONED_FIELDS = (
+    "title", "template", "full_name", "email", "phone", "location", "summary",
+    "experience", "education", "skills", "projects", "research", "ai_prompt",
+)
+
+# NOT NULL snapshot columns that delta rows still populate
+_ALWAYS_STORED = ("title", "template")
+
+VERSION_METADATA = ("id", "cv_id", "version_number", "version_name", "change_summary", "kind", "created_at")
+
+# Version kinds: autosaves may be coalesced (and later compacted); the others are always kept
+KIND_AUTO = "auto"
+KIND_NAMED = "named"
+KIND_RESTORE = "restore"
+
+
+def content_hash(state: Dict[str, Any]) -> str:
+    """Stable digest of a CV state, used to skip snapshots that would change nothing"""
+    encoded = json.dumps(state, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def stored_size(version: CVVersion) -> int:
+    """Approximate bytes a version row holds in its content columns"""
+    return sum(
+        len(json.dumps(value, default=str))
+        for value in (getattr(version, name) for name in VERSIONED_FIELDS + ("delta",))
+        if value is not None
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes for values written as UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class VersionService:
+    """Service for CV version history stored as keyframes plus JSON-patch deltas"""
+
+    def __init__(self, db: Session, keyframe_interval: Optional[int] = None, autosave_window: Optional[int] = None):
+        self.db = db
+        self.keyframe_interval = max(1, keyframe_interval or settings.VERSION_KEYFRAME_INTERVAL)
+        self.autosave_window = settings.VERSION_AUTOSAVE_WINDOW_SECONDS if autosave_window is None else autosave_window
+
+    @staticmethod
+    def cv_state(cv: CV) -> Dict[str, Any]:
+        return {name: copy.deepcopy(getattr(cv, name)) for name in VERSIONED_FIELDS}
+
+    @staticmethod
+    def _stored_state(version: CVVersion) -> Dict[str, Any]:
+        return {name: copy.deepcopy(getattr(version, name)) for name in VERSIONED_FIELDS}
+
+    def _latest(self, cv_id: int) -> Optional[CVVersion]:
+        return self.db.scalars(
+            select(CVVersion).where(CVVersion.cv_id == cv_id)
+            .order_by(CVVersion.version_number.desc()).limit(1)
+        ).first()
+
+    def _next_version_number(self, cv_id: int) -> int:
+        """
+        Reserve the CV's next version number. The counter bump is a single
+        UPDATE ... RETURNING, so concurrent snapshots can't be handed the same
+        number (the row stays locked until the caller's transaction ends).
+        """
+        return self.db.execute(
+            update(CV)
+            .where(CV.id == cv_id)
+            .values(version_counter=CV.version_counter + 1, updated_at=CV.updated_at)
+            .returning(CV.version_counter)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+
+    def list_versions(self, cv_id: int, before_version: Optional[int] = None, limit: int = 50) -> List[Any]:
+        """
+        One page of version metadata, newest first. Selects only the metadata
+        columns and seeks on (cv_id, version_number), so the cost doesn't grow
+        with history length.
+        """
+        query = select(*(getattr(CVVersion, name) for name in VERSION_METADATA)).where(
+            CVVersion.cv_id == cv_id
+        )
+        if before_version is not None:
+            query = query.where(CVVersion.version_number < before_version)
+        return self.db.execute(query.order_by(CVVersion.version_number.desc()).limit(limit)).all()
+
+    def count_versions(self, cv_id: int) -> int:
+        return self.db.scalar(select(func.count(CVVersion.id)).where(CVVersion.cv_id == cv_id))
+
+    def _keyframe_number(self, cv_id: int, at_or_before: Optional[int] = None) -> Optional[int]:
+        query = select(func.max(CVVersion.version_number)).where(
+            CVVersion.cv_id == cv_id,
+            CVVersion.is_keyframe.is_(True)
+        )
+        if at_or_before is not None:
+            query = query.where(CVVersion.version_number <= at_or_before)
+        return self.db.scalar(query)
+
+    @staticmethod
+    def _store_keyframe(version: CVVersion, state: Dict[str, Any]) -> None:
+        version.is_keyframe = True
+        version.delta = None
+        for name, value in state.items():
+            setattr(version, name, value)
+
+    @staticmethod
+    def _store_delta(version: CVVersion, state: Dict[str, Any], delta: List[Dict[str, Any]]) -> None:
+        version.is_keyframe = False
+        version.delta = delta
+        for name in VERSIONED_FIELDS:
+            setattr(version, name, state[name] if name in _ALWAYS_STORED else None)
+
+    def _encode(self, version: CVVersion, state: Dict[str, Any], previous_state: Optional[Dict[str, Any]],
+                since_keyframe: int) -> bool:
+        """Store `state` on the row as a keyframe or a delta. Returns True for a keyframe."""
+        if previous_state is None or since_keyframe >= self.keyframe_interval:
+            self._store_keyframe(version, state)
+            return True
+        delta = make_patch(previous_state, state)
+        # A rewrite-everything edit is cheaper to store (and read) as a keyframe
+        if len(json.dumps(delta, default=str)) >= len(json.dumps(state, default=str)):
+            self._store_keyframe(version, state)
+            return True
+        self._store_delta(version, state, delta)
+        return False
+
+    def encode_state(self, state: Dict[str, Any], previous_state: Optional[Dict[str, Any]],
+                     since_keyframe: int) -> Dict[str, Any]:
+        """Storage column values for `state` (keyframe or delta), for bulk inserts"""
+        version = CVVersion()
+        self._encode(version, state, previous_state, since_keyframe)
+        return {name: getattr(version, name) for name in VERSIONED_FIELDS + ("is_keyframe", "delta")}
+
+    def materialize(self, version: CVVersion) -> Dict[str, Any]:
+        """Full CV content at a version: its keyframe with the following deltas applied"""
+        if version.is_keyframe:
+            return self._stored_state(version)
+
+        keyframe_number = self._keyframe_number(version.cv_id, version.version_number)
+        if keyframe_number is None:
+            raise ValueError(f"No keyframe found for version {version.version_number} of CV {version.cv_id}")
+        chain = self.db.scalars(
+            select(CVVersion).where(
+                CVVersion.cv_id == version.cv_id,
+                CVVersion.version_number >= keyframe_number,
+                CVVersion.version_number <= version.version_number
+            ).order_by(CVVersion.version_number)
+        ).all()
+
+        state = self._stored_state(chain[0])
+        for row in chain[1:]:
+            state = apply_patch(state, row.delta or [])
+        return state
+
+    def version_detail(self, version: CVVersion) -> Dict[str, Any]:
+        """Version metadata plus reconstructed content, shaped like CVVersionDetail"""
+        detail = {name: getattr(version, name) for name in VERSION_METADATA}
+        detail.update(self.materialize(version))
+        return detail
+
+    def diff(
+        self,
+        old: CVVersion,
+        new: CVVersion,
+        item_defaults: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Structural diff between the content of two versions (see utils.cv_diff)"""
+        return diff_states(self.materialize(old), self.materialize(new), item_defaults)
+
+    def create_snapshot(
+        self,
+        cv: CV,
+        user_id: int,
+        change_summary: str = None,
+        version_name: str = None,
+        kind: str = KIND_AUTO,
+        state: Optional[Dict[str, Any]] = None
+    ) -> CVVersion:
+        """Record the current CV state as a new version, unconditionally"""
+        # Reserve the number first: it serializes concurrent snapshots of this
+        # CV, so `latest` below is really the version this one follows
+        version_number = self._next_version_number(cv.id)
+        latest = self._latest(cv.id)
+        state = state if state is not None else self.cv_state(cv)
+        version = CVVersion(
+            cv_id=cv.id,
+            version_number=version_number,
+            version_name=version_name,
+            change_summary=change_summary or "Auto-saved version",
+            kind=kind,
+            content_hash=content_hash(state),
+            created_by_id=user_id
+        )
+
+        previous_state = None
+        if latest is None:
+            self._store_keyframe(version, state)
+        else:
+            keyframe_number = self._keyframe_number(cv.id) or latest.version_number
+            since_keyframe = latest.version_number - keyframe_number + 1
+            previous_state = self.materialize(latest)
+            self._encode(version, state, previous_state, since_keyframe)
+
+        self.db.add(version)
+        if settings.SEARCH_INDEX_VERSIONS:
+            # The search document references the version row
+            self.db.flush()
+            SearchIndex(self.db).index_versions(cv.user_id, [(cv.id, version.id, state, previous_state)])
+        return version
+
+    def autosave_snapshot(
+        self,
+        cv: CV,
+        user_id: int,
+        state: Optional[Dict[str, Any]] = None,
+        change_summary: str = "Auto-saved before edit"
+    ) -> Optional[CVVersion]:
+        """
+        Snapshot the CV before an edit unless history already covers it:
+        skipped when the latest version has the same content, or when the
+        latest version is this user's autosave from within the coalescing
+        window (the burst of edits collapses into that one version).
+        """
+        state = state if state is not None else self.cv_state(cv)
+        latest = self._latest(cv.id)
+        if latest is not None:
+            if latest.content_hash == content_hash(state):
+                return None
+            if (
+                self.autosave_window > 0
+                and latest.kind == KIND_AUTO
+                and latest.created_by_id == user_id
+                and latest.created_at is not None
+                and (datetime.now(timezone.utc) - _as_utc(latest.created_at)).total_seconds() < self.autosave_window
+            ):
+                return None
+        return self.create_snapshot(cv, user_id, change_summary=change_summary, kind=KIND_AUTO, state=state)
+
+    def snapshot_before_update(self, cv: CV, user_id: int, updates: Dict[str, Any]) -> bool:
+        """
+        Apply the autosave policy ahead of an edit. Returns False when the
+        updates wouldn't change the CV (nothing should be written at all).
+        """
+        before = self.cv_state(cv)
+        after = {**before, **{name: value for name, value in updates.items() if name in before}}
+        if content_hash(after) == content_hash(before):
+            return False
+        self.autosave_snapshot(cv, user_id, state=before)
+        return True
+
+    def restore_into(self, cv: CV, version: CVVersion) -> None:
+        for name, value in self.materialize(version).items():
+            setattr(cv, name, value)
+
+    def delete_version(self, version: CVVersion) -> None:
+        """Delete a version; the next version becomes a keyframe if it was a delta on this one"""
+        successor = self.db.scalars(
+            select(CVVersion).where(
+                CVVersion.cv_id == version.cv_id,
+                CVVersion.version_number > version.version_number
+            ).order_by(CVVersion.version_number).limit(1)
+        ).first()
+        if successor is not None and not successor.is_keyframe:
+            self._store_keyframe(successor, self.materialize(successor))
+        if successor is not None and settings.SEARCH_INDEX_VERSIONS:
+            self._reindex(version.cv_id, [(successor, self.materialize(successor), self._previous_state(version))])
+        self.db.delete(version)
+
+    def _previous_state(self, version: CVVersion) -> Optional[Dict[str, Any]]:
+        """Content of the version before `version`, if any"""
+        predecessor = self.db.scalars(
+            select(CVVersion).where(
+                CVVersion.cv_id == version.cv_id,
+                CVVersion.version_number < version.version_number
+            ).order_by(CVVersion.version_number.desc()).limit(1)
+        ).first()
+        return self.materialize(predecessor) if predecessor is not None else None
+
+    def _reindex(self, cv_id: int, versions: List[Tuple[CVVersion, Dict[str, Any], Optional[Dict[str, Any]]]]) -> None:
+        """Re-derive the search documents of versions whose predecessor changed"""
+        if not versions or not settings.SEARCH_INDEX_VERSIONS:
+            return
+        user_id = self.db.scalar(select(CV.user_id).where(CV.id == cv_id))
+        SearchIndex(self.db).index_versions(
+            user_id, [(cv_id, version.id, state, previous) for version, state, previous in versions], replace=True
+        )
+
+    def prune(self, cv_id: int, version_ids: Set[int]) -> int:
+        """
+        Delete several versions of a CV at once. Surviving deltas that were
+        encoded against a deleted version are re-encoded against the previous
+        survivor (or promoted to keyframes). Returns the bytes freed.
+        """
+        first, last = self.db.execute(
+            select(func.min(CVVersion.version_number), func.max(CVVersion.version_number))
+            .where(CVVersion.cv_id == cv_id, CVVersion.id.in_(version_ids))
+        ).one()
+        if first is None:
+            return 0
+        # Only the span from the keyframe before the first deleted version to
+        # the survivor after the last one is materialized
+        start = self.db.scalar(
+            select(func.max(CVVersion.version_number)).where(
+                CVVersion.cv_id == cv_id, CVVersion.is_keyframe.is_(True), CVVersion.version_number < first
+            )
+        )
+        end = self.db.scalar(
+            select(func.min(CVVersion.version_number)).where(
+                CVVersion.cv_id == cv_id, CVVersion.version_number > last
+            )
+        )
+
+        reclaimed = 0
+        previous, since_keyframe, predecessor_deleted = None, 0, False
+        remaining = len(version_ids)
+        reindexed = []
+        for version, state in self.iter_states(cv_id, start, end if end is not None else last):
+            if version.id in version_ids:
+                reclaimed += stored_size(version)
+                predecessor_deleted, remaining = True, remaining - 1
+                continue
+            if predecessor_deleted:
+                reindexed.append((version, state, previous))
+            if predecessor_deleted and not version.is_keyframe:
+                before = stored_size(version)
+                keyframe = self._encode(version, state, previous, since_keyframe)
+                reclaimed += before - stored_size(version)
+            else:
+                keyframe = version.is_keyframe
+            if remaining == 0:
+                break
+            since_keyframe = 1 if keyframe else since_keyframe + 1
+            previous, predecessor_deleted = state, False
+
+        self._reindex(cv_id, reindexed)
+        self.db.execute(
+            delete(CVVersion).where(CVVersion.id.in_(version_ids))
+            .execution_options(synchronize_session=False)
+        )
+        return reclaimed
+
+    def iter_states(self, cv_id: int, first: Optional[int] = None,
+                    last: Optional[int] = None) -> Iterator[Tuple[CVVersion, Dict[str, Any]]]:
+        """
+        (version, full content) for a CV's history in version order, optionally
+        limited to version numbers first..last (`first` must be a keyframe).
+        """
+        query = select(CVVersion).where(CVVersion.cv_id == cv_id)
+        if first is not None:
+            query = query.where(CVVersion.version_number >= first)
+        if last is not None:
+            query = query.where(CVVersion.version_number <= last)
+        versions = self.db.scalars(query.order_by(CVVersion.version_number)).all()
+        state = None
+        for version in versions:
+            state = self._stored_state(version) if version.is_keyframe or state is None else apply_patch(state, version.delta or [])
+            yield version, state
+
+    def rebuild_history(self, cv_id: int) -> int:
+        """
+        Re-encode a CV's whole history with the current keyframe interval
+        (e.g. after migrating full snapshots). Returns the number of rows.
+        """
+        history = list(self.iter_states(cv_id))
+        previous, since_keyframe = None, 0
+        for version, state in history:
+            keyframe = self._encode(version, state, previous, since_keyframe)
+            since_keyframe = 1 if keyframe else since_keyframe + 1
+            previous = state
+        return len(history)
+
+
+class AsyncVersionService:
+    """
+    VersionService for AsyncSession callers. Each call runs the sync
+    implementation through AsyncSession.run_sync, so its queries go through
+    the async driver without blocking the event loop, and background jobs and
+    migrations keep sharing one implementation.
+    """
+
+    def __init__(self, db: AsyncSession, **options):
+        self.db = db
+        self.options = options
+
+    async def _run(self, method: str, *args, **kwargs):
+        return await self.db.run_sync(
+            lambda session: getattr(VersionService(session, **self.options), method)(*args, **kwargs)
+        )
+
+    async def list_versions(self, cv_id: int, before_version: Optional[int] = None, limit: int = 50) -> List[Any]:
+        return await self._run("list_versions", cv_id, before_version=before_version, limit=limit)
+
+    async def count_versions(self, cv_id: int) -> int:
+        return await self._run("count_versions", cv_id)
+
+    async def version_detail(self, version: CVVersion) -> Dict[str, Any]:
+        return await self._run("version_detail", version)
+
+    async def diff(self, old: CVVersion, new: CVVersion, item_defaults: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+        return await self._run("diff", old, new, item_defaults)
+
+    async def create_snapshot(self, cv: CV, user_id: int, **kwargs) -> CVVersion:
+        return await self._run("create_snapshot", cv, user_id, **kwargs)
+
+    async def snapshot_before_update(self, cv: CV, user_id: int, updates: Dict[str, Any]) -> bool:
+        return await self._run("snapshot_before_update", cv, user_id, updates)
+
+    async def restore_into(self, cv: CV, version: CVVersion) -> None:
+        await self._run("restore_into", cv, version)
+
+    async def delete_version(self, version: CVVersion) -> None:
+        await self._run("delete_version", version)
@@ -4,9 +4,10 @@ from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..database.config import settings
-from ..database import get_db
+from ..database import get_async_db
 from ..models.user import User
 
 # Security scheme for Bearer token
@@ -104,7 +105,7 @@ def verify_token_type(token: str, token_type: str) -> bool:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """
     Get the current authenticated user from JWT token
@@ -139,12 +140,14 @@ async def get_current_user(
         user_id: int = payload.get("sub")
         if user_id is None:
             raise credentials_exception
+        # Async drivers bind parameters strictly, so compare as an int
+        user_id = int(user_id)
             
-    except JWTError:
+    except (JWTError, ValueError, TypeError):
         raise credentials_exception
     
     # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     
     if user is None:
         raise credentials_exception
@@ -0,0 +1,197 @@
+"""
+CV diff utilities
+Section-aware structural diff between two CV states (as produced by
+VersionService.cv_state / materialize). Unchanged fields and items are
+left out; list-section items are matched by identity rather than
+position, and text is diffed by word.
+"""
+
+import re
+import json
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+
+# Fields that identify an item within its section
+SECTION_KEYS = {
+    "experience": ("job_title", "employer"),
+    "education": ("school", "degree"),
+    "skills": ("name",),
+    "projects": ("name",),
+    "research": ("title",),
+}
+
+_WORDS = re.compile(r"\S+|\s+")
+
+_OPCODES = {"equal": "=", "delete": "-", "insert": "+"}
+
+
+def word_diff(old: str, new: str) -> List[List[str]]:
+    """
+    Word-level diff as [op, text] segments, op being '=', '-' or '+'.
+    Joining the '=' and '-' texts gives `old`, '=' and '+' gives `new`.
+    """
+    a, b = _WORDS.findall(old), _WORDS.findall(new)
+    segments: List[List[str]] = []
+
+    def emit(op: str, tokens: List[str]) -> None:
+        if not tokens:
+            return
+        text = "".join(tokens)
+        if segments and segments[-1][0] == op:
+            segments[-1][1] += text
+        else:
+            segments.append([op, text])
+
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "replace":
+            emit("-", a[i1:i2])
+            emit("+", b[j1:j2])
+        elif tag == "insert":
+            emit("+", b[j1:j2])
+        else:
+            emit(_OPCODES[tag], a[i1:i2])
+    return segments
+
+
+def _value_diff(old: Any, new: Any) -> Any:
+    """Word diff when both sides are text with several words, else the two values"""
+    if isinstance(old, str) and isinstance(new, str) and " " in old.strip() and " " in new.strip():
+        return {"words": word_diff(old, new)}
+    return {"from": old, "to": new}
+
+
+def _item_diff(old: Any, new: Any) -> Dict[str, Any]:
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return {"value": {"from": old, "to": new}}
+    return {
+        name: _value_diff(old.get(name), new.get(name))
+        for name in list(old) + [name for name in new if name not in old]
+        if old.get(name) != new.get(name)
+    }
+
+
+def _item_key(section: str, item: Any) -> Optional[Tuple]:
+    if not isinstance(item, dict):
+        return None
+    key = tuple(str(item.get(name) or "").strip().lower() for name in SECTION_KEYS.get(section, ()))
+    return key if any(key) else None
+
+
+def _label(section: str, item: Any) -> str:
+    if not isinstance(item, dict):
+        return str(item)
+    return " @ ".join(str(item[name]) for name in SECTION_KEYS.get(section, ()) if item.get(name))
+
+
+def _stable_pairs(pairs: List[Tuple[int, int]]) -> set:
+    """Matched (old, new) index pairs that keep their relative order (longest increasing run)"""
+    pairs = sorted(pairs)
+    tails: List[int] = []
+    links: List[Optional[int]] = [None] * len(pairs)
+    for position, (_, new_index) in enumerate(pairs):
+        low, high = 0, len(tails)
+        while low < high:
+            middle = (low + high) // 2
+            if pairs[tails[middle]][1] < new_index:
+                low = middle + 1
+            else:
+                high = middle
+        links[position] = tails[low - 1] if low else None
+        if low == len(tails):
+            tails.append(position)
+        else:
+            tails[low] = position
+    stable = set()
+    position = tails[-1] if tails else None
+    while position is not None:
+        stable.add(pairs[position])
+        position = links[position]
+    return stable
+
+
+def diff_section(
+    section: str,
+    old: Optional[list],
+    new: Optional[list],
+    defaults: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Diff two versions of a list section. Items are matched when identical,
+    then by their identity fields (SECTION_KEYS); the rest are added or
+    removed. Matched items that changed get a field diff, and items whose
+    relative order changed are reported as moved. `defaults` fills in
+    fields missing from stored items so they don't show up as changes.
+    """
+    old, new = old or [], new or []
+    if defaults:
+        old = [{**defaults, **item} if isinstance(item, dict) else item for item in old]
+        new = [{**defaults, **item} if isinstance(item, dict) else item for item in new]
+    if old == new:
+        return None
+
+    encoded_old = [json.dumps(item, sort_keys=True) for item in old]
+    unmatched_old: Dict[str, List[int]] = {}
+    for index, encoded in enumerate(encoded_old):
+        unmatched_old.setdefault(encoded, []).append(index)
+
+    matches: Dict[int, int] = {}  # new index -> old index
+    for index, item in enumerate(new):
+        candidates = unmatched_old.get(json.dumps(item, sort_keys=True))
+        if candidates:
+            matches[index] = candidates.pop(0)
+
+    taken = set(matches.values())
+    by_key: Dict[Tuple, List[int]] = {}
+    for index, item in enumerate(old):
+        key = _item_key(section, item)
+        if index not in taken and key is not None:
+            by_key.setdefault(key, []).append(index)
+    for index, item in enumerate(new):
+        key = _item_key(section, item)
+        if index not in matches and by_key.get(key):
+            matches[index] = by_key[key].pop(0)
+
+    taken = set(matches.values())
+    stable = _stable_pairs([(old_index, new_index) for new_index, old_index in matches.items()])
+    changed = []
+    for new_index, old_index in sorted(matches.items()):
+        moved = (old_index, new_index) not in stable
+        if old[old_index] == new[new_index] and not moved:
+            continue
+        entry = {"from_index": old_index, "to_index": new_index, "label": _label(section, new[new_index])}
+        if moved:
+            entry["moved"] = True
+        if old[old_index] != new[new_index]:
+            entry["fields"] = _item_diff(old[old_index], new[new_index])
+        changed.append(entry)
+
+    return {
+        "added": [{"index": index, "item": item} for index, item in enumerate(new) if index not in matches],
+        "removed": [{"index": index, "item": item} for index, item in enumerate(old) if index not in taken],
+        "changed": changed,
+    }
+
+
+def diff_states(
+    old: Dict[str, Any],
+    new: Dict[str, Any],
+    item_defaults: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Structural diff of two CV states: changed scalar fields and list
+    sections. `item_defaults` maps a section to its item field defaults.
+    """
+    item_defaults = item_defaults or {}
+    fields: Dict[str, Any] = {}
+    sections: Dict[str, Any] = {}
+    for name in list(old) + [name for name in new if name not in old]:
+        before, after = old.get(name), new.get(name)
+        if before == after:
+            continue
+        if name in SECTION_KEYS and isinstance(before or [], list) and isinstance(after or [], list):
+            section = diff_section(name, before, after, item_defaults.get(name))
+            if section is not None:
+                sections[name] = section
+        else:
+            fields[name] = _value_diff(before, after)
+    return {"fields": fields, "sections": sections}
@@ -0,0 +1,177 @@
+"""
+JSON Patch utilities
+Minimal RFC 6902 implementation: make_patch() produces add/remove/replace
+operations between two JSON documents, apply_patch() applies any of the six
+operations (add, remove, replace, move, copy, test).
+"""
+
+import copy
+from typing import Any, Dict, List
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch is malformed or can't be applied to the document"""
+
+
+class JsonPatchTestFailed(JsonPatchError):
+    """Raised when a 'test' operation doesn't match the document"""
+
+
+def _escape(token: Any) -> str:
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def _tokens(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not isinstance(pointer, str) or not pointer.startswith('/'):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [_unescape(token) for token in pointer[1:].split('/')]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == '-':
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token[0] == '0'):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _get(document: Any, tokens: List[str]) -> Any:
+    target = document
+    for token in tokens:
+        if isinstance(target, dict):
+            if token not in target:
+                raise JsonPatchError(f"Path not found: /{'/'.join(map(_escape, tokens))}")
+            target = target[token]
+        elif isinstance(target, list):
+            target = target[_index(target, token)]
+        else:
+            raise JsonPatchError(f"Path not found: /{'/'.join(map(_escape, tokens))}")
+    return target
+
+
+def _add(document: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _get(document, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, key, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to a {type(parent).__name__}")
+    return document
+
+
+def _remove(document: Any, tokens: List[str]) -> Any:
+    if not tokens:
+        raise JsonPatchError("Cannot remove the document root")
+    parent = _get(document, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(map(_escape, tokens))}")
+        del parent[key]
+    elif isinstance(parent, list):
+        del parent[_index(parent, key)]
+    else:
+        raise JsonPatchError(f"Cannot remove from a {type(parent).__name__}")
+    return document
+
+
+def _apply_operation(document: Any, operation: Dict[str, Any]) -> Any:
+    if not isinstance(operation, dict) or "op" not in operation or "path" not in operation:
+        raise JsonPatchError(f"Malformed operation: {operation!r}")
+    kind = operation["op"]
+    tokens = _tokens(operation["path"])
+
+    if kind in ("add", "replace", "test") and "value" not in operation:
+        raise JsonPatchError(f"'{kind}' operation requires a value")
+    if kind in ("move", "copy") and "from" not in operation:
+        raise JsonPatchError(f"'{kind}' operation requires 'from'")
+
+    if kind == "add":
+        return _add(document, tokens, copy.deepcopy(operation["value"]))
+    if kind == "remove":
+        return _remove(document, tokens)
+    if kind == "replace":
+        if not tokens:
+            return copy.deepcopy(operation["value"])
+        _get(document, tokens)  # target must exist
+        return _add(_remove(document, tokens), tokens, copy.deepcopy(operation["value"]))
+    if kind == "move":
+        source = _tokens(operation["from"])
+        if tokens[:len(source)] == source and len(tokens) > len(source):
+            raise JsonPatchError("Cannot move a value into one of its own children")
+        value = _get(document, source)
+        return _add(_remove(document, source), tokens, value)
+    if kind == "copy":
+        return _add(document, tokens, copy.deepcopy(_get(document, _tokens(operation["from"]))))
+    if kind == "test":
+        if _get(document, tokens) != operation["value"]:
+            raise JsonPatchTestFailed(f"Test failed at {operation['path']}")
+        return document
+    raise JsonPatchError(f"Unknown operation: {kind!r}")
+
+
+def apply_patch(document: Any, patch: List[Dict[str, Any]]) -> Any:
+    """Apply a patch to a copy of the document and return the result"""
+    result = copy.deepcopy(document)
+    for operation in patch:
+        result = _apply_operation(result, operation)
+    return result
+
+
+def _diff(source: Any, target: Any, path: str, operations: List[Dict[str, Any]]) -> None:
+    if type(source) is type(target) and source == target:
+        return
+
+    if isinstance(source, dict) and isinstance(target, dict):
+        for key in source:
+            if key not in target:
+                operations.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in target.items():
+            child = f"{path}/{_escape(key)}"
+            if key in source:
+                _diff(source[key], value, child, operations)
+            else:
+                operations.append({"op": "add", "path": child, "value": copy.deepcopy(value)})
+        return
+
+    if isinstance(source, list) and isinstance(target, list):
+        # Trim the common prefix and suffix so an insert or delete in the
+        # middle of a section doesn't rewrite every item after it
+        n, m = len(source), len(target)
+        prefix = 0
+        while prefix < n and prefix < m and source[prefix] == target[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < n - prefix and suffix < m - prefix and source[n - 1 - suffix] == target[m - 1 - suffix]:
+            suffix += 1
+        source_mid, target_mid = n - prefix - suffix, m - prefix - suffix
+        common = min(source_mid, target_mid)
+        for i in range(common):
+            _diff(source[prefix + i], target[prefix + i], f"{path}/{prefix + i}", operations)
+        for i in range(source_mid - 1, common - 1, -1):
+            operations.append({"op": "remove", "path": f"{path}/{prefix + i}"})
+        for i in range(common, target_mid):
+            operations.append({"op": "add", "path": f"{path}/{prefix + i}", "value": copy.deepcopy(target[prefix + i])})
+        return
+
+    operations.append({"op": "replace", "path": path, "value": copy.deepcopy(target)})
+
+
+def make_patch(source: Any, target: Any) -> List[Dict[str, Any]]:
+    """Operations that turn `source` into `target` (add/remove/replace only)"""
+    operations: List[Dict[str, Any]] = []
+    _diff(source, target, "", operations)
+    return operations
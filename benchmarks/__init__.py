@@ -0,0 +1,6 @@
+"""
+Standalone performance benchmarks for the backend.
+Run individual modules from the repository root, e.g.:
+
+    python -m benchmarks.upload_memory
+"""
@@ -0,0 +1,89 @@
+"""
+Chunked AI document extraction benchmark.
+
+Replaces the Azure call with a simulated completion whose latency grows with
+prompt size (and which answers with the local section segmenter's output),
+then compares the previous behaviour - one call over the first 8000
+characters - with the chunked, concurrent pipeline in
+AIService.parse_document_with_ai on a long multi-page CV.
+
+    python -m benchmarks.ai_chunking --pages 12
+"""
+
+import re
+import json
+import time
+import asyncio
+import argparse
+from unittest import mock
+
+from backend.database.config import settings
+from backend.services.ai_service import ai_service
+from backend.services.document_chunker import estimate_tokens, split_into_chunks
+from backend.services.section_segmenter import segment_resume
+
+# Truncation applied before chunking existed
+SINGLE_CALL_CHARS = 8000
+
+HEADER = "Jordan Rivera\njordan.rivera@example.org | (555) 010-2000 | Boston, MA\n"
+
+
+def build_long_cv(pages: int) -> str:
+    """A CV with `pages` worth of experience entries and publications"""
+    lines = [HEADER, "Summary", "Researcher and engineer with a long publication record.", "Experience"]
+    for i in range(pages * 4):
+        lines += [
+            f"Research Engineer at Lab {i:03d} (Jan {1990 + i % 30} - Dec {1991 + i % 30})",
+            *(f"- Led study {i}.{j} on distributed systems and published the results" for j in range(4)),
+        ]
+    lines += ["Education", "Massachusetts Institute of Technology", "PhD in Computer Science, 1985 - 1990"]
+    lines += ["Publications"] + [f"- Paper {i}: On scalable consensus, Journal of Systems {1990 + i % 30}"
+                                 for i in range(pages * 10)]
+    return '\n'.join(lines)
+
+
+def _simulated_call(base_seconds: float, seconds_per_1k_tokens: float):
+    def call(messages, temperature=0.4, max_retries=3):
+        prompt = messages[-1]["content"]
+        with ai_service._call_slots:
+            time.sleep(base_seconds + seconds_per_1k_tokens * estimate_tokens(prompt) / 1000)
+        body = re.search(r'<user_input>\n(.*)\n</user_input>', prompt, re.S).group(1)
+        segments = segment_resume(body)
+        return json.dumps({"experience": segments.experience, "education": segments.education})
+    return call
+
+
+async def _timed_parse(text: str) -> tuple:
+    start = time.perf_counter()
+    result = await ai_service.parse_document_with_ai(text)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare single-call and chunked AI document extraction")
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--base-ms", type=float, default=300.0, help="Simulated fixed latency per call")
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=800.0, help="Simulated latency per 1k prompt tokens")
+    args = parser.parse_args()
+
+    text = build_long_cv(args.pages)
+    chunks = split_into_chunks(text, settings.AI_CHUNK_TOKEN_BUDGET, settings.AI_MAX_CHUNKS)
+    call = _simulated_call(args.base_ms / 1000, args.ms_per_1k_tokens / 1000)
+    truth_jobs = args.pages * 4
+
+    print(f"document: {len(text)} chars, ~{estimate_tokens(text)} tokens")
+    print(f"chunks:   {len(chunks)} (largest ~{max(estimate_tokens(c) for c in chunks)} tokens), "
+          f"AI_MAX_CONCURRENCY={settings.AI_MAX_CONCURRENCY}")
+
+    with mock.patch.object(type(ai_service), "_call_with_retry", side_effect=call, autospec=False):
+        with mock.patch.object(settings, "AI_CHUNK_TOKEN_BUDGET", 10 ** 9):
+            single_seconds, single = asyncio.run(_timed_parse(text[:SINGLE_CALL_CHARS]))
+        chunked_seconds, chunked = asyncio.run(_timed_parse(text))
+
+    print(f"\n{'mode':<10}{'wall s':>8}{'jobs found':>12}")
+    print(f"{'single':<10}{single_seconds:>8.2f}{len(single.get('experience', [])):>7}/{truth_jobs}")
+    print(f"{'chunked':<10}{chunked_seconds:>8.2f}{len(chunked.get('experience', [])):>7}/{truth_jobs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Sync vs async database access under concurrent requests.
+
+Runs C concurrent simulated requests on one event loop for a few seconds.
+Each request loads a CV and, for a share of requests, saves an edit, the
+way GET/PUT /api/cv/{id} do. The "sync" path uses a Session directly in the
+coroutine (what the routes did before); the "async" path uses AsyncSession
+on aiosqlite. Every statement carries --db-latency-ms of simulated
+round-trip time inside the driver, standing in for a server database, and
+each request also awaits --io-ms of unrelated I/O. A heartbeat task
+measures how long the event loop gets stalled.
+
+Both paths get a pool of one connection per client. With the default pool
+the sync path simply deadlocks once clients outnumber connections: a
+coroutine holding a connection across an await cannot give it back while
+another one blocks the loop waiting for the pool.
+
+    python -m benchmarks.async_db --concurrency 1,32 --db-latency-ms 2
+"""
+
+import os
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import statistics
+from typing import Any, Dict, List
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.database import Base, create_db_engine, create_async_db_engine
+from backend.models import User, CV
+from benchmarks.version_storage import _initial_cv
+
+
+def _install_latency(sync_engine, latency_ms: float) -> None:
+    """Register simulated_latency() on each connection; it sleeps inside the driver"""
+    @event.listens_for(sync_engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.create_function("simulated_latency", 0, lambda: time.sleep(latency_ms / 1000) or 0)
+
+
+def _seed(path: str, cvs: int) -> List[int]:
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="bench@example.org", username="bench", hashed_password="x")
+    session.add(user)
+    session.flush()
+    state = _initial_cv(random.Random(4))
+    session.add_all([CV(user_id=user.id, **state) for _ in range(cvs)])
+    session.commit()
+    ids = [cv_id for (cv_id,) in session.query(CV.id)]
+    session.close()
+    engine.dispose()
+    return ids
+
+
+async def _heartbeat(stop: asyncio.Event, lags: List[float], interval: float = 0.005) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def run(mode: str, path: str, cv_ids: List[int], concurrency: int, seconds: float,
+              latency_ms: float, io_ms: float, write_share: float) -> Dict[str, Any]:
+    url = f"sqlite:///{path}"
+    pool = dict(pool_size=concurrency, max_overflow=0)
+    if mode == "sync":
+        engine = create_db_engine(url, **pool)
+        _install_latency(engine, latency_ms)
+        factory = sessionmaker(bind=engine, autoflush=False)
+    else:
+        engine = create_async_db_engine(url, **pool)
+        _install_latency(engine.sync_engine, latency_ms)
+        factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    stop = asyncio.Event()
+    latencies: List[float] = []
+    lags: List[float] = []
+
+    def query(cv_id: int):
+        return select(CV).where(CV.id == cv_id, func.simulated_latency() == 0)
+
+    async def sync_request(rng: random.Random) -> None:
+        db = factory()
+        try:
+            cv = db.scalar(query(rng.choice(cv_ids)))
+            await asyncio.sleep(io_ms / 1000)
+            if rng.random() < write_share:
+                cv.summary = f"Revision {rng.randint(0, 10 ** 6)}"
+                db.commit()
+        finally:
+            db.close()
+
+    async def async_request(rng: random.Random) -> None:
+        async with factory() as db:
+            cv = await db.scalar(query(rng.choice(cv_ids)))
+            await asyncio.sleep(io_ms / 1000)
+            if rng.random() < write_share:
+                cv.summary = f"Revision {rng.randint(0, 10 ** 6)}"
+                await db.commit()
+
+    handler = sync_request if mode == "sync" else async_request
+
+    async def client(seed: int) -> None:
+        rng = random.Random(seed)
+        while not stop.is_set():
+            start = time.perf_counter()
+            await handler(rng)
+            latencies.append(time.perf_counter() - start)
+
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+    clients = [asyncio.create_task(client(i)) for i in range(concurrency)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*clients, heartbeat)
+
+    if mode == "sync":
+        engine.dispose()
+    else:
+        await engine.dispose()
+
+    ordered = sorted(latencies) or [0.0]
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "rps": len(latencies) / seconds,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p99_ms": ordered[int(len(ordered) * 0.99)] * 1000,
+        "max_lag_ms": max(lags, default=0.0) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare sync and async database access on the event loop")
+    parser.add_argument("--concurrency", default="1,32", help="Concurrent requests to test")
+    parser.add_argument("--seconds", type=float, default=4.0)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="Simulated round trip per statement")
+    parser.add_argument("--io-ms", type=float, default=1.0, help="Other awaited I/O per request")
+    parser.add_argument("--write-share", type=float, default=0.2)
+    parser.add_argument("--cvs", type=int, default=200)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="async-db-")
+    path = os.path.join(directory, "bench.db")
+    cv_ids = _seed(path, args.cvs)
+
+    print(f"{args.db_latency_ms} ms per statement, {args.io_ms} ms other I/O, "
+          f"{args.write_share:.0%} writes, {args.seconds}s per run\n")
+    print("path   concurrency     req/s   p50 ms   p99 ms  max loop stall ms")
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        for mode in ("sync", "async"):
+            r = asyncio.run(run(mode, path, cv_ids, concurrency, args.seconds,
+                                args.db_latency_ms, args.io_ms, args.write_share))
+            print(f"{r['mode']:<6}{r['concurrency']:>12}{r['rps']:>10.0f}{r['p50_ms']:>9.2f}"
+                  f"{r['p99_ms']:>9.2f}{r['max_lag_ms']:>19.2f}")
+
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Autosave write-volume benchmark.
+
+Replays an editing session against the update path on a simulated clock
+(a save every few seconds, some of which change nothing) and counts the
+version rows and write statements produced by:
+
+  legacy  - snapshot before every save (the old update_cv behaviour)
+  policy  - VersionService.snapshot_before_update: skip unchanged saves,
+            coalesce autosaves within VERSION_AUTOSAVE_WINDOW_SECONDS
+
+    python -m benchmarks.autosave_writes --minutes 60 --interval 3
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+from unittest import mock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.database.config import settings
+from backend.models import User, CV, CVVersion
+from backend.services.version_service import VersionService
+
+
+class _SimulatedClock:
+    """Stands in for the datetime class in the modules that stamp versions"""
+    current = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+def _next_edit(cv: CV, rng: random.Random, noop_rate: float) -> Dict[str, Any]:
+    if rng.random() < noop_rate:
+        return {"summary": cv.summary}
+    return {"summary": (cv.summary or "") + rng.choice("abcdefgh ")}
+
+
+def run(mode: str, minutes: int, interval: float, noop_rate: float, window: int, seed: int = 11) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    directory = tempfile.mkdtemp(prefix="autosave-bench-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    user = User(email="bench@example.org", username="bench", hashed_password="x")
+    session.add(user)
+    session.flush()
+    cv = CV(user_id=user.id, title="CV", template="modern", summary="Start", experience=[], skills=[])
+    session.add(cv)
+    session.commit()
+
+    writes = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE")):
+            writes["count"] += 1
+
+    service = VersionService(session, autosave_window=window)
+    saves = int(minutes * 60 / interval)
+    _SimulatedClock.current = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    start = time.perf_counter()
+    with mock.patch("backend.services.version_service.datetime", _SimulatedClock), \
+            mock.patch("backend.models.cv_version.datetime", _SimulatedClock):
+        for _ in range(saves):
+            _SimulatedClock.current += timedelta(seconds=interval)
+            updates = _next_edit(cv, rng, noop_rate)
+            if mode == "legacy":
+                service.create_snapshot(cv, user.id, change_summary="Auto-saved before edit")
+            elif not service.snapshot_before_update(cv, user.id, updates):
+                continue
+            for name, value in updates.items():
+                setattr(cv, name, value)
+            session.commit()
+    elapsed = time.perf_counter() - start
+
+    versions = session.query(CVVersion).count()
+    session.close()
+    engine.dispose()
+    os.remove(path)
+    os.rmdir(directory)
+    return {"mode": mode, "saves": saves, "versions": versions, "writes": writes["count"],
+            "ms_per_save": elapsed / saves * 1000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare version writes with and without the autosave policy")
+    parser.add_argument("--minutes", type=int, default=60, help="Length of the simulated editing session")
+    parser.add_argument("--interval", type=float, default=3.0, help="Seconds between autosaves")
+    parser.add_argument("--noop-rate", type=float, default=0.3, help="Share of saves that change nothing")
+    parser.add_argument("--window", type=int, default=settings.VERSION_AUTOSAVE_WINDOW_SECONDS)
+    args = parser.parse_args()
+
+    print(f"{args.minutes} min session, save every {args.interval}s, {args.noop_rate:.0%} no-op saves, "
+          f"window {args.window}s\n")
+    print("mode      saves  versions  write stmts  ms/save")
+    for mode in ("legacy", "policy"):
+        r = run(mode, args.minutes, args.interval, args.noop_rate, args.window)
+        print(f"{r['mode']:<8}{r['saves']:>7}{r['versions']:>10}{r['writes']:>13}{r['ms_per_save']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
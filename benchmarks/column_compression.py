@@ -0,0 +1,172 @@
+"""
+Column compression benchmark.
+
+Fills a database with CVs and their version history through VersionService
+once per codec (none, zlib, zstd, zstd with a dictionary trained on other
+CVs), then reports the content bytes stored, the database file size after
+VACUUM, write time and the read path: loading full CVs and materializing
+versions, plus the raw decode cost per value.
+
+    python -m benchmarks.column_compression --cvs 200 --versions 20
+"""
+
+import os
+import time
+import json
+import random
+import argparse
+import tempfile
+import statistics
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base, compression
+from backend.database.compression import ColumnCodec, train_dictionary
+from backend.models import User, CV, CVVersion
+from backend.services.version_service import VersionService
+from benchmarks.version_storage import _edit
+
+WORDS = (
+    "designed built led migrated scaled reduced improved automated delivered owned mentored launched "
+    "python kubernetes postgres react latency throughput pipeline platform services api billing search "
+    "payments team customers revenue reliability incidents monitoring costs infrastructure data models "
+    "analytics growth onboarding performance security compliance release testing deployment"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _random_cv(rng: random.Random) -> Dict[str, Any]:
+    """A CV with varied wording so compression isn't flattered by repeated text"""
+    return {
+        "title": "CV", "template": rng.choice(["modern", "classic"]),
+        "full_name": f"Person {rng.randint(0, 10 ** 6)}", "email": "person@example.org",
+        "summary": " ".join(_sentence(rng, 12) for _ in range(4)),
+        "experience": [
+            {"job_title": f"Engineer {i}", "employer": f"Company {rng.randint(0, 999)}", "location": "Remote",
+             "start_date": str(2010 + i), "end_date": str(2011 + i), "link": "", "is_visible": True,
+             "description": "\n".join(f"- {_sentence(rng, 10)}" for _ in range(rng.randint(3, 6)))}
+            for i in range(rng.randint(3, 7))
+        ],
+        "education": [{"school": f"University {rng.randint(0, 99)}", "degree": "BSc", "field": "Computer Science",
+                       "start_date": "2006", "end_date": "2010", "location": "", "description": _sentence(rng, 8),
+                       "gpa": "", "link": "", "is_visible": True}],
+        "skills": [{"name": rng.choice(WORDS), "level": "advanced"} for _ in range(12)],
+        "projects": [{"name": f"Project {i}", "description": _sentence(rng, 20), "technologies": "Python, SQL",
+                      "start_date": "", "end_date": "", "link": "", "is_visible": True} for i in range(3)],
+        "research": [],
+    }
+
+
+def _dictionary_samples(count: int) -> List[bytes]:
+    rng = random.Random(99)
+    samples = []
+    for _ in range(count):
+        cv = _random_cv(rng)
+        samples.append(cv["summary"].encode("utf-8"))
+        for name in ("experience", "education", "projects"):
+            samples.append(json.dumps(cv[name], separators=(",", ":")).encode("utf-8"))
+    return samples
+
+
+def run(codec: ColumnCodec, cvs: int, versions: int, reads: int) -> Dict[str, Any]:
+    compression.codec = codec
+    directory = tempfile.mkdtemp(prefix="column-compression-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="bench@example.org", username="bench", hashed_password="x")
+    session.add(user)
+    session.flush()
+
+    rng = random.Random(1)
+    service = VersionService(session)
+    start = time.perf_counter()
+    for _ in range(cvs):
+        cv = CV(user_id=user.id, **_random_cv(rng))
+        session.add(cv)
+        session.flush()
+        for _ in range(versions):
+            service.create_snapshot(cv, user.id)
+            _edit(cv, rng)
+        session.commit()
+    write_seconds = time.perf_counter() - start
+
+    columns = " + ".join(f"COALESCE(LENGTH({name}), 0)" for name in ("summary", "experience", "education", "projects", "research"))
+    stored = sum(session.execute(text(f"SELECT COALESCE(SUM({columns}), 0) FROM {table}")).scalar() for table in ("cvs", "cv_versions"))
+
+    cv_ids = session.scalars(select(CV.id)).all()
+    load_times = []
+    for cv_id in rng.sample(cv_ids, min(reads, len(cv_ids))):
+        session.expunge_all()
+        start = time.perf_counter()
+        session.get(CV, cv_id)
+        load_times.append(time.perf_counter() - start)
+
+    version_ids = session.scalars(select(CVVersion.id)).all()
+    materialize_times = []
+    for version_id in rng.sample(version_ids, min(reads, len(version_ids))):
+        session.expunge_all()
+        start = time.perf_counter()
+        service.materialize(session.get(CVVersion, version_id))
+        materialize_times.append(time.perf_counter() - start)
+
+    raw_values = [row[0] for row in session.execute(text("SELECT experience FROM cvs")) if row[0] is not None]
+    start = time.perf_counter()
+    for value in raw_values:
+        json.loads(codec.decode(value))
+    decode_us = (time.perf_counter() - start) / max(1, len(raw_values)) * 1e6
+
+    session.close()
+    with engine.connect() as conn:
+        conn.execute(text("VACUUM"))
+    engine.dispose()
+    file_size = os.path.getsize(path)
+    os.remove(path)
+    os.rmdir(directory)
+    return {
+        "stored": stored, "file": file_size, "write_s": write_seconds,
+        "load_ms": statistics.fmean(load_times) * 1000,
+        "materialize_ms": statistics.fmean(materialize_times) * 1000,
+        "decode_us": decode_us,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare storage and read cost of column compression codecs")
+    parser.add_argument("--cvs", type=int, default=200)
+    parser.add_argument("--versions", type=int, default=20, help="Versions per CV")
+    parser.add_argument("--reads", type=int, default=300)
+    args = parser.parse_args()
+
+    codecs = [("none", ColumnCodec("none")), ("zlib", ColumnCodec("zlib"))]
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        print("zstandard not installed; skipping zstd codecs\n")
+    else:
+        directory = tempfile.mkdtemp(prefix="column-dictionary-")
+        dictionary = os.path.join(directory, "cv.dict")
+        with open(dictionary, "wb") as f:
+            f.write(train_dictionary(_dictionary_samples(500)))
+        codecs += [("zstd", ColumnCodec("zstd", level=3)),
+                   ("zstd+dict", ColumnCodec("zstd", level=3, dictionary_path=dictionary))]
+        codecs[-1][1]._zstd_codecs()  # load the dictionary before its file is removed
+        os.remove(dictionary)
+        os.rmdir(directory)
+
+    print(f"{args.cvs} CVs x {args.versions} versions\n")
+    print("codec       content KiB   file KiB   write s   load CV ms   materialize ms   decode us")
+    for name, codec in codecs:
+        r = run(codec, args.cvs, args.versions, args.reads)
+        print(f"{name:<10}{r['stored'] / 1024:>13.0f}{r['file'] / 1024:>11.0f}{r['write_s']:>10.2f}"
+              f"{r['load_ms']:>13.3f}{r['materialize_ms']:>17.3f}{r['decode_us']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Conditional GET benchmark.
+
+Polls an unchanged CV, its version list and one version detail through the
+API the way the editor and version panel do, once unconditionally and once
+revalidating with If-None-Match, and reports latency and bytes transferred.
+
+    python -m benchmarks.conditional_get --polls 300 --versions 60
+"""
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+# The app reads its settings at import time
+_directory = tempfile.mkdtemp(prefix="conditional-get-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_directory}/bench.db")
+os.environ.setdefault("PARSE_CACHE_DIR", f"{_directory}/parse_cache")
+os.environ.setdefault("VERSION_COMPACTION_INTERVAL_SECONDS", "0")
+os.environ.setdefault("VERSION_AUTOSAVE_WINDOW_SECONDS", "0")
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from benchmarks.version_storage import _large_cv
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare plain polling with If-None-Match revalidation")
+    parser.add_argument("--polls", type=int, default=300)
+    parser.add_argument("--versions", type=int, default=60)
+    parser.add_argument("--items", type=int, default=15)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    client.__enter__()
+    client.post("/api/auth/register", json={"email": "bench@example.org", "username": "bench", "password": "Passw0rdX"})
+    token = client.post("/api/auth/login", json={"username_or_email": "bench", "password": "Passw0rdX"}).json()["access_token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+
+    cv = client.post("/api/cv/", json=_large_cv(args.items)).json()
+    url = f"/api/cv/{cv['id']}"
+    for edit in range(args.versions):
+        client.patch(url, json=[{"op": "replace", "path": "/summary", "value": f"Revision {edit}"}])
+    latest = client.get(f"{url}/versions").json()[0]["id"]
+
+    print(f"{args.polls} polls of an unchanged CV ({args.items} items per section, {args.versions} versions)\n")
+    print("resource          mode          latency ms   bytes/poll")
+    for name, path in (("cv", url), ("version list", f"{url}/versions"), ("version detail", f"{url}/versions/{latest}")):
+        etag = client.get(path).headers["etag"]
+        for mode, headers in (("plain", {}), ("If-None-Match", {"If-None-Match": etag})):
+            latencies, size = [], 0
+            for _ in range(args.polls):
+                start = time.perf_counter()
+                response = client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                size += len(response.content)
+            print(f"{name:<18}{mode:<14}{statistics.fmean(latencies) * 1000:>10.2f}{size / args.polls:>13.0f}")
+
+    client.__exit__(None, None, None)
+    shutil.rmtree(_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
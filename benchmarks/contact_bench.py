@@ -0,0 +1,81 @@
+"""
+Contact-field extraction microbenchmark.
+
+Times the whole contact stage of DocumentParser - the head-of-document line
+scan plus the email, phone, name, location and LinkedIn extractors - on
+already-extracted corpus text, so file I/O and text extraction don't drown
+out the numbers.
+
+    python -m benchmarks.contact_bench
+"""
+
+import time
+import argparse
+import statistics
+from collections import defaultdict
+from typing import Dict, List, Any
+
+from backend.services.contact_scanner import scan_lines
+from backend.services.document_parser import DocumentParser
+from benchmarks.corpus import DEFAULT_CORPUS_DIR, load_corpus
+
+EXTRACTORS = {
+    "email": "_extract_email",
+    "phone": "_extract_phone",
+    "name": "_extract_name",
+    "location": "_extract_location",
+    "linkedin": "_extract_linkedin",
+}
+
+
+def _prepared_parsers(documents: List[Dict[str, Any]]) -> List[DocumentParser]:
+    parsers = []
+    for doc in documents:
+        parser = DocumentParser()
+        parser.parse_document(doc["content"], doc["file"])
+        parsers.append(parser)
+    return parsers
+
+
+def run_benchmark(documents: List[Dict[str, Any]], iterations: int = 200) -> Dict[str, Any]:
+    """Mean/p50/p95 microseconds per document for the scan, each extractor and the whole stage"""
+    parsers = _prepared_parsers(documents)
+    samples = defaultdict(list)
+
+    for _ in range(iterations):
+        for parser in parsers:
+            stage_start = time.perf_counter()
+            parser.contact_lines = scan_lines(parser.raw_text.split("\n"))
+            samples["scan"].append(time.perf_counter() - stage_start)
+            for name, method in EXTRACTORS.items():
+                start = time.perf_counter()
+                getattr(parser, method)()
+                samples[name].append(time.perf_counter() - start)
+            samples["contact_stage"].append(time.perf_counter() - stage_start)
+
+    report = {}
+    for name, values in samples.items():
+        ordered = sorted(values)
+        report[name] = {
+            "mean_us": round(statistics.fmean(ordered) * 1e6, 2),
+            "p50_us": round(ordered[len(ordered) // 2] * 1e6, 2),
+            "p95_us": round(ordered[int(len(ordered) * 0.95)] * 1e6, 2),
+        }
+    return {"documents": len(parsers), "iterations": iterations, "stages": report}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmark the contact-field extraction stage")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    results = run_benchmark(load_corpus(args.corpus), iterations=args.iterations)
+    print(f"{results['documents']} docs x {results['iterations']} iterations")
+    print("\nstage              mean us     p50 us     p95 us")
+    for name, stats in results["stages"].items():
+        print(f"  {name:<15}{stats['mean_us']:>9.2f}  {stats['p50_us']:>9.2f}  {stats['p95_us']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Synthetic resume corpus for DocumentParser benchmarks.
+
+Generates deterministic resumes in TXT, DOCX and PDF across several layouts
+and sizes. Each document has a ground-truth JSON file describing the fields
+the parser is expected to recover.
+
+    python -m benchmarks.corpus --out benchmarks/corpus --variants 2
+"""
+
+import io
+import os
+import json
+import random
+import argparse
+from typing import Dict, List, Any
+
+DEFAULT_CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus")
+
+FORMATS = ["txt", "docx", "pdf"]
+LAYOUTS = ["classic", "compact", "labeled"]
+SIZES = {
+    # size: (experience entries, bullets per entry, education entries, skills, projects)
+    "small": (1, 2, 1, 4, 0),
+    "medium": (3, 3, 2, 8, 2),
+    "large": (8, 6, 3, 15, 5),
+}
+
+FIRST_NAMES = ["Jane", "Omar", "Priya", "Lucas", "Mei", "Daniel", "Amara", "Sofia", "Kenji", "Noah", "Elena", "Tariq"]
+LAST_NAMES = ["Doe", "Haddad", "Raman", "Silva", "Chen", "Okafor", "Novak", "Moreno", "Tanaka", "Fischer", "Ahmed", "Brooks"]
+US_CITIES = [("Austin", "TX"), ("Seattle", "WA"), ("Boston", "MA"), ("Denver", "CO"), ("San Jose", "CA"), ("Chicago", "IL")]
+INTL_CITIES = [("Berlin", "Germany"), ("Toronto", "Canada"), ("Dublin", "Ireland"), ("Singapore", "Singapore")]
+EMPLOYERS = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises",
+             "Hooli", "Vandelay Imports", "Soylent Systems", "Cyberdyne", "Tyrell Analytics", "Wonka Digital"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Backend Developer", "Data Engineer",
+          "Frontend Developer", "Staff Engineer", "Machine Learning Engineer", "Platform Engineer"]
+SCHOOLS = ["University of Toronto", "Stanford University", "Georgia Institute of Technology",
+           "University of Michigan", "Technical University of Munich", "National University of Singapore"]
+DEGREES = ["Bachelor of Science in Computer Science", "Master of Science in Software Engineering",
+           "Bachelor of Engineering in Electrical Engineering", "PhD in Computer Science"]
+SKILLS = ["Python", "JavaScript", "TypeScript", "Java", "Kotlin", "Docker", "Kubernetes", "Terraform",
+          "PostgreSQL", "MongoDB", "Redis", "Django", "Flask", "FastAPI", "React", "Angular", "Pandas",
+          "NumPy", "PyTorch", "TensorFlow", "Jenkins", "GraphQL", "Linux", "Kafka"]
+BULLET_VERBS = ["Designed", "Built", "Led", "Migrated", "Optimized", "Automated", "Shipped", "Refactored"]
+BULLET_OBJECTS = ["the billing pipeline", "an internal reporting tool", "the onboarding flow",
+                  "a customer analytics dashboard", "the search service", "nightly batch jobs"]
+BULLET_RESULTS = ["cutting p95 latency by {n}%", "saving {n} engineer hours per month",
+                  "raising conversion by {n}%", "serving {n}k daily users", "reducing costs by {n}%"]
+PROJECT_NAMES = ["Ledger", "Atlas", "Beacon", "Compass", "Drift", "Ember", "Forge", "Harbor"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def _make_profile(rng: random.Random, size: str) -> Dict[str, Any]:
+    """Random but deterministic ground truth for one resume"""
+    n_exp, n_bullets, n_edu, n_skills, n_projects = SIZES[size]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    if rng.random() < 0.75:
+        city, region = rng.choice(US_CITIES)
+    else:
+        city, region = rng.choice(INTL_CITIES)
+
+    year = 2024
+    experience = []
+    for i in range(n_exp):
+        start_year = year - rng.randint(1, 3)
+        start_month = rng.randint(0, 11)
+        end = "Present" if i == 0 else f"{MONTHS[rng.randint(0, 11)]} {year}"
+        experience.append({
+            "job_title": rng.choice(TITLES),
+            "employer": EMPLOYERS[(i + rng.randint(0, len(EMPLOYERS) - 1)) % len(EMPLOYERS)],
+            "start_date": f"{MONTHS[start_month]} {start_year}",
+            "end_date": end,
+            "bullets": [
+                f"{rng.choice(BULLET_VERBS)} {rng.choice(BULLET_OBJECTS)}, "
+                + rng.choice(BULLET_RESULTS).format(n=rng.randint(10, 90))
+                for _ in range(n_bullets)
+            ],
+        })
+        year = start_year
+
+    education = []
+    for i in range(n_edu):
+        end_year = year - 4 * i
+        education.append({
+            "school": rng.choice(SCHOOLS),
+            "degree": rng.choice(DEGREES),
+            "start_date": str(end_year - 4),
+            "end_date": str(end_year),
+        })
+
+    projects = [
+        {"name": name, "technologies": ", ".join(rng.sample(SKILLS, 3))}
+        for name in rng.sample(PROJECT_NAMES, n_projects)
+    ]
+
+    handle = f"{first.lower()}{last.lower()}{rng.randint(1, 99)}"
+    return {
+        "full_name": f"{first} {last}",
+        "email": f"{first.lower()}.{last.lower()}@mailbox.dev",
+        "phone": f"({rng.randint(201, 989)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        "location": f"{city}, {region}",
+        "linkedin": f"linkedin.com/in/{handle}",
+        "summary": "Engineer focused on reliable systems and measurable product impact.",
+        "skills": rng.sample(SKILLS, n_skills),
+        "experience": experience,
+        "education": education,
+        "projects": projects,
+    }
+
+
+def _render_lines(profile: Dict[str, Any], layout: str) -> List[str]:
+    """Render a profile to plain lines in the given layout"""
+    lines = [profile["full_name"]]
+    if layout == "classic":
+        lines.append(f"{profile['email']} | {profile['phone']} | {profile['location']}")
+        lines.append(profile["linkedin"])
+    elif layout == "compact":
+        lines.append(f"{profile['location']} - {profile['phone']} - {profile['email']} - {profile['linkedin']}")
+    else:
+        lines += [f"Email: {profile['email']}", f"Phone: {profile['phone']}",
+                  f"Location: {profile['location']}", f"LinkedIn: {profile['linkedin']}"]
+
+    def heading(title: str) -> str:
+        if layout == "classic":
+            return title.upper()
+        if layout == "labeled":
+            return f"{title}:"
+        return title
+
+    lines += ["", heading("Summary"), profile["summary"], "", heading("Experience")]
+    for job in profile["experience"]:
+        dates = f"{job['start_date']} - {job['end_date']}"
+        if layout == "classic":
+            lines += [job["job_title"], job["employer"], dates]
+        elif layout == "compact":
+            lines.append(f"{job['job_title']} at {job['employer']} ({dates})")
+        else:
+            lines.append(f"{job['employer']} | {job['job_title']} | {dates}")
+        lines += [f"- {bullet}" for bullet in job["bullets"]]
+        lines.append("")
+
+    lines.append(heading("Education"))
+    for edu in profile["education"]:
+        dates = f"{edu['start_date']} - {edu['end_date']}"
+        if layout == "compact":
+            lines.append(f"{edu['degree']}, {edu['school']} ({dates})")
+        else:
+            lines += [edu["school"], f"{edu['degree']}, {dates}"]
+    lines.append("")
+
+    if profile["projects"]:
+        lines.append(heading("Projects"))
+        for project in profile["projects"]:
+            lines.append(f"{project['name']} - built with {project['technologies']}")
+        lines.append("")
+
+    lines += [heading("Skills"), ", ".join(profile["skills"])]
+    return lines
+
+
+CONTACT_LABELS = ("Email:", "Phone:", "Location:", "LinkedIn:")
+
+
+def _write_txt(lines: List[str], layout: str) -> bytes:
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _write_docx(lines: List[str], layout: str) -> bytes:
+    """The labeled layout keeps contact details in the page header and skills in a table,
+    as many real resume templates do"""
+    from docx import Document
+    doc = Document()
+    header = doc.sections[0].header
+    in_skills = False
+    for line in lines:
+        if layout == "labeled" and line.startswith(CONTACT_LABELS):
+            header.add_paragraph(line)
+        elif layout == "labeled" and in_skills:
+            skills = line.split(", ")
+            table = doc.add_table(rows=(len(skills) + 3) // 4, cols=4)
+            for i, skill in enumerate(skills):
+                table.cell(i // 4, i % 4).text = skill
+        else:
+            doc.add_paragraph(line)
+        in_skills = line == "Skills:"
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _write_pdf(lines: List[str], layout: str, lines_per_page: int = 56) -> bytes:
+    """Minimal multi-page PDF using the built-in Helvetica font"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = []  # object bodies, 1-indexed by position + 1
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(b"")  # placeholders, filled once page ids are known
+    pages_id = add(b"")
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for page_lines in pages:
+        ops = ["BT", "/F1 10 Tf", "13 TL", "50 790 Td"]
+        for line in page_lines:
+            ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", errors="replace")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref_at = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref_at))
+    return out.getvalue()
+
+
+WRITERS = {"txt": _write_txt, "docx": _write_docx, "pdf": _write_pdf}
+
+
+def generate_corpus(out_dir: str = DEFAULT_CORPUS_DIR, variants: int = 2, seed: int = 1234) -> List[Dict[str, Any]]:
+    """Write the corpus and its manifest to out_dir. Returns the manifest entries."""
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    manifest = []
+
+    for layout in LAYOUTS:
+        for size in SIZES:
+            for variant in range(variants):
+                stem = f"{layout}-{size}-{variant:02d}"
+                profile = _make_profile(rng, size)
+                lines = _render_lines(profile, layout)
+                with open(os.path.join(out_dir, f"{stem}.json"), "w", encoding="utf-8") as f:
+                    json.dump(profile, f, indent=2)
+
+                for fmt in FORMATS:
+                    try:
+                        data = WRITERS[fmt](lines, layout)
+                    except ImportError:
+                        print(f"Skipping {fmt}: writer dependency not installed")
+                        continue
+                    filename = f"{stem}.{fmt}"
+                    with open(os.path.join(out_dir, filename), "wb") as f:
+                        f.write(data)
+                    manifest.append({
+                        "file": filename, "truth": f"{stem}.json",
+                        "format": fmt, "layout": layout, "size": size, "bytes": len(data),
+                    })
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"seed": seed, "variants": variants, "documents": manifest}, f, indent=2)
+    return manifest
+
+
+def load_corpus(corpus_dir: str = DEFAULT_CORPUS_DIR) -> List[Dict[str, Any]]:
+    """Load manifest entries, generating the default corpus if it is missing"""
+    manifest_path = os.path.join(corpus_dir, "manifest.json")
+    if not os.path.exists(manifest_path):
+        generate_corpus(corpus_dir)
+    with open(manifest_path, encoding="utf-8") as f:
+        documents = json.load(f)["documents"]
+    for doc in documents:
+        with open(os.path.join(corpus_dir, doc["file"]), "rb") as f:
+            doc["content"] = f.read()
+        with open(os.path.join(corpus_dir, doc["truth"]), encoding="utf-8") as f:
+            doc["truth_data"] = json.load(f)
+    return documents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate the synthetic resume corpus")
+    parser.add_argument("--out", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--variants", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+    manifest = generate_corpus(args.out, args.variants, args.seed)
+    print(f"Wrote {len(manifest)} documents to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+CV deletion benchmark.
+
+Builds a CV with a long delta-encoded history (keyframes plus JSON-patch
+rows, as VersionService stores them) and deletes it three ways, each on a
+fresh copy of the database:
+
+  orm      what DELETE /api/cv/{id} used to do: the relationship cascade
+           loads every version and deletes them one by one
+  cascade  one DELETE on cvs, the versions go through ON DELETE CASCADE
+  batched  the background purge: versions in batches, then the CV
+
+Reports wall time and peak Python memory (tracemalloc).
+
+    python -m benchmarks.cv_delete --versions 5000
+"""
+
+import os
+import time
+import shutil
+import random
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base, create_db_engine
+from backend.models import User, CV, CVVersion
+from backend.services.version_service import VersionService, VERSIONED_FIELDS, content_hash
+from backend.utils.json_patch import make_patch
+from benchmarks.version_storage import _initial_cv, _edit
+
+
+def _build(path: str, versions: int, interval: int) -> int:
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="bench@example.org", username="bench", hashed_password="x")
+    session.add(user)
+    session.flush()
+
+    rng = random.Random(5)
+    cv = SimpleNamespace(**{name: None for name in VERSIONED_FIELDS})
+    vars(cv).update(_initial_cv(rng))
+    row = CV(user_id=user.id, version_counter=versions, **_initial_cv(rng))
+    session.add(row)
+    session.flush()
+
+    rows, previous = [], None
+    now = datetime.now(timezone.utc)
+    for number in range(1, versions + 1):
+        state = VersionService.cv_state(cv)
+        version = dict(cv_id=row.id, version_number=number, kind="auto", created_at=now,
+                       created_by_id=user.id, content_hash=content_hash(state),
+                       title=state["title"], template=state["template"])
+        if previous is None or (number - 1) % interval == 0:
+            version.update(state, is_keyframe=True)
+        else:
+            version.update(is_keyframe=False, delta=make_patch(previous, state))
+        rows.append(version)
+        previous = state
+        _edit(cv, rng)
+    for start in range(0, len(rows), 1000):
+        session.execute(insert(CVVersion), rows[start:start + 1000])
+    session.commit()
+    cv_id = row.id
+    session.close()
+    engine.dispose()
+    return cv_id
+
+
+def run(mode: str, path: str, cv_id: int, batch_size: int) -> Dict[str, Any]:
+    engine = create_db_engine(f"sqlite:///{path}")
+    session = sessionmaker(bind=engine)()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    if mode == "orm":
+        cv = session.get(CV, cv_id)
+        for version in list(cv.versions):
+            session.delete(version)
+        session.delete(cv)
+        session.commit()
+    elif mode == "cascade":
+        session.execute(delete(CV).where(CV.id == cv_id))
+        session.commit()
+    else:
+        while True:
+            batch = select(CVVersion.id).where(CVVersion.cv_id == cv_id).limit(batch_size)
+            deleted = session.execute(delete(CVVersion).where(CVVersion.id.in_(batch))).rowcount
+            session.commit()
+            if deleted < batch_size:
+                break
+        session.execute(delete(CV).where(CV.id == cv_id))
+        session.commit()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    left = session.scalar(select(CVVersion.id).where(CVVersion.cv_id == cv_id).limit(1))
+    session.close()
+    engine.dispose()
+    assert left is None, f"{mode} left versions behind"
+    return {"mode": mode, "ms": seconds * 1000, "peak_mib": peak / 2 ** 20}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare ways of deleting a CV with a long version history")
+    parser.add_argument("--versions", type=int, default=5000)
+    parser.add_argument("--interval", type=int, default=20, help="Keyframe interval")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Versions per batch for the batched purge")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="cv-delete-")
+    source = os.path.join(directory, "source.db")
+    cv_id = _build(source, args.versions, args.interval)
+    print(f"1 CV with {args.versions} versions ({os.path.getsize(source) / 2 ** 20:.1f} MiB database)\n")
+    print("mode         time ms   peak MiB")
+    for mode in ("orm", "cascade", "batched"):
+        path = os.path.join(directory, f"{mode}.db")
+        shutil.copyfile(source, path)
+        r = run(mode, path, cv_id, args.batch_size)
+        print(f"{r['mode']:<9}{r['ms']:>11.1f}{r['peak_mib']:>11.2f}")
+    shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
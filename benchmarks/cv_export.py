@@ -0,0 +1,172 @@
+"""
+CV export/import benchmark.
+
+Seeds a user with CVs and delta-encoded histories, then backs them up two
+ways: the way a client had to before (GET each CV, page through its
+versions, GET every version detail) and through GET /api/cv/export
+(NDJSON, plain and gzipped). Reports requests, bytes, wall time and peak
+Python memory (tracemalloc). TestClient buffers whole response bodies, so the
+export is driven through the ASGI app directly and its chunks are counted
+and dropped as they arrive. The gzipped file is then loaded into a second
+account through POST /api/cv/import.
+
+    python -m benchmarks.cv_export --cvs 50 --versions 100
+"""
+
+import os
+import time
+import asyncio
+import shutil
+import random
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Tuple
+from urllib.parse import urlencode
+
+# The app reads its settings at import time
+_directory = tempfile.mkdtemp(prefix="cv-export-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_directory}/bench.db")
+os.environ.setdefault("PARSE_CACHE_DIR", f"{_directory}/parse_cache")
+os.environ.setdefault("VERSION_COMPACTION_INTERVAL_SECONDS", "0")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from backend.main import app
+from backend.api.cv import limiter
+from backend.database import SessionLocal
+from backend.models import CV, CVVersion
+from backend.services.version_service import VersionService, VERSIONED_FIELDS, content_hash
+from benchmarks.version_storage import _initial_cv, _edit
+
+
+def _login(client: TestClient, username: str) -> None:
+    client.post("/api/auth/register", json={"email": f"{username}@example.org", "username": username, "password": "Passw0rdX"})
+    token = client.post("/api/auth/login", json={"username_or_email": username, "password": "Passw0rdX"}).json()["access_token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+
+
+async def _drain(client: TestClient, path: str, params: dict, keep: bool) -> Tuple[int, bytes]:
+    """GET a streaming endpoint through the ASGI app: (body size, body if `keep` else b"")"""
+    body, size = [], 0
+    disconnected = asyncio.Event()
+    requested = False
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": urlencode(params).encode(), "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"authorization", client.headers["Authorization"].encode())],
+        "client": ("testclient", 50000), "server": ("testserver", 80),
+    }
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client stays connected until the response is complete
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal size
+        if message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+            if keep:
+                body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    disconnected.set()
+    return size, b"".join(body)
+
+
+def _seed(user_id: int, cvs: int, versions: int) -> None:
+    """CVs with `versions` versions each, encoded the way VersionService stores them"""
+    rng = random.Random(11)
+    session = SessionLocal()
+    service = VersionService(session)
+    now = datetime.now(timezone.utc)
+    for _ in range(cvs):
+        cv = SimpleNamespace(**{name: None for name in VERSIONED_FIELDS})
+        vars(cv).update(_initial_cv(rng))
+        rows, previous, since_keyframe = [], None, 0
+        for number in range(1, versions + 1):
+            state = VersionService.cv_state(cv)
+            stored = service.encode_state(state, previous, since_keyframe)
+            since_keyframe = 1 if stored["is_keyframe"] else since_keyframe + 1
+            rows.append(dict(stored, version_number=number, kind="auto", created_at=now,
+                             created_by_id=user_id, content_hash=content_hash(state)))
+            previous = state
+            _edit(cv, rng)
+        row = CV(user_id=user_id, version_counter=versions, **VersionService.cv_state(cv))
+        session.add(row)
+        session.flush()
+        session.execute(insert(CVVersion), [dict(version, cv_id=row.id) for version in rows])
+    session.commit()
+    session.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-CV backups with the streaming export")
+    parser.add_argument("--cvs", type=int, default=50)
+    parser.add_argument("--versions", type=int, default=100, help="Versions per CV")
+    args = parser.parse_args()
+
+    limiter.enabled = False
+    client = TestClient(app)
+    client.__enter__()
+    _login(client, "bench")
+    user_id = client.get("/api/auth/me").json()["id"]
+    _seed(user_id, args.cvs, args.versions)
+
+    print(f"{args.cvs} CVs x {args.versions} versions\n")
+    print("approach              requests      MiB   seconds   peak MiB")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    requests, size = 1, 0
+    for cv in client.get("/api/cv/summary", params={"limit": 100}).json():
+        url = f"/api/cv/{cv['id']}"
+        size += len(client.get(url).content)
+        before = None
+        while True:
+            page = client.get(f"{url}/versions", params={"limit": 200, **({"before_version": before} if before else {})})
+            requests, size = requests + 2, size + len(page.content)
+            if not page.json():
+                break
+            for version in page.json():
+                size += len(client.get(f"{url}/versions/{version['id']}").content)
+                requests += 1
+            before = page.json()[-1]["version_number"]
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{'per-CV requests':<20}{requests:>10}{size / 2 ** 20:>9.1f}{seconds:>10.2f}{peak / 2 ** 20:>11.1f}")
+
+    archive = b""
+    for name, params in (("export ndjson", {"versions": "true"}), ("export gzip", {"versions": "true", "format": "gzip"})):
+        gzipped = "format" in params
+        tracemalloc.start()
+        start = time.perf_counter()
+        size, body = client.portal.call(_drain, client, "/api/cv/export", params, gzipped)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - len(body)
+        tracemalloc.stop()
+        if gzipped:
+            archive = body
+        print(f"{name:<20}{1:>10}{size / 2 ** 20:>9.1f}{seconds:>10.2f}{peak / 2 ** 20:>11.1f}")
+
+    _login(client, "restore")
+    start = time.perf_counter()
+    result = client.post("/api/cv/import", files={"file": ("cvs.ndjson.gz", archive)}).json()
+    print(f"\nimport gzip: {result['imported_cvs']} CVs, {result['imported_versions']} versions in "
+          f"{time.perf_counter() - start:.2f}s")
+
+    client.__exit__(None, None, None)
+    shutil.rmtree(_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
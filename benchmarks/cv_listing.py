@@ -0,0 +1,129 @@
+"""
+Dashboard CV listing benchmark.
+
+Creates users with many CVs (full content, a few versions each) and
+compares the old dashboard query (every full CV of the user, serialized
+as CVResponse) with one page of the summary query behind
+GET /api/cv/summary. Also prints the summary query plan to show the
+(user_id, updated_at) index is used.
+
+    python -m benchmarks.cv_listing --users 20 --cvs 200
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.models import User, CV, CVVersion
+from backend.api.cv_schemas import CVResponse, CVSummary
+from benchmarks.version_storage import _initial_cv
+
+
+def _fill(session, users: int, cvs: int, versions: int) -> int:
+    """Returns the id of the user to list"""
+    state = _initial_cv(random.Random(1))
+    now = datetime.utcnow()
+    for u in range(users):
+        user = User(email=f"user{u}@example.org", username=f"user{u}", hashed_password="x")
+        session.add(user)
+        session.flush()
+        cv_rows = [
+            dict(user_id=user.id, created_at=now - timedelta(days=i), updated_at=now - timedelta(hours=i),
+                 version_counter=versions, **state)
+            for i in range(cvs)
+        ]
+        session.execute(insert(CV), cv_rows)
+    session.flush()
+    cv_ids = [row[0] for row in session.execute(text("SELECT id FROM cvs"))]
+    version_rows = [
+        dict(cv_id=cv_id, version_number=n, kind="auto", is_keyframe=True, created_at=now,
+             title=state["title"], template=state["template"])
+        for cv_id in cv_ids for n in range(1, versions + 1)
+    ]
+    for start in range(0, len(version_rows), 5000):
+        session.execute(insert(CVVersion), version_rows[start:start + 5000])
+    session.commit()
+    return session.query(User.id).filter(User.username == f"user{users // 2}").scalar()
+
+
+def _time(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.fmean(timings) * 1000
+
+
+def run(users: int, cvs: int, versions: int, page: int, repeat: int) -> Dict[str, Any]:
+    directory = tempfile.mkdtemp(prefix="cv-listing-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    user_id = _fill(session, users, cvs, versions)
+
+    def legacy():
+        session.expunge_all()
+        rows = session.query(CV).filter(CV.user_id == user_id).all()
+        return [CVResponse.model_validate(row).model_dump_json() for row in rows]
+
+    version_count = select(func.count(CVVersion.id)).where(
+        CVVersion.cv_id == CV.id
+    ).correlate(CV).scalar_subquery().label("version_count")
+    summary_query = session.query(
+        CV.id, CV.title, CV.template, CV.full_name, CV.created_at, CV.updated_at,
+        version_count
+    ).filter(
+        CV.user_id == user_id
+    ).order_by(CV.updated_at.desc(), CV.id.desc()).limit(page + 1)
+
+    def summary():
+        rows = summary_query.all()[:page]
+        session.query(func.count(CV.id)).filter(CV.user_id == user_id).scalar()
+        return [CVSummary.model_validate(row).model_dump_json() for row in rows]
+
+    legacy_bytes = sum(len(item) for item in legacy())
+    summary_bytes = sum(len(item) for item in summary())
+    compiled = summary_query.statement.compile(engine, compile_kwargs={"literal_binds": True})
+    plan = [row[-1] for row in session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+    result = {
+        "legacy_ms": _time(legacy, repeat), "summary_ms": _time(summary, repeat),
+        "legacy_bytes": legacy_bytes, "summary_bytes": summary_bytes, "plan": plan,
+    }
+    session.close()
+    engine.dispose()
+    os.remove(path)
+    os.rmdir(directory)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the full CV list with the dashboard summary")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--cvs", type=int, default=200, help="CVs per user")
+    parser.add_argument("--versions", type=int, default=5, help="Versions per CV")
+    parser.add_argument("--page", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    r = run(args.users, args.cvs, args.versions, args.page, args.repeat)
+    print(f"{args.users} users x {args.cvs} CVs x {args.versions} versions, summary page size {args.page}\n")
+    print(f"full list    {r['legacy_ms']:>9.2f} ms  {r['legacy_bytes'] / 1024:>9.1f} KiB")
+    print(f"summary page {r['summary_ms']:>9.2f} ms  {r['summary_bytes'] / 1024:>9.1f} KiB")
+    print("\nsummary query plan:")
+    for step in r["plan"]:
+        print(f"  {step}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Partial CV update benchmark.
+
+Replays one-bullet editor saves against a CV with large sections through
+the API, once as full PUT /api/cv/{id} bodies (what the editor sends) and
+once as JSON-patch PATCH /api/cv/{id} requests, and reports request size,
+request latency and the time spent validating the payload.
+
+    python -m benchmarks.cv_patch --edits 300 --items 15
+"""
+
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+
+# The app reads its settings at import time
+_directory = tempfile.mkdtemp(prefix="cv-patch-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_directory}/bench.db")
+os.environ.setdefault("PARSE_CACHE_DIR", f"{_directory}/parse_cache")
+os.environ.setdefault("VERSION_COMPACTION_INTERVAL_SECONDS", "0")
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.api.cv import SECTION_ITEM_MODELS, _validate_patched_fields
+from backend.api.cv_schemas import CVUpdate
+from benchmarks.version_storage import _large_cv
+
+PATCH_HEADERS = {"Content-Type": "application/json-patch+json"}
+
+
+def _time(fn, repeat: int = 200) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare full PUT saves with JSON-patch PATCH saves")
+    parser.add_argument("--edits", type=int, default=300)
+    parser.add_argument("--items", type=int, default=15, help="Items per experience/projects section")
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    client.__enter__()
+    client.post("/api/auth/register", json={"email": "bench@example.org", "username": "bench", "password": "Passw0rdX"})
+    token = client.post("/api/auth/login", json={"username_or_email": "bench", "password": "Passw0rdX"}).json()["access_token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+
+    state = _large_cv(args.items)
+    results = {}
+    for mode in ("put", "patch"):
+        cv = client.post("/api/cv/", json=state).json()
+        url = f"/api/cv/{cv['id']}"
+        experience = [dict(item) for item in cv["experience"]]
+        rng = random.Random(11)
+        sizes, latencies = [], []
+        for edit in range(args.edits):
+            index = rng.randrange(len(experience))
+            experience[index]["description"] += f"\n- Edit {edit}"
+            if mode == "put":
+                body = json.dumps({**state, "experience": experience})
+                send = lambda: client.put(url, content=body, headers={"Content-Type": "application/json"})
+            else:
+                body = json.dumps([{"op": "replace", "path": f"/experience/{index}/description",
+                                    "value": experience[index]["description"]}])
+                send = lambda: client.patch(url, content=body, headers=PATCH_HEADERS)
+            start = time.perf_counter()
+            response = send()
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+            sizes.append(len(body))
+        assert client.get(url).json()["experience"] == experience
+        results[mode] = (statistics.fmean(sizes), statistics.fmean(latencies) * 1000)
+
+    # Payload validation alone
+    stored = {name: [model.model_validate(item).model_dump() for item in state[name]]
+              for name, model in SECTION_ITEM_MODELS.items() if name in state}
+    full = {**state, **stored}
+    edited = [dict(item) for item in stored["experience"]]
+    edited[3]["description"] += "\n- One more bullet"
+    validate_put = _time(lambda: CVUpdate.model_validate(full))
+    validate_patch = _time(lambda: _validate_patched_fields(
+        {"experience": stored["experience"]}, {"experience": edited}
+    ))
+
+    print(f"{args.edits} one-bullet edits, {args.items} experience/project items, {args.items * 3} skills\n")
+    print("method   request bytes   latency ms   validation ms")
+    print(f"PUT   {results['put'][0]:>16.0f}{results['put'][1]:>13.2f}{validate_put:>16.3f}")
+    print(f"PATCH {results['patch'][0]:>16.0f}{results['patch'][1]:>13.2f}{validate_patch:>16.3f}")
+
+    client.__exit__(None, None, None)
+    shutil.rmtree(_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
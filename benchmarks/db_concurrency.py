@@ -0,0 +1,132 @@
+"""
+Concurrent read/write database benchmark.
+
+Reader threads load full CVs (GET /api/cv/{id}) while writer threads save
+edits and commit (PUT /api/cv/{id}) against a file-backed SQLite database,
+first with a plain engine (rollback journal, default pragmas) and then with
+the tuned engine from create_db_engine (WAL, synchronous=NORMAL, cache,
+mmap, busy timeout). Reports throughput, read latency and lock errors.
+
+    python -m benchmarks.db_concurrency --readers 8 --writers 2 --seconds 5
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import threading
+import statistics
+from typing import Any, Dict, List
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base, create_db_engine
+from backend.models import User, CV
+from benchmarks.version_storage import _initial_cv
+
+
+def run(tuned: bool, readers: int, writers: int, seconds: float, cvs: int) -> Dict[str, Any]:
+    directory = tempfile.mkdtemp(prefix="db-concurrency-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_db_engine(f"sqlite:///{path}", tuned=tuned)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+
+    session = factory()
+    user = User(email="bench@example.org", username="bench", hashed_password="x")
+    session.add(user)
+    session.flush()
+    state = _initial_cv(random.Random(2))
+    session.add_all([CV(user_id=user.id, **state) for _ in range(cvs)])
+    session.commit()
+    cv_ids = [cv_id for (cv_id,) in session.query(CV.id)]
+    session.close()
+
+    stop = threading.Event()
+    read_latencies: List[float] = []
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def reader(seed: int) -> None:
+        rng = random.Random(seed)
+        latencies, reads, errors = [], 0, 0
+        while not stop.is_set():
+            db = factory()
+            start = time.perf_counter()
+            try:
+                db.query(CV).filter(CV.id == rng.choice(cv_ids)).first()
+                latencies.append(time.perf_counter() - start)
+                reads += 1
+            except OperationalError:
+                errors += 1
+            finally:
+                db.close()
+        with lock:
+            read_latencies.extend(latencies)
+            counts["reads"] += reads
+            counts["errors"] += errors
+
+    def writer(seed: int) -> None:
+        rng = random.Random(seed)
+        writes, errors = 0, 0
+        while not stop.is_set():
+            db = factory()
+            try:
+                cv = db.query(CV).filter(CV.id == rng.choice(cv_ids)).first()
+                cv.summary = f"Revision {rng.randint(0, 10 ** 6)}. " + state["summary"]
+                db.commit()
+                writes += 1
+            except OperationalError:
+                db.rollback()
+                errors += 1
+            finally:
+                db.close()
+        with lock:
+            counts["writes"] += writes
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(100 + i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    engine.dispose()
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+    ordered = sorted(read_latencies) or [0.0]
+    return {
+        "mode": "tuned" if tuned else "plain",
+        "reads_per_s": counts["reads"] / seconds,
+        "writes_per_s": counts["writes"] / seconds,
+        "read_mean_ms": statistics.fmean(ordered) * 1000,
+        "read_p99_ms": ordered[int(len(ordered) * 0.99)] * 1000,
+        "errors": counts["errors"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare plain and tuned SQLite under concurrent reads/writes")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--cvs", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers + {args.writers} writers for {args.seconds}s over {args.cvs} CVs\n")
+    print("engine   reads/s  writes/s  read mean ms  read p99 ms  lock errors")
+    for tuned in (False, True):
+        r = run(tuned, args.readers, args.writers, args.seconds, args.cvs)
+        print(f"{r['mode']:<6}{r['reads_per_s']:>10.0f}{r['writes_per_s']:>10.0f}{r['read_mean_ms']:>14.2f}"
+              f"{r['read_p99_ms']:>13.2f}{r['errors']:>13}")
+
+
+if __name__ == "__main__":
+    main()
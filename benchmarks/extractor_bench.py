@@ -0,0 +1,113 @@
+"""
+Text extraction backend comparison.
+
+Runs every registered backend on every corpus document of the formats it
+supports, then recommends, per format, the fastest backend whose output
+passes the quality check on the whole corpus.
+
+    python -m benchmarks.extractor_bench
+"""
+
+import os
+import json
+import argparse
+import statistics
+import tracemalloc
+from collections import defaultdict
+from io import BytesIO
+from typing import Dict, List, Any
+
+from backend.services.text_extractors import extractor_registry, is_acceptable, text_quality
+from benchmarks.corpus import DEFAULT_CORPUS_DIR, load_corpus
+from benchmarks.parser_bench import RESULTS_DIR, _git_commit
+
+ORDER_SETTINGS = {"pdf": "PDF_EXTRACTORS", "docx": "DOCX_EXTRACTORS"}
+
+
+def benchmark_backends(documents: List[Dict[str, Any]], repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    """Per-format, per-backend latency, memory and quality over the corpus"""
+    by_format = defaultdict(list)
+    for doc in documents:
+        by_format[doc["format"]].append(doc)
+
+    report = {}
+    for fmt, docs in by_format.items():
+        report[fmt] = {}
+        for backend in extractor_registry.backends_for(fmt):
+            samples, accepted, qualities, peak = [], 0, [], 0
+            try:
+                for run in range(repeat):
+                    for doc in docs:
+                        text, seconds = extractor_registry.run_backend(backend, BytesIO(doc["content"]))
+                        samples.append(seconds)
+                        if run == 0:
+                            accepted += is_acceptable(text)
+                            qualities.append(text_quality(text))
+                tracemalloc.start()
+                for doc in docs:
+                    tracemalloc.reset_peak()
+                    extractor_registry.run_backend(backend, BytesIO(doc["content"]))
+                    peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            except ImportError:
+                report[fmt][backend.name] = {"available": False}
+                continue
+            report[fmt][backend.name] = {
+                "available": True,
+                "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+                "p95_ms": round(sorted(samples)[int(len(samples) * 0.95) - 1] * 1000, 3),
+                "peak_memory_bytes": peak,
+                "acceptance_rate": round(accepted / len(docs), 4),
+                "mean_quality": round(statistics.fmean(qualities), 4),
+            }
+    return report
+
+
+def recommend(report: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Fastest fully-acceptable backends first, the rest as fallbacks by quality"""
+    orders = {}
+    for fmt, backends in report.items():
+        available = {name: stats for name, stats in backends.items() if stats["available"]}
+        good = sorted((n for n, s in available.items() if s["acceptance_rate"] == 1.0),
+                      key=lambda n: available[n]["mean_ms"])
+        rest = sorted((n for n in available if n not in good),
+                      key=lambda n: (-available[n]["acceptance_rate"], available[n]["mean_ms"]))
+        unavailable = [n for n in backends if n not in available]
+        orders[fmt] = good + rest + unavailable
+    return orders
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare text extraction backends on the corpus")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/extractors-<commit>.json)")
+    args = parser.parse_args()
+
+    report = benchmark_backends(load_corpus(args.corpus), repeat=args.repeat)
+    orders = recommend(report)
+
+    for fmt, backends in report.items():
+        print(f"\n[{fmt}]  backend          mean ms   p95 ms   peak KiB  accepted  quality")
+        for name, stats in backends.items():
+            if not stats["available"]:
+                print(f"        {name:<16} not installed")
+                continue
+            print(f"        {name:<16}{stats['mean_ms']:>8.3f} {stats['p95_ms']:>8.3f} "
+                  f"{stats['peak_memory_bytes'] / 1024:>10.1f}  {stats['acceptance_rate']:>7.0%}  {stats['mean_quality']:.3f}")
+
+    print("\nRecommended orderings:")
+    for fmt, order in orders.items():
+        setting = ORDER_SETTINGS.get(fmt)
+        if setting and order:
+            print(f"  {setting}={','.join(order)}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"extractors-{_git_commit()}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"commit": _git_commit(), "backends": report, "recommended": orders}, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+DocumentParser speed and accuracy benchmark.
+
+Runs every document of the synthetic corpus through DocumentParser and
+reports per-stage timings, throughput, peak memory and field accuracy
+against ground truth. Results are written as JSON (one file per commit) so
+runs can be compared, and --compare flags regressions against a baseline.
+
+    python -m benchmarks.parser_bench
+    python -m benchmarks.parser_bench --compare benchmarks/results/parser-<sha>.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List, Any
+
+from backend.services.document_parser import DocumentParser, PARSER_VERSION
+from benchmarks.corpus import DEFAULT_CORPUS_DIR, load_corpus
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "local"
+
+
+def _digits(value: str) -> str:
+    return re.sub(r"\D", "", value or "")
+
+
+def _norm(value: str) -> str:
+    return (value or "").strip().lower()
+
+
+def score_fields(parsed, truth: Dict[str, Any]) -> Dict[str, float]:
+    """Per-field accuracy of one parse result against ground truth (0.0 - 1.0)"""
+    scores = {
+        "full_name": float(_norm(parsed.full_name) == _norm(truth["full_name"])),
+        "email": float(_norm(parsed.email) == _norm(truth["email"])),
+        "phone": float(_digits(parsed.phone)[-10:] == _digits(truth["phone"])[-10:]),
+        "location": float(_norm(parsed.location) == _norm(truth["location"])),
+        "linkedin": float(_norm(parsed.linkedin) == _norm(truth["linkedin"])),
+    }
+
+    found = {_norm(skill.get("name")) for skill in parsed.skills}
+    expected = {_norm(skill) for skill in truth["skills"]}
+    hits = len(found & expected)
+    scores["skills_recall"] = hits / len(expected) if expected else 1.0
+    scores["skills_precision"] = hits / len(found) if found else 0.0
+
+    parsed_jobs = {(_norm(e.get("employer")), _norm(e.get("job_title"))) for e in parsed.experience}
+    truth_jobs = [(_norm(e["employer"]), _norm(e["job_title"])) for e in truth["experience"]]
+    scores["experience"] = sum(job in parsed_jobs for job in truth_jobs) / len(truth_jobs) if truth_jobs else 1.0
+
+    parsed_schools = {_norm(e.get("school")) for e in parsed.education}
+    truth_schools = [_norm(e["school"]) for e in truth["education"]]
+    scores["education"] = sum(s in parsed_schools for s in truth_schools) / len(truth_schools) if truth_schools else 1.0
+    return scores
+
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4),
+        "total_ms": round(sum(ordered) * 1000, 3),
+    }
+
+
+def run_benchmark(documents: List[Dict[str, Any]], repeat: int = 3) -> Dict[str, Any]:
+    """Time, profile and score the parser over the corpus"""
+    stage_samples = defaultdict(list)
+    per_format = defaultdict(list)
+    accuracy = defaultdict(list)
+    fallbacks = 0
+
+    wall_start = time.perf_counter()
+    for run in range(repeat):
+        for doc in documents:
+            parser = DocumentParser()
+            start = time.perf_counter()
+            parsed = parser.parse_document(doc["content"], doc["file"])
+            elapsed = time.perf_counter() - start
+
+            per_format[doc["format"]].append(elapsed)
+            stage_samples["total"].append(elapsed)
+            for stage, seconds in parser.stage_timings.items():
+                stage_samples[stage].append(seconds)
+
+            if run == 0:
+                for field_name, score in score_fields(parsed, doc["truth_data"]).items():
+                    accuracy[field_name].append(score)
+                fallbacks += parser.needs_ai_fallback(parsed)
+    wall = time.perf_counter() - wall_start
+
+    # Separate pass for memory so tracemalloc overhead doesn't skew the timings
+    tracemalloc.start()
+    per_doc_peak = 0
+    for doc in documents:
+        tracemalloc.reset_peak()
+        DocumentParser().parse_document(doc["content"], doc["file"])
+        per_doc_peak = max(per_doc_peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    return {
+        "commit": _git_commit(),
+        "parser_version": PARSER_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "documents": len(documents),
+        "repeat": repeat,
+        "throughput_docs_per_sec": round(len(documents) * repeat / wall, 2),
+        "stages": {stage: _summarize(samples) for stage, samples in stage_samples.items()},
+        "by_format": {fmt: _summarize(samples) for fmt, samples in per_format.items()},
+        "peak_memory_bytes": per_doc_peak,
+        "accuracy": {name: round(statistics.fmean(values), 4) for name, values in accuracy.items()},
+        "ai_fallback_rate": round(fallbacks / len(documents), 4) if documents else 0.0,
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.15) -> List[str]:
+    """Return human-readable regressions of current against baseline"""
+    regressions = []
+    for stage, stats in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        # Ignore sub-50us stages; their relative noise dwarfs any real change
+        if before and before["mean_ms"] > 0.05 and stats["mean_ms"] > before["mean_ms"] * (1 + threshold):
+            regressions.append(f"stage '{stage}' mean {before['mean_ms']:.3f}ms -> {stats['mean_ms']:.3f}ms")
+
+    if current["throughput_docs_per_sec"] < baseline["throughput_docs_per_sec"] * (1 - threshold):
+        regressions.append(
+            f"throughput {baseline['throughput_docs_per_sec']} -> {current['throughput_docs_per_sec']} docs/sec"
+        )
+    if current["peak_memory_bytes"] > baseline["peak_memory_bytes"] * (1 + threshold):
+        regressions.append(f"peak memory {baseline['peak_memory_bytes']} -> {current['peak_memory_bytes']} bytes")
+
+    for name, value in current["accuracy"].items():
+        before = baseline.get("accuracy", {}).get(name)
+        if before is not None and value < before - 0.01:
+            regressions.append(f"accuracy '{name}' {before:.3f} -> {value:.3f}")
+    return regressions
+
+
+def _print_report(results: Dict[str, Any]) -> None:
+    print(f"commit {results['commit']}  parser v{results['parser_version']}  "
+          f"{results['documents']} docs x {results['repeat']}")
+    print(f"throughput: {results['throughput_docs_per_sec']} docs/sec   "
+          f"peak memory/doc: {results['peak_memory_bytes'] / 1024:.1f} KiB   "
+          f"AI fallback rate: {results['ai_fallback_rate']:.0%}")
+    print("\nstage            mean ms     p95 ms")
+    for stage, stats in results["stages"].items():
+        print(f"  {stage:<14}{stats['mean_ms']:>8.3f}   {stats['p95_ms']:>8.3f}")
+    print("\nformat           mean ms     p95 ms")
+    for fmt, stats in results["by_format"].items():
+        print(f"  {fmt:<14}{stats['mean_ms']:>8.3f}   {stats['p95_ms']:>8.3f}")
+    print("\naccuracy")
+    for name, value in results["accuracy"].items():
+        print(f"  {name:<18}{value:.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark DocumentParser on the synthetic corpus")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/parser-<commit>.json)")
+    parser.add_argument("--compare", help="Baseline results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative slowdown treated as a regression")
+    args = parser.parse_args()
+
+    results = run_benchmark(load_corpus(args.corpus), repeat=args.repeat)
+    _print_report(results)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"parser-{results['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {baseline.get('commit', args.compare)}:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {baseline.get('commit', args.compare)}")
+
+
+if __name__ == "__main__":
+    main()
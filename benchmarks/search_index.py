@@ -0,0 +1,163 @@
+"""
+CV search benchmark.
+
+Seeds several users' CVs with long edit histories (stored and indexed the
+way VersionService does it) plus one user with a single short CV, then
+times SearchIndex.search through the FTS5 index and through the LIKE
+fallback for a rare word, a common word, two words and a prefix, for one
+of the large users and for the small one, and the extra cost search
+indexing adds to each snapshot write. A search should cost what the
+caller's own documents cost, not what the whole index costs.
+
+    python -m benchmarks.search_index --users 20 --cvs 25 --versions 100
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.database.config import settings
+from backend.models import User, CV, CVVersion
+from backend.services import search_index
+from backend.services.search_index import SearchIndex, create_fts_index
+from backend.services.version_service import VersionService, VERSIONED_FIELDS, content_hash
+from benchmarks.column_compression import _random_cv
+from benchmarks.version_storage import _edit
+
+QUERIES = (
+    ("rare word", "zeppelin"),
+    ("common word", "python"),
+    ("two words", "kubernetes latency"),
+    ("prefix", "perf"),
+)
+
+
+def _seed(session, user_id: int, cvs: int, versions: int, rng: random.Random) -> None:
+    service = VersionService(session)
+    index = SearchIndex(session)
+    now = datetime.now(timezone.utc)
+    for number in range(cvs):
+        cv = SimpleNamespace(**{name: None for name in VERSIONED_FIELDS})
+        vars(cv).update(_random_cv(rng))
+        rows, states, previous, since_keyframe = [], [], None, 0
+        for version in range(1, versions + 1):
+            state = VersionService.cv_state(cv)
+            stored = service.encode_state(state, previous, since_keyframe)
+            since_keyframe = 1 if stored["is_keyframe"] else since_keyframe + 1
+            rows.append(dict(stored, version_number=version, kind="auto", created_at=now,
+                             created_by_id=user_id, content_hash=content_hash(state)))
+            states.append((state, previous))
+            previous = state
+            _edit(cv, rng)
+            # A handful of versions add a bullet with a word nothing else uses
+            if number % 50 == 0 and version == versions // 2:
+                cv.experience = [dict(cv.experience[0], description=cv.experience[0]["description"] + "\n- Zeppelin migration lead"),
+                                 *cv.experience[1:]]
+        row = CV(user_id=user_id, version_counter=versions, **VersionService.cv_state(cv))
+        session.add(row)
+        session.flush()
+        index.index_cv(row)
+        version_ids = session.execute(
+            insert(CVVersion).returning(CVVersion.id, sort_by_parameter_order=True),
+            [dict(version, cv_id=row.id) for version in rows]
+        ).scalars().all()
+        index.index_versions(user_id, [
+            (row.id, version_id, state, previous) for version_id, (state, previous) in zip(version_ids, states)
+        ])
+        session.commit()
+
+
+def _add_user(session, name: str) -> int:
+    user = User(email=f"{name}@example.org", username=name, hashed_password="x")
+    session.add(user)
+    session.commit()
+    return user.id
+
+
+def _time_search(session, user_id: int, query: str, repeat: int):
+    index = SearchIndex(session)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = index.search(user_id, query, limit=20)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, len(results)
+
+
+def _snapshot_ms(session, user_id: int, snapshots: int, rng: random.Random) -> float:
+    service = VersionService(session)
+    cv = CV(user_id=user_id, **_random_cv(rng))
+    session.add(cv)
+    session.flush()
+    start = time.perf_counter()
+    for _ in range(snapshots):
+        service.create_snapshot(cv, user_id)
+        _edit(cv, rng)
+        session.commit()
+    return (time.perf_counter() - start) / snapshots * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare FTS5 and LIKE search over CV version history")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--cvs", type=int, default=25, help="CVs per user")
+    parser.add_argument("--versions", type=int, default=100, help="Versions per CV")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--snapshots", type=int, default=300)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="cv-search-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        if not create_fts_index(conn):
+            print("SQLite has no FTS5 support; only the LIKE fallback can be measured\n")
+    session = sessionmaker(bind=engine)()
+
+    rng = random.Random(5)
+    start = time.perf_counter()
+    user_ids = []
+    for number in range(args.users):
+        user_ids.append(_add_user(session, f"bench{number}"))
+        _seed(session, user_ids[-1], args.cvs, args.versions, rng)
+    small_user_id = _add_user(session, "small")
+    _seed(session, small_user_id, 1, 10, rng)
+    documents = session.execute(text("SELECT COUNT(*) FROM cv_search_documents")).scalar()
+    print(f"{args.users} users x {args.cvs} CVs x {args.versions} versions, plus one user with 1 CV x 10 versions: "
+          f"{documents} search documents, seeded in {time.perf_counter() - start:.1f}s\n")
+
+    key = str(engine.url)
+    for label, user_id in (("large user", user_ids[0]), ("small user", small_user_id)):
+        print(f"{label:<32}  FTS5 ms  hits    LIKE ms  hits")
+        for name, query in QUERIES:
+            search_index._fts_available.pop(key, None)
+            fts_ms, fts_hits = _time_search(session, user_id, query, args.repeat)
+            search_index._fts_available[key] = False
+            like_ms, like_hits = _time_search(session, user_id, query, args.repeat)
+            print(f"{name + ' (' + query + ')':<32}{fts_ms:>10.2f}{fts_hits:>6}{like_ms:>11.2f}{like_hits:>6}")
+        print()
+    search_index._fts_available.pop(key, None)
+
+    print("snapshot write                    ms/snapshot")
+    for name, enabled in (("versions not indexed", False), ("versions indexed", True)):
+        settings.SEARCH_INDEX_VERSIONS = enabled
+        print(f"{name:<32}{_snapshot_ms(session, user_ids[0], args.snapshots, rng):>12.3f}")
+
+    session.close()
+    engine.dispose()
+    os.remove(path)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
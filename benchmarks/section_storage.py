@@ -0,0 +1,146 @@
+"""
+CV section storage benchmark.
+
+Stores the same CV in the JSON-column layout and in the normalized items
+layout (cv_sections/cv_items, services.section_store), then runs typical
+edits through SectionStore the way the API saves them: change one bullet,
+append a skill, add a job at the top, move a project, remove a project.
+Reports write latency and the bytes of SQL parameters sent per edit, plus
+the cost of loading the whole CV. Version snapshots are left out; they
+are the same in both layouts.
+
+    python -m benchmarks.section_storage --items 10 --edits 200
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.database.config import settings
+from backend.models import User, CV
+from backend.services.section_store import LAYOUT_ITEMS, LAYOUT_JSON, SectionStore
+from benchmarks.version_storage import _large_cv
+
+
+def _edit_bullet(cv: CV, rng: random.Random) -> None:
+    experience = list(cv.experience)
+    index = rng.randrange(len(experience))
+    experience[index] = dict(experience[index], description=experience[index]["description"] + f"\n- Bullet {rng.random()}")
+    cv.experience = experience
+
+
+def _append_skill(cv: CV, rng: random.Random) -> None:
+    cv.skills = list(cv.skills) + [{"name": f"Skill {rng.random()}", "level": "advanced"}]
+
+
+def _prepend_job(cv: CV, rng: random.Random) -> None:
+    cv.experience = [dict(cv.experience[0], job_title=f"New role {rng.random()}")] + list(cv.experience)
+
+
+def _move_project(cv: CV, rng: random.Random) -> None:
+    projects = list(cv.projects)
+    projects.insert(rng.randrange(len(projects)), projects.pop(rng.randrange(len(projects))))
+    cv.projects = projects
+
+
+def _remove_project(cv: CV, rng: random.Random) -> None:
+    projects = list(cv.projects)
+    projects.pop(rng.randrange(len(projects)))
+    # Keep the section from running dry over many edits
+    projects.append(dict(projects[0], name=f"Project {rng.random()}"))
+    cv.projects = projects
+
+
+WORKLOADS: List[Tuple[str, Callable[[CV, random.Random], None]]] = [
+    ("edit one bullet", _edit_bullet),
+    ("append a skill", _append_skill),
+    ("add job at top", _prepend_job),
+    ("move a project", _move_project),
+    ("replace a project", _remove_project),
+]
+
+
+def _parameter_bytes(parameters: Any) -> int:
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (list, tuple, dict)):
+        return sum(_parameter_bytes(row) for row in parameters)
+    values = parameters.values() if isinstance(parameters, dict) else parameters or ()
+    return sum(len(value) for value in values if isinstance(value, (str, bytes, memoryview)))
+
+
+def run(layout: str, items: int, edits: int) -> Dict[str, Tuple[float, float]]:
+    settings.CV_SECTION_STORAGE = layout
+    directory = tempfile.mkdtemp(prefix="section-storage-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    written = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        written[0] += _parameter_bytes(parameters)
+
+    session = sessionmaker(bind=engine)()
+    store = SectionStore(session)
+    user = User(email="bench@example.org", username="bench", hashed_password="x")
+    session.add(user)
+    session.flush()
+    cv = CV(user_id=user.id, **_large_cv(items))
+    session.add(cv)
+    store.save(cv)
+    session.commit()
+    cv_id = cv.id
+
+    results = {}
+    rng = random.Random(7)
+    load_times = []
+    for name, edit in WORKLOADS:
+        times, sizes = [], []
+        for _ in range(edits):
+            session.expunge_all()
+            start = time.perf_counter()
+            cv = session.get(CV, cv_id)
+            store.load([cv])
+            load_times.append(time.perf_counter() - start)
+
+            edit(cv, rng)
+            written[0] = 0
+            start = time.perf_counter()
+            store.save(cv)
+            session.commit()
+            times.append(time.perf_counter() - start)
+            sizes.append(written[0])
+        results[name] = (statistics.median(times) * 1000, statistics.fmean(sizes))
+    results["load whole CV"] = (statistics.median(load_times) * 1000, 0.0)
+
+    session.close()
+    engine.dispose()
+    os.remove(path)
+    os.rmdir(directory)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare JSON-column and normalized section storage")
+    parser.add_argument("--items", type=int, default=10, help="Experience/project items (three times as many skills)")
+    parser.add_argument("--edits", type=int, default=200, help="Edits per workload")
+    args = parser.parse_args()
+
+    print(f"CV with {args.items} experience/project items, {args.items * 3} skills; {args.edits} edits per workload\n")
+    json_results = run(LAYOUT_JSON, args.items, args.edits)
+    items_results = run(LAYOUT_ITEMS, args.items, args.edits)
+    print("workload            json ms   json bytes   items ms   items bytes")
+    for name in json_results:
+        (json_ms, json_bytes), (items_ms, items_bytes) = json_results[name], items_results[name]
+        print(f"{name:<18}{json_ms:>9.3f}{json_bytes:>13.0f}{items_ms:>11.3f}{items_bytes:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
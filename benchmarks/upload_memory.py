@@ -0,0 +1,69 @@
+"""
+Peak memory per upload: whole-body read vs chunked spooling.
+
+Builds an in-process UploadFile of the given size and measures the
+tracemalloc peak of the old `await file.read()` path against
+`_spool_upload`, which validates and spools the body chunk by chunk.
+
+    python -m benchmarks.upload_memory --size-mb 9
+"""
+
+import io
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+
+from starlette.datastructures import UploadFile
+
+from backend.api.cv import _spool_upload, _validate_file_magic
+
+
+def _make_upload(size: int) -> UploadFile:
+    body = tempfile.SpooledTemporaryFile(max_size=0)  # on disk, like Starlette's parser for big parts
+    body.write(b"%PDF-1.4\n")
+    block = b"x" * (64 * 1024)
+    remaining = size - 9
+    while remaining > 0:
+        body.write(block[:remaining])
+        remaining -= len(block)
+    body.seek(0)
+    return UploadFile(file=body, filename="resume.pdf")
+
+
+async def _buffered(upload: UploadFile) -> None:
+    content = await upload.read()
+    _validate_file_magic(content, "pdf")
+    io.BytesIO(content)  # what the extractor used to wrap
+
+
+async def _streamed(upload: UploadFile) -> None:
+    spool, _digest = await _spool_upload(upload, "pdf")
+    spool.close()
+
+
+def _measure(fn, size: int) -> int:
+    upload = _make_upload(size)
+    tracemalloc.start()
+    asyncio.run(fn(upload))
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    upload.file.close()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-mb", type=float, default=9.0)
+    args = parser.parse_args()
+    size = int(args.size_mb * 1024 * 1024)
+
+    buffered = _measure(_buffered, size)
+    streamed = _measure(_streamed, size)
+    print(f"upload size:        {size / 1024 / 1024:8.2f} MB")
+    print(f"whole-body read:    {buffered / 1024 / 1024:8.2f} MB peak")
+    print(f"chunked spooling:   {streamed / 1024 / 1024:8.2f} MB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Version retention/compaction benchmark.
+
+Builds CVs with a month of autosave history (plus a few named versions),
+runs the compactor once and reports rows and stored bytes before/after,
+the longest single batch transaction, the version-list query time before
+and after, and checks every surviving version still reconstructs to its
+recorded content hash.
+
+    python -m benchmarks.version_compaction --cvs 5 --days 30
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.models import User, CV, CVVersion
+from backend.services.version_service import VersionService, KIND_NAMED, content_hash
+from backend.services.version_compactor import VersionCompactor
+from benchmarks.version_storage import _initial_cv, _edit, _stored_bytes
+
+
+def _build_history(session, cv: CV, user_id: int, now: datetime, days: int, per_day: int, rng: random.Random) -> None:
+    """Autosaves every few minutes across a working day, for `days` days"""
+    service = VersionService(session)
+    for day in range(days, -1, -1):
+        start = now - timedelta(days=day, hours=10)
+        for i in range(per_day):
+            kind_named = rng.random() < 0.01
+            version = service.create_snapshot(
+                cv, user_id,
+                change_summary="Manual save" if kind_named else "Auto-saved before edit",
+                version_name="Milestone" if kind_named else None,
+                kind=KIND_NAMED if kind_named else "auto"
+            )
+            version.created_at = start + timedelta(minutes=8 * i)
+            _edit(cv, rng)
+            session.commit()
+
+
+def _list_query_ms(session, cv_ids, repeat: int = 20) -> float:
+    timings = []
+    for _ in range(repeat):
+        for cv_id in cv_ids:
+            session.expire_all()
+            start = time.perf_counter()
+            session.query(CVVersion).filter(CVVersion.cv_id == cv_id).order_by(CVVersion.version_number.desc()).all()
+            timings.append(time.perf_counter() - start)
+    return statistics.fmean(timings) * 1000
+
+
+def run(cvs: int, days: int, per_day: int, batch_size: int, seed: int = 5) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    directory = tempfile.mkdtemp(prefix="compaction-bench-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    session = factory()
+    now = datetime.now(timezone.utc)
+
+    user = User(email="bench@example.org", username="bench", hashed_password="x")
+    session.add(user)
+    session.commit()
+    cv_ids = []
+    for _ in range(cvs):
+        cv = CV(user_id=user.id, **_initial_cv(rng))
+        session.add(cv)
+        session.commit()
+        _build_history(session, cv, user.id, now, days, per_day, rng)
+        cv_ids.append(cv.id)
+
+    rows_before = session.query(CVVersion).count()
+    bytes_before = _stored_bytes(session)
+    list_before = _list_query_ms(session, cv_ids)
+    session.close()
+
+    compactor = VersionCompactor(factory, batch_size=batch_size)
+    batch_times = []
+    compact_batch = compactor.compact_batch
+
+    def timed_batch(cv_id, at):
+        start = time.perf_counter()
+        result = compact_batch(cv_id, at)
+        batch_times.append(time.perf_counter() - start)
+        return result
+
+    compactor.compact_batch = timed_batch
+    report = compactor.run_once(now)
+
+    session = factory()
+    rows_after = session.query(CVVersion).count()
+    bytes_after = _stored_bytes(session)
+    list_after = _list_query_ms(session, cv_ids)
+    service = VersionService(session)
+    mismatches = sum(
+        content_hash(state) != version.content_hash
+        for cv_id in cv_ids
+        for version, state in service.iter_states(cv_id)
+    )
+    session.close()
+    engine.dispose()
+    os.remove(path)
+    os.rmdir(directory)
+
+    return {
+        "rows_before": rows_before, "rows_after": rows_after,
+        "bytes_before": bytes_before, "bytes_after": bytes_after,
+        "list_before_ms": list_before, "list_after_ms": list_after,
+        "report": report, "max_batch_ms": max(batch_times, default=0) * 1000,
+        "mismatches": mismatches,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure version retention/compaction")
+    parser.add_argument("--cvs", type=int, default=5)
+    parser.add_argument("--days", type=int, default=30, help="Days of history per CV")
+    parser.add_argument("--per-day", type=int, default=60, help="Autosaves per day")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    r = run(args.cvs, args.days, args.per_day, args.batch_size)
+    report = r["report"]
+    print(f"{args.cvs} CVs x {args.days} days x {args.per_day} autosaves/day, batch size {args.batch_size}\n")
+    print(f"rows          {r['rows_before']:>8} -> {r['rows_after']:>8}")
+    print(f"stored KiB    {r['bytes_before'] / 1024:>8.1f} -> {r['bytes_after'] / 1024:>8.1f}"
+          f"  (reported reclaimed {report.bytes_reclaimed / 1024:.1f} KiB)")
+    print(f"list query ms {r['list_before_ms']:>8.3f} -> {r['list_after_ms']:>8.3f}")
+    print(f"compaction    {report.seconds:.2f}s in {report.batches} batches, longest batch {r['max_batch_ms']:.1f} ms")
+    print(f"surviving versions with content mismatches: {r['mismatches']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Concurrent version numbering check.
+
+Several threads snapshot the same CV at once, each in its own session, the
+way parallel update requests would. Compares the old numbering
+(SELECT max(version_number) + 1, then INSERT) with the per-CV counter
+reserved by VersionService, and reports duplicate numbers, failed saves and
+throughput. --think-ms adds a pause between numbering and commit in both
+modes, standing in for the rest of the request and database round trips.
+
+    python -m benchmarks.version_concurrency --threads 8 --saves 50
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import threading
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.models import User, CV, CVVersion
+from backend.services.version_service import VersionService
+
+
+def _legacy_snapshot(db, cv: CV, user_id: int) -> None:
+    """The numbering create_version_snapshot used before the counter"""
+    max_version = db.query(func.max(CVVersion.version_number)).filter(CVVersion.cv_id == cv.id).scalar() or 0
+    state = VersionService.cv_state(cv)
+    db.add(CVVersion(cv_id=cv.id, version_number=max_version + 1, created_by_id=user_id,
+                     change_summary="Auto-saved before edit", **state))
+
+
+def run(mode: str, threads: int, saves: int, think_ms: float) -> Dict[str, Any]:
+    directory = tempfile.mkdtemp(prefix="version-concurrency-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 60})
+    Base.metadata.create_all(bind=engine)
+    if mode == "legacy":
+        # The old schema had no uniqueness on (cv_id, version_number)
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_cv_versions_cv_id_version_number"))
+    factory = sessionmaker(bind=engine, autoflush=False)
+
+    db = factory()
+    user = User(email="bench@example.org", username="bench", hashed_password="x")
+    db.add(user)
+    db.flush()
+    cv = CV(user_id=user.id, title="CV", template="modern", summary="Start", experience=[], skills=[])
+    db.add(cv)
+    db.commit()
+    cv_id, user_id = cv.id, user.id
+    db.close()
+
+    failures = []
+    barrier = threading.Barrier(threads)
+
+    def worker(index: int) -> None:
+        barrier.wait()
+        for i in range(saves):
+            session = factory()
+            try:
+                # Same order as update_cv: snapshot the current state, then edit
+                current = session.get(CV, cv_id)
+                if mode == "legacy":
+                    _legacy_snapshot(session, current, user_id)
+                else:
+                    VersionService(session).create_snapshot(current, user_id, change_summary="Auto-saved before edit")
+                time.sleep(think_ms / 1000)
+                current.summary = f"Edit {index}.{i}"
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                failures.append(type(e).__name__)
+            finally:
+                session.close()
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT COUNT(*) FROM cv_versions")).scalar()
+        distinct = conn.execute(text("SELECT COUNT(DISTINCT version_number) FROM cv_versions")).scalar()
+        counter = conn.execute(text("SELECT version_counter FROM cvs WHERE id = :id"), {"id": cv_id}).scalar()
+    engine.dispose()
+    os.remove(path)
+    os.rmdir(directory)
+    return {"mode": mode, "rows": rows, "duplicates": rows - distinct, "failures": len(failures),
+            "counter": counter, "saves_per_s": rows / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check version numbering under concurrent saves")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--saves", type=int, default=50, help="Saves per thread")
+    parser.add_argument("--think-ms", type=float, default=1.0, help="Pause between numbering and commit")
+    args = parser.parse_args()
+
+    print(f"{args.threads} threads x {args.saves} saves on one CV, {args.think_ms} ms think time\n")
+    print("mode      versions  duplicate numbers  failed saves  saves/s")
+    for mode in ("legacy", "counter"):
+        r = run(mode, args.threads, args.saves, args.think_ms)
+        print(f"{r['mode']:<8}{r['rows']:>10}{r['duplicates']:>19}{r['failures']:>14}{r['saves_per_s']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Version diff benchmark.
+
+Builds a CV history of small edits through the API and browses it pair by
+pair, once the way the frontend had to (download both CVVersionDetail
+payloads per pair and diff them on the client) and once through
+GET /api/cv/{id}/versions/{a}/diff/{b}, cold and then cached. Reports bytes
+transferred and time per pair.
+
+    python -m benchmarks.version_diff --versions 60
+"""
+
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+
+# The app reads its settings at import time
+_directory = tempfile.mkdtemp(prefix="version-diff-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_directory}/bench.db")
+os.environ.setdefault("PARSE_CACHE_DIR", f"{_directory}/parse_cache")
+os.environ.setdefault("VERSION_COMPACTION_INTERVAL_SECONDS", "0")
+os.environ.setdefault("VERSION_AUTOSAVE_WINDOW_SECONDS", "0")
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.utils.cv_diff import diff_states
+from benchmarks.version_storage import _large_cv
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare client-side version diffs with the diff endpoint")
+    parser.add_argument("--versions", type=int, default=60)
+    parser.add_argument("--items", type=int, default=15)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    client.__enter__()
+    client.post("/api/auth/register", json={"email": "bench@example.org", "username": "bench", "password": "Passw0rdX"})
+    token = client.post("/api/auth/login", json={"username_or_email": "bench", "password": "Passw0rdX"}).json()["access_token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+
+    cv = client.post("/api/cv/", json=_large_cv(args.items)).json()
+    url = f"/api/cv/{cv['id']}"
+    rng = random.Random(9)
+    for edit in range(args.versions):
+        index = rng.randrange(args.items)
+        client.patch(url, json=[{"op": "replace", "path": f"/experience/{index}/description",
+                                 "value": f"- Revised bullet {edit}\n- Led a team of {rng.randint(2, 9)} engineers"}])
+    ids = [version["id"] for version in client.get(f"{url}/versions", params={"limit": 200}).json()][::-1]
+    pairs = list(zip(ids, ids[1:]))
+
+    def client_side(a: int, b: int) -> int:
+        old = client.get(f"{url}/versions/{a}")
+        new = client.get(f"{url}/versions/{b}")
+        diff_states(old.json(), new.json())
+        return len(old.content) + len(new.content)
+
+    def endpoint(a: int, b: int) -> int:
+        response = client.get(f"{url}/versions/{a}/diff/{b}")
+        json.loads(response.content)
+        return len(response.content)
+
+    print(f"{len(pairs)} consecutive version pairs, {args.items} experience items\n")
+    print("approach              ms/pair   bytes/pair")
+    for name, fn in (("client-side diff", client_side), ("diff endpoint cold", endpoint), ("diff endpoint cached", endpoint)):
+        timings, sizes = [], []
+        for a, b in pairs:
+            start = time.perf_counter()
+            sizes.append(fn(a, b))
+            timings.append(time.perf_counter() - start)
+        print(f"{name:<20}{statistics.fmean(timings) * 1000:>10.2f}{statistics.fmean(sizes):>13.0f}")
+
+    client.__exit__(None, None, None)
+    shutil.rmtree(_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Version history listing benchmark.
+
+Fills one CV's history with N versions and times the version list query
+the old way (every full CVVersion row, all at once) against the metadata
+projection + keyset page used by GET /api/cv/{id}/versions, including the
+X-Total-Count query. Reports mean latency and peak Python memory.
+
+    python -m benchmarks.version_listing --sizes 10,1000,10000
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict
+
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.models import User, CV, CVVersion
+from backend.api.cv_schemas import CVVersionListItem
+from backend.services.version_service import VersionService
+from benchmarks.version_storage import _initial_cv
+
+
+def _fill(session, cv_id: int, versions: int) -> None:
+    state = _initial_cv(random.Random(3))
+    created_at = datetime.now(timezone.utc)
+    rows = [
+        dict(cv_id=cv_id, version_number=n, change_summary="Auto-saved before edit", kind="auto",
+             is_keyframe=True, created_at=created_at, **state)
+        for n in range(1, versions + 1)
+    ]
+    for start in range(0, len(rows), 1000):
+        session.execute(insert(CVVersion), rows[start:start + 1000])
+    session.execute(update(CV).where(CV.id == cv_id).values(version_counter=versions))
+    session.commit()
+
+
+def _measure(session, fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    timings, peaks = [], []
+    for _ in range(repeat):
+        session.expire_all()
+        session.expunge_all()
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {"ms": statistics.fmean(timings) * 1000, "peak_kib": max(peaks) / 1024}
+
+
+def run(versions: int, page: int, repeat: int) -> Dict[str, Any]:
+    directory = tempfile.mkdtemp(prefix="version-listing-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    user = User(email="bench@example.org", username="bench", hashed_password="x")
+    session.add(user)
+    session.flush()
+    cv = CV(user_id=user.id, title="CV", template="modern")
+    session.add(cv)
+    session.commit()
+    cv_id = cv.id
+    _fill(session, cv_id, versions)
+
+    def legacy():
+        rows = session.query(CVVersion).filter(
+            CVVersion.cv_id == cv_id
+        ).order_by(CVVersion.version_number.desc()).all()
+        return [CVVersionListItem.model_validate(row) for row in rows]
+
+    def paged():
+        service = VersionService(session)
+        service.count_versions(cv_id)
+        rows = service.list_versions(cv_id, before_version=versions // 2 or None, limit=page)
+        return [CVVersionListItem.model_validate(row) for row in rows]
+
+    result = {"versions": versions, "legacy": _measure(session, legacy, repeat), "paged": _measure(session, paged, repeat)}
+    session.close()
+    engine.dispose()
+    os.remove(path)
+    os.rmdir(directory)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare full and paged version listing")
+    parser.add_argument("--sizes", default="10,1000,10000", help="History lengths to test")
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"page size {args.page} (paged mode fetches a page from the middle of the history)\n")
+    print("versions   legacy ms  legacy peak KiB   paged ms  paged peak KiB")
+    for size in args.sizes.split(","):
+        r = run(int(size), args.page, args.repeat)
+        print(f"{r['versions']:>8}  {r['legacy']['ms']:>10.2f}  {r['legacy']['peak_kib']:>15.0f}"
+              f"  {r['paged']['ms']:>9.2f}  {r['paged']['peak_kib']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
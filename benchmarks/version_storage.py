@@ -0,0 +1,156 @@
+"""
+CV version storage benchmark.
+
+Simulates an actively edited CV (small edits to one section per save) and
+compares full snapshots (keyframe interval 1) with keyframe + JSON-patch
+delta storage at several intervals: bytes stored in cv_versions, database
+file size, snapshot write latency and version reconstruction latency.
+
+    python -m benchmarks.version_storage --versions 300
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.models import User, CV, CVVersion
+from backend.services.version_service import VersionService
+
+CONTENT_COLUMNS = ("summary", "experience", "education", "skills", "projects", "research", "delta")
+
+
+def _initial_cv(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "title": "Senior Engineer CV",
+        "template": "modern",
+        "full_name": "Jordan Rivera",
+        "email": "jordan@example.org",
+        "summary": "Backend engineer focused on reliable distributed systems. " * 4,
+        "experience": [
+            {"job_title": f"Engineer {i}", "employer": f"Company {i}", "location": "Boston, MA",
+             "start_date": f"{2010 + i}", "end_date": f"{2011 + i}",
+             "description": "\n".join(f"- Delivered project {i}.{j} with measurable impact" for j in range(5))}
+            for i in range(6)
+        ],
+        "education": [{"school": "MIT", "degree": "BSc", "field": "Computer Science", "end_date": "2010"}],
+        "skills": [{"name": f"Skill {i}", "level": "advanced"} for i in range(20)],
+        "projects": [{"name": f"Project {i}", "description": "An open-source tool. " * 5} for i in range(4)],
+        "research": [],
+    }
+
+
+def _large_cv(items: int) -> Dict[str, Any]:
+    """A CV with `items` experience/project items and three times as many skills"""
+    state = _initial_cv(random.Random(3))
+    state["experience"] = [dict(state["experience"][i % 6], job_title=f"Engineer {i}") for i in range(items)]
+    state["projects"] = [dict(state["projects"][i % 4], name=f"Project {i}") for i in range(items)]
+    state["skills"] = [{"name": f"Skill {i}", "level": "advanced"} for i in range(items * 3)]
+    state["education"] = state["education"] * 3
+    return state
+
+
+def _edit(cv: CV, rng: random.Random) -> None:
+    """One autosave-sized edit: tweak a bullet, a skill, the summary or add an item"""
+    choice = rng.random()
+    if choice < 0.5:
+        experience = [dict(item) for item in cv.experience]
+        item = rng.choice(experience)
+        item["description"] += f"\n- Follow-up improvement #{rng.randint(0, 9999)}"
+        cv.experience = experience
+    elif choice < 0.7:
+        skills = [dict(item) for item in cv.skills]
+        rng.choice(skills)["level"] = rng.choice(["intermediate", "advanced", "expert"])
+        cv.skills = skills
+    elif choice < 0.9:
+        cv.summary = cv.summary.rstrip(". ") + f". Revision {rng.randint(0, 9999)}."
+    else:
+        cv.projects = list(cv.projects) + [{"name": f"Project {len(cv.projects)}", "description": "New."}]
+
+
+def _stored_bytes(session) -> int:
+    columns = " + ".join(f"COALESCE(LENGTH(CAST({name} AS TEXT)), 0)" for name in CONTENT_COLUMNS)
+    return session.execute(text(f"SELECT COALESCE(SUM({columns}), 0) FROM cv_versions")).scalar()
+
+
+def run(versions: int, interval: int, samples: int, seed: int = 7) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    directory = tempfile.mkdtemp(prefix="version-bench-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    user = User(email="bench@example.org", username="bench", hashed_password="x")
+    session.add(user)
+    session.flush()
+    cv = CV(user_id=user.id, **_initial_cv(rng))
+    session.add(cv)
+    session.commit()
+
+    service = VersionService(session, keyframe_interval=interval)
+    write_times = []
+    for _ in range(versions):
+        start = time.perf_counter()
+        service.create_snapshot(cv, user.id, change_summary="Auto-saved before edit")
+        session.commit()
+        write_times.append(time.perf_counter() - start)
+        _edit(cv, rng)
+        session.commit()
+
+    stored = _stored_bytes(session)
+    rows = session.query(CVVersion).filter(CVVersion.cv_id == cv.id).all()
+    read_times = []
+    for version in rng.sample(rows, min(samples, len(rows))):
+        session.expire_all()
+        start = time.perf_counter()
+        service.materialize(version)
+        read_times.append(time.perf_counter() - start)
+    session.close()
+
+    with engine.connect() as conn:
+        conn.execute(text("VACUUM"))
+    engine.dispose()
+    file_size = os.path.getsize(path)
+    os.remove(path)
+    os.rmdir(directory)
+
+    def p95(values: List[float]) -> float:
+        return sorted(values)[int(len(values) * 0.95)] * 1000
+
+    return {
+        "interval": interval,
+        "stored_bytes": stored,
+        "file_bytes": file_size,
+        "write_mean_ms": statistics.fmean(write_times) * 1000,
+        "read_mean_ms": statistics.fmean(read_times) * 1000,
+        "read_p95_ms": p95(read_times),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare full-snapshot and delta-encoded version storage")
+    parser.add_argument("--versions", type=int, default=300)
+    parser.add_argument("--intervals", default="1,10,20,50", help="Keyframe intervals to compare (1 = full snapshots)")
+    parser.add_argument("--samples", type=int, default=100, help="Random versions to reconstruct")
+    args = parser.parse_args()
+
+    results = [run(args.versions, int(i), args.samples) for i in args.intervals.split(",")]
+    baseline = results[0]["stored_bytes"] or 1
+    print(f"{args.versions} versions of one CV\n")
+    print("interval   stored KiB  vs full   file KiB   write ms   read ms   read p95 ms")
+    for r in results:
+        print(f"{r['interval']:>8}  {r['stored_bytes'] / 1024:>11.1f}  {r['stored_bytes'] / baseline:>7.1%}"
+              f"  {r['file_bytes'] / 1024:>9.1f}  {r['write_mean_ms']:>9.3f}  {r['read_mean_ms']:>8.3f}"
+              f"  {r['read_p95_ms']:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
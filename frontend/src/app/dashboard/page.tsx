@@ -16,6 +16,7 @@ interface CV {
   full_name: string;
   created_at: string;
   updated_at: string;
+  version_count: number;
 }
 
 export default function DashboardPage() {
@@ -23,12 +24,14 @@ export default function DashboardPage() {
   const router = useRouter();
   const [cvs, setCvs] = useState<CV[]>([]);
   const [isLoading, setIsLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchCVs();
   }, []);
 
-  const fetchCVs = async () => {
+  const fetchCVs = async (cursor: string | null = null) => {
     try {
       const token = localStorage.getItem('access_token');
       
@@ -37,7 +40,8 @@ export default function DashboardPage() {
         return;
       }
 
-      const response = await fetch('http://localhost:8001/api/cv/', {
+      const params = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const response = await fetch(`http://localhost:8001/api/cv/summary${params}`, {
         headers: {
           'Authorization': `Bearer ${token}`,
         },
@@ -48,7 +52,8 @@ export default function DashboardPage() {
       }
 
       const data = await response.json();
-      setCvs(data);
+      setCvs((current) => (cursor ? [...current, ...data] : data));
+      setNextCursor(response.headers.get('X-Next-Cursor'));
     } catch (error) {
       toast.error('Failed to load CVs');
     } finally {
@@ -56,6 +61,12 @@ export default function DashboardPage() {
     }
   };
 
+  const handleLoadMore = async () => {
+    setIsLoadingMore(true);
+    await fetchCVs(nextCursor);
+    setIsLoadingMore(false);
+  };
+
   const handleCreateNew = () => {
     router.push('/cv/new');
   };
@@ -210,6 +221,14 @@ export default function DashboardPage() {
             ))}
           </div>
         )}
+
+        {nextCursor && (
+          <div className="flex justify-center">
+            <Button variant="outline" onClick={handleLoadMore} isLoading={isLoadingMore}>
+              Load more
+            </Button>
+          </div>
+        )}
       </div>
     </ProtectedRoute>
   );
@@ -72,6 +72,8 @@ interface VersionHistoryProps {
 
 export default function VersionHistory({ cvId, isOpen, onClose, onRestore }: VersionHistoryProps) {
   const [versions, setVersions] = useState<CVVersion[]>([]);
+  const [totalVersions, setTotalVersions] = useState(0);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [selectedVersion, setSelectedVersion] = useState<CVVersionDetail | null>(null);
   const [isLoading, setIsLoading] = useState(false);
   const [isRestoring, setIsRestoring] = useState(false);
@@ -91,6 +93,7 @@ export default function VersionHistory({ cvId, isOpen, onClose, onRestore }: Ver
     try {
       const response = await apiClient.get(`/api/cv/${cvId}/versions`);
       setVersions(response.data);
+      setTotalVersions(Number(response.headers['x-total-count'] ?? response.data.length));
     } catch (error) {
       toast.error('Failed to load version history');
     } finally {
@@ -98,6 +101,23 @@ export default function VersionHistory({ cvId, isOpen, onClose, onRestore }: Ver
     }
   };
 
+  const fetchOlderVersions = async () => {
+    const oldest = versions[versions.length - 1];
+    if (!oldest) return;
+    setIsLoadingMore(true);
+    try {
+      const response = await apiClient.get(`/api/cv/${cvId}/versions`, {
+        params: { before_version: oldest.version_number },
+      });
+      setVersions((current) => [...current, ...response.data]);
+      setTotalVersions(Number(response.headers['x-total-count'] ?? totalVersions));
+    } catch (error) {
+      toast.error('Failed to load older versions');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const fetchVersionDetail = async (versionId: number) => {
     try {
       const response = await apiClient.get(`/api/cv/${cvId}/versions/${versionId}`);
@@ -299,6 +319,13 @@ export default function VersionHistory({ cvId, isOpen, onClose, onRestore }: Ver
                     </div>
                   </div>
                 ))}
+                {versions.length < totalVersions && (
+                  <div className="p-4 text-center">
+                    <Button size="sm" variant="outline" onClick={fetchOlderVersions} isLoading={isLoadingMore}>
+                      Load older versions
+                    </Button>
+                  </div>
+                )}
               </div>
             )}
           </div>